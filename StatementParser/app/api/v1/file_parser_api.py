@@ -1,12 +1,24 @@
 """
 Api for documents ingestion
 """
+import asyncio
+import hashlib
 import logging
 import time
+import zipfile
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
 
+import aiofiles
 from app.api.v1 import PREFIX
-from app.tasks.bank_statement_upload import process_bank_pdf
+from app.core.celery_app import celery_app
+from app.core.task_payloads import drop_payloads, stage_bytes
+from app.core.upload_claims import claim_upload, release_upload_claims, upload_claim_key
+from app.pdf_normalizer.pdf_source import INLINE_MAX_SIZE_MB
+from app.tasks.bank_statement_upload import process_bank_pdf, release_upload_claim
+from celery import group
+from celery.result import GroupResult
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
@@ -21,6 +33,10 @@ CUSTOM_TEMP_DIR = Path("./app/temp/statements")
 CUSTOM_TEMP_DIR.mkdir(parents=True, exist_ok=True)
 logger.debug(f"CUSTOM DIR = {CUSTOM_TEMP_DIR}")
 
+# Batch uploads
+MAX_BATCH_FILES = 500
+BATCH_CONCURRENCY = 8  # uploads streamed to disk at once
+
 
 class FileMeta(BaseModel):
     date: str | None = None
@@ -34,14 +50,19 @@ async def file_upload(
     subject: str = Form(None),
     from_email: str = Form(None),
     to_email: str = Form(None),
-    date: str = Form(None)
+    date: str = Form(None),
+    full_result: bool = Form(False),
 ):
     """
     Worker:
     - Waits on queue
     - Fetches file
+
+    full_result=true keeps every transaction in the task result,
+    by default only counts and a pointer to the stored rows are kept.
     """
 
+    task_kwargs = {}
     try:
         logger.debug(f"Got meta : {from_email} {subject} {date}")
         size = 0
@@ -49,38 +70,67 @@ async def file_upload(
         suffix = Path(file.filename).suffix
         temp_path = CUSTOM_TEMP_DIR / f"{stem}_{time.time()}{suffix}"
 
+        # Small uploads stay in memory and are staged in Redis for the worker,
+        # larger ones spill to the temp dir shared with it. Either way only a
+        # key or a path travels in the task args (and the extended result).
+        chunks = []
+        tmp = None
 
-        with open(temp_path, "wb") as tmp:
+        try:
             while chunk := await file.read(CHUNK):
                 size += len(chunk)
 
                 if size > MAX_SIZE_MB * 1024 * 1024:
-                    tmp.close()
-                    temp_path.unlink(missing_ok=True)
                     raise HTTPException(
                         status_code=status.HTTP_413_CONTENT_TOO_LARGE,
                         detail=f"File too large. Max {MAX_SIZE_MB} MB",
                     )
 
-                tmp.write(chunk)
+                if tmp is None and size <= INLINE_MAX_SIZE_MB * 1024 * 1024:
+                    chunks.append(chunk)
+                    continue
 
-            if size == 0:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Uploaded file is empty.",
-                )
+                if tmp is None:
+                    tmp = await aiofiles.open(temp_path, "wb")
+                    await tmp.write(b"".join(chunks))
+                    chunks = []
 
+                await tmp.write(chunk)
+        except Exception:
+            # No partial spill left behind, whatever stopped the upload
+            if tmp is not None:
+                await tmp.close()
+                tmp = None
+                temp_path.unlink(missing_ok=True)
+            raise
+        finally:
+            if tmp is not None:
+                await tmp.close()
+
+        if size == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Uploaded file is empty.",
+            )
 
         await file.close()
 
+        if tmp is None:
+            # Redis SET off the event loop
+            content_key = await asyncio.to_thread(stage_bytes, b"".join(chunks))
+            task_kwargs = {'file_path': None, 'content_key': content_key}
+        else:
+            task_kwargs = {'file_path': str(temp_path)}
+
         # # content = await file.read()  # simple read op
         # # step 1: save the file
         task_obj = process_bank_pdf.apply_async(
             kwargs = {
                 'filename': file.filename,
-                'file_path': str(temp_path),
                 'from_email': from_email,
-                'to_email' : to_email
+                'to_email' : to_email,
+                'full_result': full_result,
+                **task_kwargs,
             },
             queue='statement_parser'
         )
@@ -93,9 +143,13 @@ async def file_upload(
             'task_id': task_obj.id
         }
 
+    except HTTPException:
+        # 413 / 400, raised before anything was staged or spilled
+        raise
     except Exception as e:
         logger.exception("Upload failed")
         Path(temp_path).unlink(missing_ok=True)
+        drop_payloads(task_kwargs.get('content_key'))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
         ) from e
@@ -104,3 +158,214 @@ async def file_upload(
         status_code=200,
         content={"message": "File uploaded and queued for processing", **content},
     )
+
+
+@dataclass
+class StagedFile:
+    filename: str
+    path: Path
+    digest: str
+    claim: str | None = None
+
+
+def _temp_path(filename: str) -> Path:
+    name = Path(filename).name
+    return CUSTOM_TEMP_DIR / f"{Path(name).stem}_{time.time_ns()}{Path(name).suffix}"
+
+
+async def _stage_upload(file: UploadFile, semaphore: asyncio.Semaphore) -> StagedFile:
+    """Stream one upload to the temp dir, hashing it on the way."""
+    async with semaphore:
+        digest = hashlib.sha256()
+        size = 0
+        path = _temp_path(file.filename)
+
+        try:
+            async with aiofiles.open(path, "wb") as out:
+                while chunk := await file.read(CHUNK):
+                    size += len(chunk)
+                    if size > MAX_SIZE_MB * 1024 * 1024:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                            detail=f"{file.filename} too large. Max {MAX_SIZE_MB} MB",
+                        )
+                    digest.update(chunk)
+                    await out.write(chunk)
+        except Exception:
+            path.unlink(missing_ok=True)
+            raise
+        finally:
+            await file.close()
+
+    return StagedFile(filename=file.filename, path=path, digest=digest.hexdigest())
+
+
+def _extract_zip(staged: StagedFile) -> list[StagedFile]:
+    """
+    Unpack the PDFs of an uploaded zip into the temp dir, the zip itself is removed.
+    The size limit is checked on the bytes read, the sizes a zip declares are not trusted.
+    """
+    files = []
+    try:
+        with zipfile.ZipFile(staged.path) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(".pdf"):
+                    continue
+
+                digest = hashlib.sha256()
+                size = 0
+                path = _temp_path(info.filename)
+                with zf.open(info) as src, open(path, "wb") as out:
+                    while chunk := src.read(CHUNK):
+                        size += len(chunk)
+                        if size > MAX_SIZE_MB * 1024 * 1024:
+                            break
+                        digest.update(chunk)
+                        out.write(chunk)
+
+                if size > MAX_SIZE_MB * 1024 * 1024:
+                    logger.warning(f"Skipping {info.filename} in {staged.filename}: too large")
+                    path.unlink(missing_ok=True)
+                    continue
+
+                files.append(StagedFile(Path(info.filename).name, path, digest.hexdigest()))
+    except zipfile.BadZipFile as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{staged.filename} is not a valid zip",
+        ) from e
+    finally:
+        staged.path.unlink(missing_ok=True)
+
+    return files
+
+
+def _discard(staged: list[StagedFile]) -> None:
+    """Request failed before queueing: remove the files and free their claims."""
+    for item in staged:
+        item.path.unlink(missing_ok=True)
+    release_upload_claims(*(item.claim for item in staged))
+
+
+def _batch_task(item: StagedFile, from_email: str, to_email: str, full_result: bool):
+    sig = process_bank_pdf.s(
+        filename=item.filename,
+        file_path=str(item.path),
+        from_email=from_email,
+        to_email=to_email,
+        full_result=full_result,
+    )
+    if item.claim:
+        # Kept across self.replace, so a failed parse or store frees the hash
+        sig.link_error(release_upload_claim.si(item.claim))
+    return sig
+
+
+@file_upload_router.post("/upload/batch")
+async def file_upload_batch(
+    files: list[UploadFile] = File(...),
+    subject: str = Form(None),
+    from_email: str = Form(None),
+    to_email: str = Form(None),
+    force: bool = Form(False),
+    full_result: bool = Form(False),
+):
+    """
+    Many statements (PDFs and/or zips of PDFs) in one request.
+
+    - uploads are streamed to disk concurrently and hashed
+    - identical content is queued once per batch, and once per recipient
+      within UPLOAD_HASH_TTL unless ``force`` is set; the claim is released
+      if queueing or the task fails, so a failed statement can be re-sent
+    - queued as one Celery group, poll GET /upload/batch/{group_id}
+    """
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many files. Max {MAX_BATCH_FILES}",
+        )
+
+    logger.debug(f"Got batch of {len(files)} from {from_email} {subject}")
+    staged: list[StagedFile] = []
+
+    try:
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        uploads = await asyncio.gather(
+            *(_stage_upload(file, semaphore) for file in files), return_exceptions=True
+        )
+
+        errors = [u for u in uploads if isinstance(u, BaseException)]
+        staged = [u for u in uploads if not isinstance(u, BaseException)]
+        if errors:
+            raise errors[0]
+
+        for item in [s for s in staged if s.filename.lower().endswith(".zip")]:
+            staged.remove(item)
+            staged.extend(await asyncio.to_thread(_extract_zip, item))
+
+        queued, duplicates = [], []
+        seen: dict[str, str] = {}
+        for item in staged:
+            original = seen.get(item.digest)
+            claim = None if force else upload_claim_key(to_email, item.digest)
+            if original is None and (claim is None or claim_upload(claim)):
+                item.claim = claim
+                seen[item.digest] = item.filename
+                queued.append(item)
+                continue
+
+            item.path.unlink(missing_ok=True)
+            duplicates.append({"filename": item.filename, "duplicate_of": original, "sha256": item.digest})
+
+        if not queued:
+            return JSONResponse(
+                status_code=200,
+                content={"message": "Nothing new to process", "group_id": None, "duplicates": duplicates},
+            )
+
+        group_result = group(
+            _batch_task(item, from_email, to_email, full_result) for item in queued
+        ).apply_async()
+        # Persist the group so it can be restored by id when polled
+        group_result.save()
+
+    except HTTPException:
+        _discard(staged)
+        raise
+    except Exception as e:
+        logger.exception("Batch upload failed")
+        _discard(staged)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        ) from e
+
+    return JSONResponse(
+        status_code=200,
+        content={
+            "message": f"{len(queued)} statements queued for processing",
+            "group_id": group_result.id,
+            "tasks": [
+                {"filename": item.filename, "task_id": result.id}
+                for item, result in zip(queued, group_result.results)
+            ],
+            "duplicates": duplicates,
+        },
+    )
+
+
+@file_upload_router.get("/upload/batch/{group_id}")
+async def file_upload_batch_status(group_id: str):
+    """Aggregate progress of a batch upload."""
+    group_result = GroupResult.restore(group_id, app=celery_app)
+    if group_result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown group id")
+
+    states = Counter(result.state for result in group_result.results)
+    return {
+        "group_id": group_id,
+        "total": len(group_result.results),
+        "completed": states.get("SUCCESS", 0),
+        "failed": states.get("FAILURE", 0),
+        "ready": group_result.ready(),
+        "states": dict(states),
+    }
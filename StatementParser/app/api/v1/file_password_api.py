@@ -4,8 +4,8 @@ Api for documents pwd
 import logging
 
 from app.api.v1 import PREFIX
-from app.core.database import get_cursor
-from app.model_actions.statement_pdf import create_or_update_bank_pdf
+from app.core.database import get_async_cursor
+from app.model_actions.statement_pdf import create_or_update_bank_pdf_async
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, EmailStr
 
@@ -36,8 +36,8 @@ async def file_upload_pwd(request_data: FileCredentialsRequest
     """
 
     try:
-        with get_cursor() as curr:
-            _ = create_or_update_bank_pdf(
+        async with get_async_cursor() as curr:
+            _ = await create_or_update_bank_pdf_async(
                 user_id=request_data.user_id,
                 sender_email=request_data.sender_email,
                 filename=request_data.filename,
@@ -0,0 +1,38 @@
+"""
+Prometheus scrape endpoint and per-process ops stats for the API processes
+"""
+
+import asyncio
+
+from app.api.v1 import PREFIX
+from app.core.cache import tiered_cache
+from app.core.database import async_pool_stats, pool_stats
+from app.core.metrics import render_metrics
+from fastapi import APIRouter, Response
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Multiprocess mode reads one file per process, keep it off the loop
+    body, content_type = await asyncio.to_thread(render_metrics)
+    return Response(content=body, media_type=content_type)
+
+
+@metrics_router.get(f"{PREFIX}/db/pool")
+async def db_pool_stats():
+    """
+    Postgres pools of the worker process serving the request:
+    size, idle, waiting and cumulative wait time.
+    """
+    return {"sync": pool_stats(), "async": async_pool_stats()}
+
+
+@metrics_router.get(f"{PREFIX}/cache/stats")
+async def cache_stats():
+    """
+    Two-tier cache counters of the worker process serving the request:
+    local/redis hits, misses, loads, evictions.
+    """
+    return tiered_cache.stats()
@@ -1,6 +1,8 @@
 from app.api.v1.file_parser_api import file_upload_router
 from app.api.v1.file_password_api import file_pwd_router
+from app.api.v1.metrics_api import metrics_router
 from app.api.v1.rule_engine_api import rule_engine_router
+from app.api.v1.task_api import task_router
 from app.api.v1.tea_pot_api import tea_pot_router
 from fastapi import APIRouter
 
@@ -9,3 +11,5 @@ v1_router.include_router(router=file_upload_router)
 v1_router.include_router(router=tea_pot_router)
 v1_router.include_router(router=file_pwd_router)
 v1_router.include_router(router=rule_engine_router)
+v1_router.include_router(router=task_router)
+v1_router.include_router(router=metrics_router)
@@ -6,15 +6,19 @@ from datetime import date
 from typing import List, Optional
 
 from app.api.v1 import PREFIX
-from app.core.database import get_cursor
-from app.tasks.rule_engine_task import run_rule_engine
+from app.core.database import get_async_cursor
+from app.tasks.rule_engine_task import run_rule_engine_async, run_rule_engine_task
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, EmailStr
 
 logger = logging.getLogger(name="app")
 
 rule_engine_router = APIRouter(prefix=PREFIX)
 
+# Longest from_date..to_date span allowed to run inside the request
+SYNC_MAX_DAYS = 31
+
 
 # Define a schema for the incoming request
 class RuleEnginePayload(BaseModel):
@@ -26,31 +30,55 @@ class RuleEnginePayload(BaseModel):
     from_date: Optional[date] = None
     to_date: Optional[date] = None
     rules_id: Optional[List[int]] = []
+    # Run inline and return the result, only for ranges up to SYNC_MAX_DAYS
+    sync: bool = False
+    # Record per rule evaluation/match counts and timings for the rules UI
+    profile: bool = False
 
 
 
-@rule_engine_router.post("/rule-engine", status_code=status.HTTP_200_OK)
+@rule_engine_router.post("/rule-engine", status_code=status.HTTP_202_ACCEPTED)
 async def rule_engine(request_data: RuleEnginePayload
 
 ):
     """
     - Given payload runs rule-engine on specified params
+    - Queued on the rule_engine queue, returns the task id (GET /tasks/{task_id})
+    - ``sync`` runs it inline for a bounded date range and returns the result
     """
+    request_params = request_data.model_dump(exclude={"sync"})
 
-    try:
-        # 1. Get a cursor from the pool
-        with get_cursor() as cur:
-
-            request_params = request_data.model_dump()
+    if request_data.sync:
+        if not (request_data.from_date and request_data.to_date):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="sync mode needs from_date and to_date",
+            )
+        if (request_data.to_date - request_data.from_date).days > SYNC_MAX_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"sync mode is limited to {SYNC_MAX_DAYS} days, omit sync to queue it",
+            )
 
-            # 3. Call the function passing the cursor
-            result = run_rule_engine(**request_params, cur=cur)
+    try:
+        if request_data.sync:
+            async with get_async_cursor() as cur:
+                result = await run_rule_engine_async(**request_params, cur=cur)
+            return JSONResponse(status_code=status.HTTP_200_OK, content=result)
 
-            return result
+        task_obj = run_rule_engine_task.apply_async(
+            kwargs=request_data.model_dump(mode="json", exclude={"sync"}),
+            queue="rule_engine",
+        )
 
     except Exception as e:
-        logger.exception("Upload failed")
+        logger.exception("Rule engine failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
         ) from e
 
+    return {
+        "message": "Rule engine queued",
+        "task_id": task_obj.id,
+        "status_url": f"{PREFIX}/tasks/{task_obj.id}",
+    }
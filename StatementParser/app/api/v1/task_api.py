@@ -0,0 +1,99 @@
+"""
+Api for Celery task status and live progress
+"""
+import asyncio
+import json
+import logging
+
+import redis.asyncio as aioredis
+from app.api.v1 import PREFIX
+from app.config.settings import settings
+from app.core.celery_app import celery_app
+from app.core.task_progress import get_progress, progress_key
+from celery.result import AsyncResult
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(name="app")
+
+task_router = APIRouter(prefix=PREFIX)
+
+HEARTBEAT_SECONDS = 15
+POLL_SECONDS = 1.0
+
+
+def _task_status(task_id: str) -> dict:
+    result = AsyncResult(task_id, app=celery_app)
+    status = {
+        "task_id": task_id,
+        "state": result.state,
+        "ready": result.ready(),
+        "progress": get_progress(task_id),
+    }
+
+    if result.successful():
+        status["result"] = result.result
+    elif result.failed():
+        status["error"] = str(result.result)
+
+    return status
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@task_router.get("/tasks/{task_id}")
+async def task_status(task_id: str):
+    """
+    State from the Celery result backend plus the progress counters
+    (pages_parsed, rows_extracted, rules_applied, rows_inserted ...).
+    """
+    return await asyncio.to_thread(_task_status, task_id)
+
+
+@task_router.get("/tasks/{task_id}/events")
+async def task_events(task_id: str, request: Request):
+    """
+    Server-sent events: ``progress`` on every update published by the worker,
+    then one ``done`` event with the final status.
+    """
+
+    async def stream():
+        client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(progress_key(task_id))
+        try:
+            status = await asyncio.to_thread(_task_status, task_id)
+            yield _sse("progress", status["progress"])
+
+            idle = 0.0
+            while not status["ready"]:
+                if await request.is_disconnected():
+                    return
+
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=POLL_SECONDS)
+                if message:
+                    idle = 0.0
+                    yield f"event: progress\ndata: {message['data']}\n\n"
+                else:
+                    idle += POLL_SECONDS
+                    if idle >= HEARTBEAT_SECONDS:
+                        idle = 0.0
+                        yield ": keep-alive\n\n"
+
+                ready = await asyncio.to_thread(AsyncResult(task_id, app=celery_app).ready)
+                if ready:
+                    status = await asyncio.to_thread(_task_status, task_id)
+
+            yield _sse("done", status)
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+            await client.aclose()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,129 @@
+"""
+Latency of the API under concurrent load on a database endpoint.
+
+``--concurrency`` clients keep POSTing ``--payload`` to ``--path`` while a
+probe polls a cheap endpoint that never touches Postgres. If handlers block
+the event loop the probe latency climbs with the load; with the async pool it
+should stay flat. Run once per build and compare with ``--baseline``.
+
+> source .env
+> gunicorn main:app -c gunicorn.conf.py
+> python app/benchmarks/bench_api_latency.py --path /api/v1/file-credentails \
+>     --payload '{"user_id": "1", "sender_email": "a@b.com", "filename": "x.pdf", "pdf_password": "p"}' \
+>     --output app/temp/latency_after.json --baseline app/temp/latency_before.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+import httpx
+
+PROBE_PATH = "/api/v1/db/pool"
+PROBE_INTERVAL = 0.05
+OUTPUT_PATH = Path("./app/temp/bench_api_latency.json")
+
+
+def summarize(latencies: list[float]) -> dict:
+    if not latencies:
+        return {"count": 0}
+    ordered = sorted(latencies)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+async def _timed(client: httpx.AsyncClient, method: str, path: str, **kwargs) -> tuple[float, int]:
+    start = time.perf_counter()
+    response = await client.request(method, path, **kwargs)
+    return time.perf_counter() - start, response.status_code
+
+
+async def run(base_url: str, path: str, payload: dict, concurrency: int, requests: int) -> dict:
+    load, probe, errors = [], [], 0
+    remaining = requests
+
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+
+        async def load_worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                seconds, code = await _timed(client, "POST", path, json=payload)
+                load.append(seconds)
+                errors += code >= 400
+
+        async def probe_worker():
+            while True:
+                seconds, _ = await _timed(client, "GET", PROBE_PATH)
+                probe.append(seconds)
+                await asyncio.sleep(PROBE_INTERVAL)
+
+        start = time.perf_counter()
+        prober = asyncio.create_task(probe_worker())
+        await asyncio.gather(*(load_worker() for _ in range(concurrency)))
+        prober.cancel()
+        elapsed = time.perf_counter() - start
+
+    return {
+        "path": path,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "requests_per_sec": round(requests / elapsed, 1),
+        "load": summarize(load),
+        "probe": summarize(probe),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API latency under concurrent DB load")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--path", required=True, help="Endpoint to load, e.g. /api/v1/file-credentails")
+    parser.add_argument("--payload", default="{}", help="JSON body for the load requests")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per concurrency level")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH, help="JSON results path")
+    parser.add_argument("--baseline", type=Path, help="Earlier results to compare against")
+    args = parser.parse_args()
+
+    payload = json.loads(args.payload)
+    results = [
+        asyncio.run(run(args.base_url, args.path, payload, c, args.requests))
+        for c in args.concurrency
+    ]
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+
+    baseline = {}
+    if args.baseline:
+        baseline = {r["concurrency"]: r for r in json.loads(args.baseline.read_text())}
+
+    for r in results:
+        line = (
+            f"c={r['concurrency']:<3} {r['requests_per_sec']:>8.1f} req/s errors={r['errors']} "
+            f"load p50={r['load'].get('p50_ms')} p99={r['load'].get('p99_ms')}ms "
+            f"probe p50={r['probe'].get('p50_ms')} p99={r['probe'].get('p99_ms')}ms"
+        )
+        before = baseline.get(r["concurrency"])
+        if before:
+            line += (
+                f" | before: load p99={before['load'].get('p99_ms')}ms "
+                f"probe p99={before['probe'].get('p99_ms')}ms"
+            )
+        print(line)
+    print(f"Results written to {args.output}")
@@ -0,0 +1,123 @@
+"""
+Encode/decode speed and footprint of the Redis payload codecs.
+
+Payloads are what the app caches or ships: transaction rows shaped like
+ss_transactions (Decimal, date, timestamptz) and per-user rule bundles.
+Every codec/compression pair is timed with min_size=0 so compression always
+applies; ``peak_kb`` is the tracemalloc peak of one encode + decode.
+
+> source .env
+> python app/benchmarks/bench_codecs.py --rows 100 1000 10000 --rules 20 200
+"""
+
+import argparse
+import json
+import timeit
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+from app.core.codecs import CODEC_NAMES, COMPRESSION_NAMES, Serializer, register_namespace
+
+OUTPUT_PATH = Path("./app/temp/bench_codecs.json")
+# decode only unpickles keys in a pickle namespace
+register_namespace("bench:pickle:", Serializer.named("pickle"))
+ENTITIES = ["SWIGGY", "AMAZON RETAIL", "RAMESH KUMAR", "ACME PAYROLL", "CITY POWER"]
+
+
+def transaction_rows(count: int) -> list[dict]:
+    start = datetime(2025, 1, 1, 9, 0, tzinfo=timezone.utc)
+    rows = []
+    for k in range(count):
+        entity = ENTITIES[k % len(ENTITIES)]
+        rows.append({
+            "id": 100000 + k,
+            "user_id": 1,
+            "bank_account_id": 3,
+            "type_id": 1 + k % 2,
+            "category_id": (k % 17) or None,
+            "tag_id": None,
+            "payment_method_id": 1,
+            "reference_id": f"UPI-{k:012d}",
+            "amount": Decimal(f"{k % 9000 + 10}.{k % 100:02d}"),
+            "currency": "INR",
+            "description": f"UPI/DR/5{k:011d}/{entity}/HDFC/Payment",
+            "entity_name": entity,
+            "transaction_date": date(2025, 1, 1) + timedelta(days=k // 20),
+            "created_at": start + timedelta(minutes=k),
+            "is_active": True,
+        })
+    return rows
+
+
+def rule_bundle(count: int) -> list[dict]:
+    return [
+        {
+            "id": k,
+            "bank_account_id": None if k % 3 else 3,
+            "dsl_text": (
+                f'rule "Rule {k} - {ENTITIES[k % len(ENTITIES)]}" '
+                f'where description:c:"{ENTITIES[k % len(ENTITIES)]}":i and amount:gt:"{k * 10}" '
+                f"assign category_id:{k % 17 + 1} payment_method_id:1 priority {k};"
+            ),
+        }
+        for k in range(count)
+    ]
+
+
+def measure(serializer: Serializer, payload, repeat: int, key: str) -> dict:
+    encoded = serializer.encode(payload)
+    encode_s = min(timeit.repeat(lambda: serializer.encode(payload), number=1, repeat=repeat))
+    decode_s = min(timeit.repeat(lambda: Serializer.decode(encoded, key), number=1, repeat=repeat))
+
+    tracemalloc.start()
+    Serializer.decode(serializer.encode(payload), key)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "bytes": len(encoded),
+        "encode_ms": round(encode_s * 1000, 3),
+        "decode_ms": round(decode_s * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run(row_counts: list[int], rule_counts: list[int], repeat: int) -> list[dict]:
+    cases = [(f"transactions x{n}", transaction_rows(n)) for n in row_counts]
+    cases += [(f"rules x{n}", rule_bundle(n)) for n in rule_counts]
+
+    results = []
+    for label, payload in cases:
+        for codec in CODEC_NAMES:
+            for compression in COMPRESSION_NAMES:
+                serializer = Serializer.named(codec, compression, min_size=0)
+                results.append({
+                    "payload": label,
+                    "codec": codec,
+                    "compression": compression,
+                    **measure(serializer, payload, repeat, f"bench:{codec}:"),
+                })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Redis payload codecs")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--rules", type=int, nargs="+", default=[20, 200])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH, help="JSON results path")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.rules, args.repeat)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+
+    for r in results:
+        print(
+            f"{r['payload']:<20} {r['codec']:<8} {r['compression']:<5} {r['bytes']:>9}B "
+            f"enc={r['encode_ms']:>8.3f}ms dec={r['decode_ms']:>8.3f}ms peak={r['peak_kb']:>8.1f}KB"
+        )
+    print(f"Results written to {args.output}")
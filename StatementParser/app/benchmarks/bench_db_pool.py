@@ -0,0 +1,76 @@
+"""
+Throughput of get_cursor through the pool against a fresh connect per call.
+
+Each worker thread runs ``--calls`` short queries. ``connect`` opens and
+closes a connection per query (the old get_cursor), ``pool`` borrows from
+the process pool. Pool stats are printed after the pooled runs.
+
+> source .env
+> python app/benchmarks/bench_db_pool.py --calls 200 --threads 1 8 32
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.database import close_pool, connect, get_cursor, get_pool, pool_stats
+
+QUERY = "SELECT 1"
+
+
+def _per_call_connect(calls: int) -> None:
+    for _ in range(calls):
+        with connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(QUERY)
+                cur.fetchone()
+
+
+def _pooled(calls: int) -> None:
+    for _ in range(calls):
+        with get_cursor() as cur:
+            cur.execute(QUERY)
+            cur.fetchone()
+
+
+MODES = {"connect": _per_call_connect, "pool": _pooled}
+
+
+def run(mode: str, calls: int, threads: int) -> dict:
+    work = MODES[mode]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(work, calls) for _ in range(threads)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    total = calls * threads
+    return {
+        "mode": mode,
+        "threads": threads,
+        "queries": total,
+        "seconds": round(elapsed, 3),
+        "queries_per_sec": round(total / elapsed, 1),
+        "ms_per_query": round(elapsed * 1000 / total, 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-call Postgres connections")
+    parser.add_argument("--calls", type=int, default=200, help="Queries per thread")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    # Warm the pool so the first pooled run doesn't pay min_size connects
+    get_pool().wait()
+
+    for threads in args.threads:
+        for mode in MODES:
+            r = run(mode, args.calls, threads)
+            print(
+                f"{r['mode']:<8} threads={r['threads']:<3} {r['queries_per_sec']:>9.1f} q/s "
+                f"{r['ms_per_query']:>7.3f} ms/q"
+            )
+        print(f"pool     {pool_stats()}")
+
+    close_pool()
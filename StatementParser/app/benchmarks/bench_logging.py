@@ -0,0 +1,101 @@
+"""
+Per-call cost of hot-path logging: eager f-strings vs lazy %-args, with the
+level enabled and disabled, through synchronous handlers and the queue.
+
+Each case logs ``--calls`` row-fallback style messages to a rotating file
+handler (the ``app`` logger setup) and reports the time spent in the
+calling thread; with the queue the file I/O happens on the listener thread.
+
+> source .env
+> python app/benchmarks/bench_logging.py --calls 20000
+"""
+
+import argparse
+import json
+import logging
+import queue
+import tempfile
+import time
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+
+from app.config.logger import LocalQueueHandler
+
+OUTPUT_PATH = Path("./app/temp/bench_logging.json")
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(module)s:%(funcName)s:%(lineno)d - %(message)s"
+ROW_ERROR = ValueError('duplicate key value violates unique constraint "uq_transaction_reference"')
+
+
+def eager(logger: logging.Logger, calls: int) -> None:
+    for k in range(calls):
+        logger.debug(f"Failed to insert row {k}: {ROW_ERROR}")
+
+
+def lazy(logger: logging.Logger, calls: int) -> None:
+    for k in range(calls):
+        logger.debug("Failed to insert row %d: %s", k, ROW_ERROR)
+
+
+def bench_logger(log_dir: Path, level: int, use_queue: bool) -> tuple[logging.Logger, QueueListener | None]:
+    handler = RotatingFileHandler(log_dir / "bench.log", maxBytes=50 * 1024 * 1024, backupCount=1)
+    handler.setFormatter(logging.Formatter(FORMAT))
+
+    logger = logging.getLogger(f"bench_logging.{level}.{use_queue}")
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(level)
+
+    listener = None
+    if use_queue:
+        queue_handler = LocalQueueHandler(queue.SimpleQueue())
+        listener = QueueListener(queue_handler.queue, handler)
+        listener.start()
+        logger.addHandler(queue_handler)
+    else:
+        logger.addHandler(handler)
+    return logger, listener
+
+
+def run(calls: int) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for level in (logging.INFO, logging.DEBUG):
+            for use_queue in (False, True):
+                for style, func in (("f-string", eager), ("lazy", lazy)):
+                    logger, listener = bench_logger(Path(tmp), level, use_queue)
+                    start = time.perf_counter()
+                    func(logger, calls)
+                    caller_s = time.perf_counter() - start
+                    if listener:
+                        listener.stop()
+                    total_s = time.perf_counter() - start
+                    for handler in logger.handlers:
+                        handler.close()
+
+                    results.append({
+                        "debug": level == logging.DEBUG,
+                        "handlers": "queue" if use_queue else "sync",
+                        "style": style,
+                        "caller_us": round(caller_s / calls * 1e6, 3),
+                        "total_ms": round(total_s * 1000, 1),
+                    })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark hot-path logging")
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH, help="JSON results path")
+    args = parser.parse_args()
+
+    results = run(args.calls)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+
+    for r in results:
+        print(
+            f"debug={'on ' if r['debug'] else 'off'} {r['handlers']:<5} {r['style']:<8} "
+            f"caller={r['caller_us']:>8.3f}us/call total={r['total_ms']:>8.1f}ms"
+        )
+    print(f"Results written to {args.output}")
@@ -0,0 +1,163 @@
+"""
+Per-stage cost of parse_statement on the synthetic corpus.
+
+Each statement is profiled in a fresh process so peak RSS is per file.
+Stages follow parse_statement: open (every pdfplumber.open), text (first
+pages for detection), detection, tables (extract_page_tables), merge
+(parser.table_rows), normalize (account details + parse_rows) and dedup
+(the uq_transaction_reference key).
+
+> source .env
+> python app/benchmarks/bench_parse_statement.py --pages 1 10 100
+> python app/benchmarks/bench_parse_statement.py --baseline app/temp/bench_baseline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pdfplumber
+from app.benchmarks.statement_corpus import CORPUS_DIR, CORPUS_PAGES, LAYOUTS, build_corpus
+from app.common.enums import BankName
+from app.pdf_normalizer.layout_templates import extract_page_tables
+from app.pdf_normalizer.parser import detect_parser
+
+STAGES = ("open", "text", "detection", "tables", "merge", "normalize", "dedup")
+OUTPUT_PATH = Path("./app/temp/bench_parse_statement.json")
+
+# Pages read for detection, same as get_bank_identifier
+IDENTIFIER_PAGES = 3
+
+
+def dedup_transactions(transactions: list[dict]) -> list[dict]:
+    """Keep the first row per (amount, reference_id), as the unique constraint would."""
+    seen = set()
+    unique = []
+    for txn in transactions:
+        key = (txn["amount"], txn["reference_id"])
+        if key not in seen:
+            seen.add(key)
+            unique.append(txn)
+    return unique
+
+
+def profile_statement(path: str) -> dict:
+    timings = dict.fromkeys(STAGES, 0.0)
+
+    @contextmanager
+    def timed(stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[stage] += time.perf_counter() - start
+
+    total_start = time.perf_counter()
+
+    with timed("open"):
+        pdf = pdfplumber.open(path)
+        pages = len(pdf.pages)
+    with pdf:
+        with timed("text"):
+            text = "\n".join(
+                t for page in pdf.pages[:IDENTIFIER_PAGES] if (t := page.extract_text())
+            )
+
+    with timed("detection"):
+        parser = detect_parser(text)
+
+    rows = []
+    with timed("open"):
+        pdf = pdfplumber.open(path)
+    with pdf:
+        for page in pdf.pages:
+            with timed("tables"):
+                tables = extract_page_tables(page, bank_name=parser.bank_name)
+
+            with timed("merge"):
+                rows.extend(parser.table_rows(tables))
+
+    with timed("normalize"):
+        account_details = parser.parse_account_details(text=text)
+        transactions = parser.parse_rows(rows)
+
+    with timed("dedup"):
+        unique = dedup_transactions(transactions)
+
+    total = time.perf_counter() - total_start
+    return {
+        "bank": parser.bank_name.lower(),
+        "pages": pages,
+        "rows": len(rows),
+        "transactions": len(transactions),
+        "unique_transactions": len(unique),
+        "account_number": account_details.get("number"),
+        "stages_s": {stage: round(seconds, 6) for stage, seconds in timings.items()},
+        "total_s": round(total, 6),
+        "pages_per_sec": round(pages / total, 3) if total else None,
+        # Linux reports ru_maxrss in KiB
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def run(pages: tuple[int, ...], banks: list[BankName] | None, corpus_dir: Path) -> list[dict]:
+    corpus = build_corpus(pages, banks, corpus_dir)
+
+    # One spawned process per statement keeps peak RSS and caches per file
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for _, _, path in corpus:
+        with ctx.Pool(processes=1) as pool:
+            results.append(pool.apply(profile_statement, (str(path),)))
+    return results
+
+
+def find_regressions(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Cases whose pages/sec fell more than ``tolerance`` below the baseline."""
+    previous = {(r["bank"], r["pages"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        before = previous.get((r["bank"], r["pages"]))
+        if not before or not before["pages_per_sec"]:
+            continue
+        if r["pages_per_sec"] < before["pages_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{r['bank']} {r['pages']}p: {before['pages_per_sec']} -> {r['pages_per_sec']} pages/sec"
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile parse_statement per stage")
+    parser.add_argument("--pages", type=int, nargs="+", default=list(CORPUS_PAGES))
+    parser.add_argument("--banks", nargs="+", choices=[str(b) for b in LAYOUTS], default=None)
+    parser.add_argument("--corpus-dir", type=Path, default=CORPUS_DIR)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH, help="JSON results path")
+    parser.add_argument("--baseline", type=Path, help="Previous JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed pages/sec drop (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    banks = [BankName(b) for b in args.banks] if args.banks else None
+    results = run(tuple(args.pages), banks, args.corpus_dir)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+
+    for r in results:
+        stages = " ".join(f"{s}={r['stages_s'][s] * 1000:.0f}ms" for s in STAGES)
+        print(
+            f"{r['bank']:<6} {r['pages']:>4}p {r['pages_per_sec']:>8.2f} pages/s "
+            f"rss={r['peak_rss_mb']:.0f}MB txns={r['transactions']} | {stages}"
+        )
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = find_regressions(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
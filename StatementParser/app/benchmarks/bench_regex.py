@@ -0,0 +1,113 @@
+"""
+Per-row regex overhead of pdf_normalizer: inline patterns vs the compiled registry.
+
+> source .env
+> python app/benchmarks/bench_regex.py --rows 20000
+"""
+
+import argparse
+import re
+import time
+
+from app.common.constants import PAYMENT_METHODS
+from app.pdf_normalizer.values_extract import (
+    extract_entity_name,
+    extract_payment_method,
+    parse_amount,
+)
+
+SAMPLE_DETAILS = [
+    "UPI/DR/532462637529/NISHANT KANTI G/UBIN/Payment from Ph",
+    "UPIAR/276509066224/CR/SWIGGY/HDFC/food",
+    "NEFT-HDFCN52025111512345-ACME PAYROLL PVT LTD-SALARY",
+    "IMPS-532412345678-RAMESH KUMAR-SBIN",
+    "RTGS-UTIBR52025-BIG VENDOR LLP-INV 42",
+    "NACH/TPSL/ICICI PRU LIFE",
+    "ACH/HDFC MF/SIP 1234",
+    "CHQ DEP 000123 CLG",
+    "ATW-512345XXXXXX1234-S1ANMU01-MUMBAI",
+    "POS 512345XXXXXX1234 AMAZON RETAIL",
+    "INB/IMPS/FUND TRANSFER",
+    "MB FUND TRANSFER TO SELF",
+    "INT.PD:31-12-2025",
+    "CASH DEPOSIT SELF",
+]
+
+SAMPLE_AMOUNTS = ["+20,000.00", "-500.00", "1,23,456.78 (Dr)", "73,179.26", ""]
+
+
+def legacy_parse_amount(value: str):
+    if not value:
+        return None
+    cleaned = re.sub(r"[^\d.]", "", value)
+    return cleaned if cleaned else None
+
+
+def legacy_extract_payment_method(details: str):
+    details = details.replace("\n", " ").strip().upper()
+    return next(
+        (
+            method
+            for method, pattern in PAYMENT_METHODS.items()
+            if re.search(pattern, details)
+        ),
+        None,
+    )
+
+
+def legacy_extract_entity_name(details: str):
+    details = details.replace("\n", " ").strip()
+    if details.upper().startswith("UPI"):
+        match = re.search(r"/(?:DR|CR)/([^/]+)/", details, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+        parts = details.split("/")
+        if len(parts) >= 2:
+            return parts[1].strip()
+    for prefix in ("NEFT", "IMPS", "RTGS"):
+        if details.upper().startswith(prefix):
+            match = re.search(rf"{prefix}-[^-]+-([^-]+)", details, re.IGNORECASE)
+            if match:
+                return match.group(1).strip()
+    return None
+
+
+def _time(fn, values: list[str], rows: int) -> float:
+    start = time.perf_counter()
+    n = len(values)
+    for i in range(rows):
+        fn(values[i % n])
+    return time.perf_counter() - start
+
+
+def run(rows: int) -> list[dict]:
+    cases = [
+        ("parse_amount", legacy_parse_amount, parse_amount, SAMPLE_AMOUNTS),
+        ("extract_payment_method", legacy_extract_payment_method, extract_payment_method, SAMPLE_DETAILS),
+        ("extract_entity_name", legacy_extract_entity_name, extract_entity_name, SAMPLE_DETAILS),
+    ]
+
+    results = []
+    for name, legacy, current, values in cases:
+        legacy_s = _time(legacy, values, rows)
+        current_s = _time(current, values, rows)
+        results.append({
+            "name": name,
+            "rows": rows,
+            "legacy_us_per_row": legacy_s / rows * 1e6,
+            "registry_us_per_row": current_s / rows * 1e6,
+            "speedup": legacy_s / current_s if current_s else None,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-row regex overhead")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows per function")
+    args = parser.parse_args()
+
+    for r in run(args.rows):
+        print(
+            f"{r['name']:<24} legacy={r['legacy_us_per_row']:.2f}us "
+            f"registry={r['registry_us_per_row']:.2f}us speedup={r['speedup']:.2f}x"
+        )
@@ -0,0 +1,225 @@
+"""
+Synthetic statement PDFs for the parser benchmarks.
+
+One ruled transaction table per page in the column layout each bank parser
+expects (Union, SBI, Kotak), with the header text the detectors look for and
+a wrapped continuation row every few transactions. Files are generated once
+and reused from ``CORPUS_DIR``.
+
+> source .env
+> python app/benchmarks/statement_corpus.py --pages 1 10 100 500
+"""
+
+import argparse
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable
+
+import pikepdf
+from app.common.enums import BankName
+
+CORPUS_DIR = Path("./app/temp/bench_corpus")
+CORPUS_PAGES = (1, 10, 100, 500)
+
+PAGE_SIZE = (595, 842)
+ROWS_PER_PAGE = 30
+ROW_HEIGHT = 18
+TABLE_TOP = 700
+FONT_SIZE = 7
+
+# Every Nth transaction wraps its description onto a dateless row
+WRAP_EVERY = 7
+
+START_DATE = date(2025, 1, 1)
+ENTITIES = ["SWIGGY", "AMAZON RETAIL", "RAMESH KUMAR", "ACME PAYROLL", "CITY POWER"]
+
+
+@dataclass
+class BankLayout:
+    bank_name: BankName
+    header_lines: list[str]
+    columns: list[int]
+    header_row: list[str]
+    make_row: Callable[[int], list[str]]
+    # Column the wrapped description continues in
+    wrap_column: int
+
+
+def _date(k: int) -> date:
+    return START_DATE + timedelta(days=k // 20)
+
+
+def _description(k: int) -> str:
+    entity = ENTITIES[k % len(ENTITIES)]
+    if k % 3 == 0:
+        return f"NEFT-HDFCN5{k:010d}-{entity}-SALARY"
+    return f"UPI/DR/5{k:011d}/{entity}/HDFC/Payment"
+
+
+def _union_row(k: int) -> list[str]:
+    kind = "Cr" if k % 4 == 0 else "Dr"
+    return [
+        _date(k).strftime("%d/%m/%Y"),
+        f"S{k:08d}",
+        _description(k),
+        f"{k % 900 + 10}.00 ({kind})",
+        f"{50000 + k}.00",
+    ]
+
+
+def _sbi_row(k: int) -> list[str]:
+    amount = f"{k % 900 + 10}.00"
+    is_credit = k % 4 == 0
+    return [
+        _date(k).strftime("%d-%m-%y"),
+        _description(k),
+        f"{k:010d}",
+        amount if is_credit else "-",
+        "-" if is_credit else amount,
+        f"{50000 + k}.00",
+    ]
+
+
+def _kotak_row(k: int) -> list[str]:
+    amount = f"{k % 900 + 10}.00"
+    is_credit = k % 4 == 0
+    return [
+        str(k),
+        _date(k).strftime("%d %b %Y"),
+        _description(k),
+        f"UPI-{k:010d}",
+        "" if is_credit else amount,
+        amount if is_credit else "",
+        f"{50000 + k}.00",
+    ]
+
+
+LAYOUTS = {
+    BankName.UNION: BankLayout(
+        bank_name=BankName.UNION,
+        header_lines=[
+            "Union Bank of India  IFSC Code: UBIN0530000",
+            "Account No: 123456789012  Savings Account",
+        ],
+        columns=[40, 100, 160, 380, 470, 555],
+        header_row=["Date", "Tran Id", "Remarks", "Amount", "Balance"],
+        make_row=_union_row,
+        wrap_column=2,
+    ),
+    BankName.SBI: BankLayout(
+        bank_name=BankName.SBI,
+        header_lines=[
+            "State Bank of India  IFSC: SBIN0001234",
+            "Account Number : XXXXXXX1234  Savings Account",
+        ],
+        columns=[40, 90, 280, 340, 400, 460, 555],
+        header_row=["Date", "Description", "Ref No", "Credit", "Debit", "Balance"],
+        make_row=_sbi_row,
+        wrap_column=1,
+    ),
+    BankName.KOTAK: BankLayout(
+        bank_name=BankName.KOTAK,
+        header_lines=[
+            "Kotak Mahindra Bank  IFSC Code KKBK0001234",
+            "Account No. 1234567890  Account Type Savings",
+        ],
+        columns=[30, 50, 100, 310, 375, 430, 485, 560],
+        header_row=["#", "Date", "Description", "Chq/Ref No", "Debit", "Credit", "Balance"],
+        make_row=_kotak_row,
+        wrap_column=2,
+    ),
+}
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_rows(layout: BankLayout, first: int) -> tuple[list[list[str]], int]:
+    """Rows for one page starting at transaction ``first``, returns the next index."""
+    rows = []
+    k = first
+    while len(rows) < ROWS_PER_PAGE:
+        rows.append(layout.make_row(k))
+        if k % WRAP_EVERY == 0 and len(rows) < ROWS_PER_PAGE:
+            wrapped = [""] * len(layout.header_row)
+            wrapped[layout.wrap_column] = "Ref Txn"
+            rows.append(wrapped)
+        k += 1
+    return rows, k
+
+
+def _page_content(layout: BankLayout, rows: list[list[str]], page_no: int) -> bytes:
+    cols = layout.columns
+    ops = [
+        f"BT /F1 10 Tf 40 {790 - i * 14} Td ({_escape(line)}) Tj ET"
+        for i, line in enumerate(layout.header_lines)
+    ]
+
+    table = [layout.header_row] + rows
+    bottom = TABLE_TOP - len(table) * ROW_HEIGHT
+    for i in range(len(table) + 1):
+        y = TABLE_TOP - i * ROW_HEIGHT
+        ops.append(f"{cols[0]} {y} m {cols[-1]} {y} l S")
+    for x in cols:
+        ops.append(f"{x} {TABLE_TOP} m {x} {bottom} l S")
+
+    for i, row in enumerate(table):
+        y = TABLE_TOP - (i + 1) * ROW_HEIGHT + 6
+        for j, cell in enumerate(row):
+            if cell:
+                ops.append(f"BT /F1 {FONT_SIZE} Tf {cols[j] + 2} {y} Td ({_escape(cell)}) Tj ET")
+
+    ops.append(f"BT /F1 8 Tf 40 40 Td (Page {page_no} - computer generated statement) Tj ET")
+    return "\n".join(ops).encode()
+
+
+def generate_statement(layout: BankLayout, pages: int, path: Path) -> Path:
+    pdf = pikepdf.new()
+    font = pikepdf.Dictionary(
+        Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1, BaseFont=pikepdf.Name.Helvetica
+    )
+
+    k = 1
+    for page_no in range(1, pages + 1):
+        rows, k = _page_rows(layout, k)
+        page = pdf.add_blank_page(page_size=PAGE_SIZE)
+        page.obj.Resources = pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=font))
+        page.obj.Contents = pdf.make_stream(_page_content(layout, rows, page_no))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pdf.save(path)
+    return path
+
+
+def corpus_path(bank_name: BankName, pages: int, directory: Path = CORPUS_DIR) -> Path:
+    return directory / f"{bank_name}_{pages}p.pdf"
+
+
+def build_corpus(
+    pages: tuple[int, ...] = CORPUS_PAGES,
+    banks: list[BankName] | None = None,
+    directory: Path = CORPUS_DIR,
+) -> list[tuple[BankName, int, Path]]:
+    """Generate missing corpus files, returns (bank, pages, path) per file."""
+    corpus = []
+    for bank_name in banks or list(LAYOUTS):
+        for count in pages:
+            path = corpus_path(bank_name, count, directory)
+            if not path.exists():
+                generate_statement(LAYOUTS[bank_name], count, path)
+            corpus.append((bank_name, count, path))
+    return corpus
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the synthetic statement corpus")
+    parser.add_argument("--pages", type=int, nargs="+", default=list(CORPUS_PAGES))
+    parser.add_argument("--banks", nargs="+", choices=[str(b) for b in LAYOUTS], default=None)
+    parser.add_argument("--dir", type=Path, default=CORPUS_DIR, help="Output directory")
+    args = parser.parse_args()
+
+    banks = [BankName(b) for b in args.banks] if args.banks else None
+    for bank_name, count, path in build_corpus(tuple(args.pages), banks, args.dir):
+        print(f"{bank_name:<6} {count:>4} pages -> {path}")
@@ -1,12 +1,19 @@
 """
 Logger config
 
+Named loggers log through a QueueHandler; a QueueListener thread per logger
+runs the console/file handlers, so the calling thread only enqueues the
+record. LOG_QUEUE=false keeps the handlers synchronous.
+
 > python ./app/config/logger.py
 """
 
+import atexit
 import logging
 import logging.config
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Any, Dict
 
@@ -34,6 +41,21 @@ class ColoredFormatter(logging.Formatter):
         return super().format(record)
 
 
+class LocalQueueHandler(QueueHandler):
+    """
+    QueueHandler for a listener thread in the same process: the record is
+    enqueued as is and formatted by the listener's handlers, instead of
+    QueueHandler.prepare formatting it (and its traceback) on the caller.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+# (LocalQueueHandler, QueueListener) per named logger, see _use_queue
+_queues: list[tuple[LocalQueueHandler, QueueListener]] = []
+
+
 def get_logging_config(
     log_level: str = "INFO",
     log_dir="logs",
@@ -129,6 +151,7 @@ def setup_logging(
     enable_colors: bool = True,
     max_file_size_mb: int = 15,
     backup_count: int = 10,
+    use_queue: bool = None,
 ) -> None:
     """
     Build's logger
@@ -136,6 +159,11 @@ def setup_logging(
     if log_level is None:
         log_level = os.getenv("LOG_LEVEL", "INFO")
 
+    if use_queue is None:
+        use_queue = os.getenv("LOG_QUEUE", "true").lower() != "false"
+
+    stop_queue_logging()
+
     if environment is None:
         environment = Environment.DEVELOPMENT.value
 
@@ -168,6 +196,59 @@ def setup_logging(
 
     _setup_noise_reduction()
 
+    if use_queue:
+        _use_queue(config["loggers"])
+
+
+def _use_queue(logger_names) -> None:
+    """Move each logger's handlers behind a QueueHandler and start their listener."""
+    for logger_name in logger_names:
+        logger = logging.getLogger(logger_name)
+        handlers = list(logger.handlers)
+        queue_handler = LocalQueueHandler(queue.SimpleQueue())
+        listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+        listener.start()
+        _queues.append((queue_handler, listener))
+
+
+def stop_queue_logging() -> None:
+    """Flush the queued records and put the handlers back on their loggers."""
+    while _queues:
+        queue_handler, listener = _queues.pop()
+        listener.stop()
+        for logger in _loggers_with(queue_handler):
+            logger.removeHandler(queue_handler)
+            for handler in listener.handlers:
+                logger.addHandler(handler)
+
+
+def _loggers_with(handler: logging.Handler) -> list[logging.Logger]:
+    return [
+        logger
+        for logger in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger) and handler in logger.handlers
+    ]
+
+
+def _restart_listeners() -> None:
+    # Listener threads do not survive a fork (Celery prefork): the child gets
+    # a new queue and listener over the same handlers
+    for i, (queue_handler, listener) in enumerate(_queues):
+        queue_handler.queue = queue.SimpleQueue()
+        child_listener = QueueListener(
+            queue_handler.queue, *listener.handlers, respect_handler_level=listener.respect_handler_level
+        )
+        child_listener.start()
+        _queues[i] = (queue_handler, child_listener)
+
+
+atexit.register(stop_queue_logging)
+os.register_at_fork(after_in_child=_restart_listeners)
+
 
 def _setup_noise_reduction() -> None:
     noisy_loggers = [
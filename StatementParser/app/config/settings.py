@@ -67,15 +67,38 @@ class Settings(BaseSettings):
     DB_DRIVER: Optional[str] = None
     SQL_DATABASE_URL: Optional[str] = None  # Build field
     SQL_DATABASE_CONFIG: Optional[dict] = None
+    # Per process pool (each API worker / Celery child opens its own)
+    DATABASE_POOL_MIN_SIZE: int = 1
+    DATABASE_POOL_MAX_SIZE: int = 10
+    DATABASE_POOL_TIMEOUT: float = 20.0
 
     # Background process
     CELERY_USE_DB: bool = False
     CELERY_BROKER_URL: str
     CELERY_BACKEND_URL: str
     CELERY_DEFAULT_QUEUE: str = "statement_q"
+    # Prometheus exporter of a Celery worker (app.core.metrics), off when unset
+    METRICS_PORT: Optional[int] = None
+    # Task profiling defaults (app.core.task_profiler), overridable live in Redis
+    TASK_PROFILE_TASKS: str = ""  # comma separated task names
+    TASK_PROFILE_SAMPLE_RATE: float = 0.0
+    TASK_PROFILE_MODE: str = "sample"  # sample | cprofile
+    TASK_PROFILE_DIR: str = "./app/temp/profiles"
 
     # Genral cache
     REDIS_URL: str
+    # In-process tier in front of Redis (app.core.cache)
+    CACHE_LOCAL_MAX_ENTRIES: int = 2048
+    CACHE_LOCAL_TTL: int = 30
+    # Per rule evaluation stats on every categorization (app.core.rule_stats)
+    RULE_PROFILING: bool = False
+
+    # Superset dashboards warmed after ingestion (app.core.superset_cache)
+    SUPERSET_WARMUP_ENABLED: bool = True
+    SUPERSET_WARMUP_QUEUE: str = "superset"
+    SUPERSET_WARMUP_TAGS: str = "ss_warmup"  # comma separated dashboard tags
+    # Where Superset reads the data version counters, the same URL as in superset_config
+    DATA_VERSION_REDIS_URL: str
 
 
     @field_validator("NOTIFY_EMAILS", mode="before")
@@ -0,0 +1,412 @@
+"""
+Two-tier cache: an in-process TTL/LRU in front of Redis.
+
+Reads check the local tier, then Redis, then run the loader. Loads are
+single-flight per key (a thread lock inside the process, a short Redis lock
+across processes) so a cold key is only fetched once. ``None`` results can be
+cached for ``negative_ttl`` to absorb repeated lookups of missing rows.
+
+Local entries live at most ``CACHE_LOCAL_TTL`` seconds, which bounds how long
+another process can serve a value after it was invalidated in Redis.
+Payloads are encoded with the namespace's codec (app.core.codecs), in both
+tiers, so a hit returns the same types (Decimal, date ...) as the load did.
+
+> source .env
+> python app/core/cache.py
+"""
+
+import fnmatch
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable
+
+import redis
+from app.config.settings import settings
+from app.core.codecs import Serializer, serializer_for
+from app.core.metrics import CACHE_EVENTS
+from app.core.redis_cache import redis_cache, scan_delete
+
+logger = logging.getLogger("app")
+
+MISSING = object()
+
+KEY_PREFIX = "cache"
+
+LOCK_TTL_MS = 10_000
+LOCK_WAIT_SECONDS = 5.0
+LOCK_POLL_SECONDS = 0.05
+
+
+class LocalCache:
+    """Thread safe LRU with a TTL per entry. Holds encoded payloads, so callers never share objects."""
+
+    def __init__(self, max_entries: int, counters: Counter, lock: threading.Lock):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._counters = counters
+        self._lock = lock
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._counters["local_expirations"] += 1
+                return None
+            self._data.move_to_end(key)
+            return payload
+
+    def set(self, key: str, payload: bytes, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, payload)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._counters["local_evictions"] += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_matching(self, pattern: str) -> int:
+        with self._lock:
+            keys = [k for k in self._data if fnmatch.fnmatchcase(k, pattern)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TieredCache:
+    """
+    Local LRU + Redis with single-flight loads and negative caching.
+    Redis failures are logged and counted, and the loader still runs.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis = redis_cache.binary,
+        namespace: str = KEY_PREFIX,
+        local_max_entries: int = settings.CACHE_LOCAL_MAX_ENTRIES,
+        local_ttl: float = settings.CACHE_LOCAL_TTL,
+    ):
+        self.client = client
+        self.namespace = namespace
+        self.local_ttl = local_ttl
+        self._counters: Counter = Counter()
+        self._lock = threading.Lock()
+        self.local = LocalCache(local_max_entries, self._counters, threading.Lock())
+        # key -> [lock, threads holding or waiting on it]
+        self._flights: dict[str, list] = {}
+
+    def _reset_locks(self) -> None:
+        """Fresh locks in a forked child, a parent thread may have held one."""
+        self._lock = threading.Lock()
+        self.local._lock = threading.Lock()
+        self._flights = {}
+
+    def redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def serializer(self, key: str) -> Serializer:
+        return serializer_for(self.redis_key(key))
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+        CACHE_EVENTS.labels(name).inc()
+
+    def _lookup(self, key: str) -> Any:
+        payload = self.local.get(key)
+        if payload is not None:
+            self._count("local_hits")
+        else:
+            try:
+                payload = self.client.get(self.redis_key(key))
+            except redis.RedisError:
+                self._count("redis_errors")
+                logger.warning("Cache read failed for %s", key, exc_info=True)
+                payload = None
+
+            if payload is None:
+                return MISSING
+
+            self._count("redis_hits")
+            self.local.set(key, payload, self.local_ttl)
+
+        value = Serializer.decode(payload, self.redis_key(key))
+        if value is None:
+            self._count("negative_hits")
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Cached value, ``default`` when absent. A negatively cached key gives None."""
+        value = self._lookup(key)
+        if value is MISSING:
+            self._count("misses")
+            return default
+        return value
+
+    def set(self, key: str, value: Any, ttl: int) -> bytes:
+        payload = self.serializer(key).encode(value)
+        self.local.set(key, payload, min(ttl, self.local_ttl))
+        try:
+            self.client.set(self.redis_key(key), payload, ex=ttl)
+        except redis.RedisError:
+            self._count("redis_errors")
+            logger.warning("Cache write failed for %s", key, exc_info=True)
+        return payload
+
+    def delete(self, *keys: str) -> None:
+        """Drop keys from Redis and this process's local tier."""
+        for key in keys:
+            self.local.delete(key)
+        try:
+            self.client.delete(*(self.redis_key(k) for k in keys))
+        except redis.RedisError:
+            self._count("redis_errors")
+            logger.warning(f"Cache delete failed for {keys}", exc_info=True)
+
+    def get_many(self, keys: list[str]) -> dict:
+        """
+        Cached values for ``keys``: local tier first, the rest in one MGET.
+        Missing keys are left out of the result.
+        """
+        found, remote = {}, []
+        for key in keys:
+            payload = self.local.get(key)
+            if payload is None:
+                remote.append(key)
+            else:
+                self._count("local_hits")
+                found[key] = Serializer.decode(payload, self.redis_key(key))
+
+        if remote:
+            try:
+                payloads = self.client.mget([self.redis_key(k) for k in remote])
+            except redis.RedisError:
+                self._count("redis_errors")
+                logger.warning(f"Cache read failed for {len(remote)} keys", exc_info=True)
+                payloads = [None] * len(remote)
+
+            for key, payload in zip(remote, payloads):
+                if payload is None:
+                    self._count("misses")
+                    continue
+                self._count("redis_hits")
+                self.local.set(key, payload, self.local_ttl)
+                found[key] = Serializer.decode(payload, self.redis_key(key))
+        return found
+
+    def set_many(self, mapping: dict, ttl: int) -> None:
+        """Store every key in both tiers, one pipelined round trip to Redis."""
+        if not mapping:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            payload = self.serializer(key).encode(value)
+            self.local.set(key, payload, min(ttl, self.local_ttl))
+            pipe.set(self.redis_key(key), payload, ex=ttl)
+        try:
+            pipe.execute()
+        except redis.RedisError:
+            self._count("redis_errors")
+            logger.warning(f"Cache write failed for {len(mapping)} keys", exc_info=True)
+
+    def delete_pattern(self, pattern: str) -> int:
+        """
+        Drop every key matching a glob (``bank_account:42:*``) from Redis via
+        SCAN + UNLINK, and from this process's local tier.
+        """
+        self.local.delete_matching(pattern)
+        try:
+            return scan_delete(self.client, self.redis_key(pattern))
+        except redis.RedisError:
+            self._count("redis_errors")
+            logger.warning(f"Cache delete failed for {pattern}", exc_info=True)
+            return 0
+
+    @contextmanager
+    def _flight(self, key: str):
+        """
+        Hold the per key load lock. The entry is refcounted and only removed
+        by the last thread out, so a thread arriving while others still wait
+        gets the same lock instead of a fresh one.
+        """
+        with self._lock:
+            entry = self._flights.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._flights[key]
+
+    def _acquire_redis_lock(self, key: str, token: bytes) -> bool:
+        try:
+            return bool(self.client.set(self.redis_key(f"lock:{key}"), token, nx=True, px=LOCK_TTL_MS))
+        except redis.RedisError:
+            self._count("redis_errors")
+            return True
+
+    def _release_redis_lock(self, key: str, token: bytes) -> None:
+        lock_key = self.redis_key(f"lock:{key}")
+        try:
+            if self.client.get(lock_key) == token:
+                self.client.delete(lock_key)
+        except redis.RedisError:
+            self._count("redis_errors")
+
+    def _wait_for_value(self, key: str) -> Any:
+        """Another process is loading ``key``: poll Redis until it lands or the wait runs out."""
+        self._count("flight_waits")
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_SECONDS)
+            value = self._lookup(key)
+            if value is not MISSING:
+                return value
+        return MISSING
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: int,
+        negative_ttl: int | None = None,
+    ) -> Any:
+        """
+        Cached value for ``key`` or ``loader()`` stored for ``ttl`` seconds.
+        A None result is stored for ``negative_ttl`` seconds, or not at all.
+        """
+        value = self._lookup(key)
+        if value is not MISSING:
+            return value
+
+        with self._flight(key):
+            # A thread that held the lock before us may have filled it
+            value = self._lookup(key)
+            if value is not MISSING:
+                self._count("flight_waits")
+                return value
+
+            token = uuid.uuid4().hex.encode()
+            locked = self._acquire_redis_lock(key, token)
+            if not locked:
+                value = self._wait_for_value(key)
+                if value is not MISSING:
+                    return value
+
+            try:
+                self._count("misses")
+                self._count("loads")
+                value = loader()
+                if value is not None:
+                    self.set(key, value, ttl)
+                elif negative_ttl:
+                    self.set(key, None, negative_ttl)
+                return value
+            finally:
+                if locked:
+                    self._release_redis_lock(key, token)
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters of this process since start."""
+        with self._lock:
+            counters = dict(self._counters)
+        hits = counters.get("local_hits", 0) + counters.get("redis_hits", 0)
+        lookups = hits + counters.get("misses", 0)
+        return {
+            "pid": os.getpid(),
+            "local_entries": len(self.local),
+            "local_max_entries": self.local.max_entries,
+            "local_hits": counters.get("local_hits", 0),
+            "redis_hits": counters.get("redis_hits", 0),
+            "negative_hits": counters.get("negative_hits", 0),
+            "misses": counters.get("misses", 0),
+            "loads": counters.get("loads", 0),
+            "flight_waits": counters.get("flight_waits", 0),
+            "local_evictions": counters.get("local_evictions", 0),
+            "local_expirations": counters.get("local_expirations", 0),
+            "redis_errors": counters.get("redis_errors", 0),
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+        }
+
+
+tiered_cache = TieredCache()
+os.register_at_fork(after_in_child=tiered_cache._reset_locks)
+
+
+def cached(
+    ttl: int,
+    key: str | Callable[..., str],
+    negative_ttl: int | None = None,
+    cache: TieredCache | None = None,
+):
+    """
+    Cache a function's result. ``key`` is a format string over the
+    function's arguments (``"user:email:{email}"``) or a callable taking the
+    same arguments. Arguments left out of the key, like ``cur``, don't affect
+    it. The wrapper gets ``cache_key(...)`` and ``invalidate(...)``.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def cache_key(*args, **kwargs) -> str:
+            if callable(key):
+                return key(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return key.format(**bound.arguments)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return (cache or tiered_cache).get_or_load(
+                cache_key(*args, **kwargs),
+                lambda: func(*args, **kwargs),
+                ttl=ttl,
+                negative_ttl=negative_ttl,
+            )
+
+        def invalidate(*args, **kwargs) -> None:
+            (cache or tiered_cache).delete(cache_key(*args, **kwargs))
+
+        wrapper.cache_key = cache_key
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    return decorator
+
+
+if __name__ == "__main__":
+
+    @cached(ttl=60, key="demo:{n}")
+    def slow_square(n: int) -> int:
+        time.sleep(0.5)
+        return n * n
+
+    for _ in range(3):
+        start = time.perf_counter()
+        print(slow_square(12), f"{(time.perf_counter() - start) * 1000:.1f}ms")
+    slow_square.invalidate(12)
+    print(tiered_cache.stats())
@@ -7,16 +7,24 @@ Set USE_DB=true to enable MSSQL result backend.
 
 > celery -A app.core.celery_app.celery_app worker --loglevel=info
 > celery -A app.core.celery_app:celery_app worker -Q statment_parser,celery --loglevel=info  --events
+
+Parsing is CPU bound, DB writes are I/O bound, so they run on separate queues:
+> celery -A app.core.celery_app worker -Q statement_parser,celery --pool prefork --prefetch-multiplier 1
+> celery -A app.core.celery_app worker -Q statement_io --pool threads --concurrency 16
+
+Rule engine re-runs get their own queue so they don't hold up uploads:
+> celery -A app.core.celery_app worker -Q rule_engine --pool prefork --concurrency 2
 """
 
 import logging
 
 from app.config.settings import settings
 from app.core.celery_signal import BaseTaskSignal
+from app.core.database import close_pool, get_pool
 from celery import Celery
 # from celery.backends.database.models import TaskExtended, TaskSet
 from celery.schedules import crontab
-from celery.signals import worker_shutdown
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 
 logger = logging.getLogger(__name__)
 
@@ -53,11 +61,31 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.cleanup.cleanup_resources",
         "schedule": crontab(hour="9-21", day_of_week="1-5"),
     },
+    "daily-partition-check": {
+        "task": "app.tasks.partitions.ensure_partitions_task",
+        "schedule": crontab(hour=2, minute=0),
+    },
+    "nightly-rollup-refresh": {
+        "task": "app.tasks.rollups.refresh_rollups_task",
+        "schedule": crontab(hour=2, minute=30),
+    },
 }
 
 celery_app.autodiscover_tasks(["app"], related_name="tasks")
 
 
+@worker_process_init.connect
+def open_db_pool(**kwargs):
+    """Each prefork child opens its own Postgres pool after fork."""
+    get_pool()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_db_pool(**kwargs):
+    close_pool()
+
+
 @celery_app.task(name="app.core.celery_app.hello")
 def hello():
     """Test function"""
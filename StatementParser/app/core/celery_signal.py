@@ -6,11 +6,23 @@
 
 
 import logging
-
+import os
+import time
+
+from app.config.logger import stop_queue_logging
+from app.config.settings import settings
+from app.core.metrics import TASK_RETRIES, TASK_SECONDS, mark_process_dead, start_exporter
+from app.core.task_profiler import profile_task, profiling_mode
+from app.model_actions.rules import warm_rules
+from app.model_actions.user import get_active_user_ids
 from celery import Task
+from celery.signals import task_postrun, task_prerun, worker_init, worker_process_shutdown, worker_ready
 
 logger = logging.getLogger(__name__)
 
+# task id -> perf_counter at prerun, per worker process (threads pool included)
+_task_started: dict[str, float] = {}
+
 
 class BaseTaskSignal(Task):
     """
@@ -22,13 +34,22 @@ class BaseTaskSignal(Task):
     retry_backoff_max = 300
     retry_jitter = True
 
+    def __call__(self, *args, **kwargs):
+        """Runs the task, under a profiler when app.core.task_profiler selects this run."""
+        mode = profiling_mode(self.name)
+        if not mode:
+            return super().__call__(*args, **kwargs)
+
+        with profile_task(self.name, self.request.id or "local", mode):
+            return super().__call__(*args, **kwargs)
+
     def on_success(self, retval, task_id, args, kwargs):
-        logger.info(f"[SUCCESS] Task {self.name} ({task_id}) completed successfully.")
-        logger.debug(f"Return value: {retval}, Args: {args}, Kwargs: {kwargs}")
+        logger.info("[SUCCESS] Task %s (%s) completed successfully.", self.name, task_id)
+        logger.debug("Return value: %s, Args: %s, Kwargs: %s", retval, args, kwargs)
 
     def on_failure(self, exc, task_id, args, kwargs, einfo):
         logger.error(f"[FAILURE] Task {self.name} ({task_id}) failed with error: {exc}")
-        logger.debug(f"Args: {args}, Kwargs: {kwargs}, Traceback: {einfo}")
+        logger.debug("Args: %s, Kwargs: %s, Traceback: %s", args, kwargs, einfo)
 
     def on_retry(self, exc, task_id, args, kwargs, einfo):
         """Retry handler.
@@ -45,8 +66,9 @@ class BaseTaskSignal(Task):
         Returns:
             None: The return value of this handler is ignored.
         """
+        TASK_RETRIES.labels(self.name).inc()
         logger.error(f"[FAILURE] Task {self.name} ({task_id}) failed with error: {exc}")
-        logger.debug(f"Args: {args}, Kwargs: {kwargs}, Traceback: {einfo}")
+        logger.debug("Args: %s, Kwargs: %s, Traceback: %s", args, kwargs, einfo)
 
 
 class GenericTaskSignal(BaseTaskSignal):
@@ -55,11 +77,54 @@ class GenericTaskSignal(BaseTaskSignal):
     """
 
     def on_success(self, retval, task_id, args, kwargs):
-        logger.info(f"[SUCCESS] Task {self.name} ({task_id}) completed successfully.")
-        logger.debug(f"Return value: {retval}, Args: {args}, Kwargs: {kwargs}")
+        logger.info("[SUCCESS] Task %s (%s) completed successfully.", self.name, task_id)
+        logger.debug("Return value: %s, Args: %s, Kwargs: %s", retval, args, kwargs)
 
     def on_failure(self, exc, task_id, args, kwargs, einfo):
         logger.error(f"[FAILURE] Task {self.name} ({task_id}) failed with error: {exc}")
-        logger.debug(f"Args: {args}, Kwargs: {kwargs}, Traceback: {einfo}")
+        logger.debug("Args: %s, Kwargs: %s, Traceback: %s", args, kwargs, einfo)
+
+
+@task_prerun.connect
+def start_task_timer(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def observe_task(task_id=None, task=None, state=None, **kwargs):
+    """Run time of every task by name and final state (SUCCESS, FAILURE, RETRY ...)."""
+    started = _task_started.pop(task_id, None)
+    if started is not None and task is not None:
+        TASK_SECONDS.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+@worker_init.connect
+def start_metrics_exporter(**kwargs):
+    """Worker main process serves /metrics on METRICS_PORT, prefork children included in multiprocess mode."""
+    if settings.METRICS_PORT:
+        start_exporter(settings.METRICS_PORT)
+        logger.info(f"Metrics exporter listening on :{settings.METRICS_PORT}")
+
+
+@worker_ready.connect
+def warm_rule_cache(**kwargs):
+    """
+    Rule sets of every active user in one query and one pipelined write, so
+    the first uploads after a deploy or a Redis restart skip Postgres.
+    Best effort: a cold cache only costs a query per user.
+    """
+    try:
+        logger.info(f"Rule cache warmed for {warm_rules(get_active_user_ids())} users")
+    except Exception:
+        logger.warning("Rule cache warm-up failed", exc_info=True)
+
+
+@worker_process_shutdown.connect
+def drop_process_metrics(pid=None, **kwargs):
+    mark_process_dead(pid or os.getpid())
 
 
+@worker_process_shutdown.connect
+def flush_process_logs(**kwargs):
+    # Pool children leave with os._exit, atexit would not drain the log queue
+    stop_queue_logging()
@@ -1,81 +1,230 @@
 """
 Reusable PostgreSQL database module using psycopg3
+
+Connections come from a ConnectionPool per process. The pool is created
+lazily on first use and keyed by pid, so uvicorn/gunicorn workers and Celery
+prefork children each open their own after fork instead of sharing sockets
+inherited from the parent.
+
+Async endpoints use get_async_cursor(), backed by an AsyncConnectionPool that
+is opened on the worker's event loop (FastAPI lifespan, or first use).
+
 > pip install psycopg[binary,pool]
 > python ./app/core/database.py
 """
-import atexit
+import asyncio
 import logging
-from contextlib import contextmanager
-from typing import Any
+import os
+import threading
+from contextlib import asynccontextmanager, contextmanager
 
 import psycopg
 from app.config.settings import settings
 from psycopg.rows import dict_row
-from psycopg_pool import ConnectionPool
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 
 logger = logging.getLogger(name="app")
 
-# _pool: ConnectionPool | None = None
-
-
-# def get_pool() -> ConnectionPool:
-#     global _pool
-#     if _pool is None:
-#         _pool = ConnectionPool(
-#             conninfo=settings.SQL_DATABASE_URL,
-#             min_size=5,
-#             max_size=20,
-#             timeout=20,
-#             max_idle=300,
-#             max_lifetime=3600,
-#             open=True,
-#         )
-#         logger.info("Postgres pool created: %s", _pool.get_stats())
-#     return _pool
-
-# def close_pool() -> None:
-#     """Close all connections in the pool gracefully."""
-#     global _pool
-#     if _pool:
-#         logger.info("Closing database connection pool...")
-#         _pool.close(timeout=5.0)
-
-# @atexit.register
-# def close_pool_exit():
-#     pool = get_pool()
-#     pool.close()
+CONNECTION_KWARGS = {
+    "autocommit": True,  # avoid idle-in-transaction
+    "row_factory": dict_row,
+    "connect_timeout": 10,
+}
+
+_pool: ConnectionPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+_async_pool: AsyncConnectionPool | None = None
+_async_pool_pid: int | None = None
+_async_pool_lock: asyncio.Lock | None = None
+
+# Pools inherited over fork: never closed or used in the child (that would
+# terminate the parent's sessions on the shared sockets), only kept referenced
+# so garbage collection doesn't do it either.
+_inherited_pools: list[ConnectionPool | AsyncConnectionPool] = []
+
+
+def _drop_inherited_pool() -> None:
+    global _pool, _pool_pid, _pool_lock, _async_pool, _async_pool_pid, _async_pool_lock
+    if _pool is not None:
+        _inherited_pools.append(_pool)
+    _pool = None
+    _pool_pid = None
+    _pool_lock = threading.Lock()
+
+    if _async_pool is not None:
+        _inherited_pools.append(_async_pool)
+    _async_pool = None
+    _async_pool_pid = None
+    _async_pool_lock = None
+
+
+os.register_at_fork(after_in_child=_drop_inherited_pool)
+
+
+def get_pool() -> ConnectionPool:
+    """Connection pool of the current process, opened on first use."""
+    global _pool, _pool_pid
+    if _pool is not None and _pool_pid == os.getpid():
+        return _pool
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPool(
+                conninfo=settings.SQL_DATABASE_URL,
+                kwargs=CONNECTION_KWARGS,
+                min_size=settings.DATABASE_POOL_MIN_SIZE,
+                max_size=settings.DATABASE_POOL_MAX_SIZE,
+                timeout=settings.DATABASE_POOL_TIMEOUT,
+                max_idle=300,
+                max_lifetime=3600,
+                check=ConnectionPool.check_connection,
+                name=f"app-{os.getpid()}",
+                open=True,
+            )
+            _pool_pid = os.getpid()
+            logger.info(f"Postgres pool opened in pid {_pool_pid}: {_pool.get_stats()}")
+    return _pool
+
+
+def close_pool() -> None:
+    """Close the current process's pool, if it opened one."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            logger.info(f"Closing Postgres pool in pid {_pool_pid}")
+            _pool.close(timeout=5.0)
+        _pool = None
+        _pool_pid = None
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """Async pool of the current process, opened on the running loop on first use."""
+    global _async_pool, _async_pool_pid, _async_pool_lock
+    if _async_pool is not None and _async_pool_pid == os.getpid():
+        return _async_pool
+
+    if _async_pool_lock is None:
+        _async_pool_lock = asyncio.Lock()
+
+    async with _async_pool_lock:
+        if _async_pool is None or _async_pool_pid != os.getpid():
+            pool = AsyncConnectionPool(
+                conninfo=settings.SQL_DATABASE_URL,
+                kwargs=CONNECTION_KWARGS,
+                min_size=settings.DATABASE_POOL_MIN_SIZE,
+                max_size=settings.DATABASE_POOL_MAX_SIZE,
+                timeout=settings.DATABASE_POOL_TIMEOUT,
+                max_idle=300,
+                max_lifetime=3600,
+                check=AsyncConnectionPool.check_connection,
+                name=f"app-async-{os.getpid()}",
+                open=False,
+            )
+            await pool.open()
+            _async_pool = pool
+            _async_pool_pid = os.getpid()
+            logger.info(f"Postgres async pool opened in pid {_async_pool_pid}: {pool.get_stats()}")
+    return _async_pool
+
+
+async def close_async_pool() -> None:
+    """Close the current process's async pool, if it opened one."""
+    global _async_pool, _async_pool_pid
+    if _async_pool is not None and _async_pool_pid == os.getpid():
+        logger.info(f"Closing Postgres async pool in pid {_async_pool_pid}")
+        await _async_pool.close(timeout=5.0)
+    _async_pool = None
+    _async_pool_pid = None
+
+
+def _stats(pool: ConnectionPool | AsyncConnectionPool | None, pid: int | None) -> dict:
+    if pool is None or pid != os.getpid():
+        return {"pid": os.getpid(), "open": False}
+
+    stats = pool.get_stats()
+    waited = stats.get("requests_queued", 0)
+    return {
+        "pid": pid,
+        "open": True,
+        "min_size": stats.get("pool_min"),
+        "max_size": stats.get("pool_max"),
+        "size": stats.get("pool_size", 0),
+        "idle": stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": stats.get("requests_num", 0),
+        "requests_queued": waited,
+        "requests_wait_ms": stats.get("requests_wait_ms", 0),
+        "avg_wait_ms": round(stats.get("requests_wait_ms", 0) / waited, 2) if waited else 0.0,
+        "requests_errors": stats.get("requests_errors", 0),
+        "connections_opened": stats.get("connections_num", 0),
+        "connections_errors": stats.get("connections_errors", 0),
+    }
+
+
+def pool_stats() -> dict:
+    """
+    Size, idle and wait figures of the current process's pool.
+    Request and connection counters are cumulative since the pool opened.
+    """
+    return _stats(_pool, _pool_pid)
+
+
+def async_pool_stats() -> dict:
+    """Same figures as pool_stats for the async pool."""
+    return _stats(_async_pool, _async_pool_pid)
 
 
 @contextmanager
-def get_cursor():
+def connect():
     """
-    Create a new DB connection per usage and close it safely.
+    Create a new DB connection and close it afterwards, without the pool.
+    For one-off scripts and the pool benchmark.
     """
-    conn = None
+    conn = psycopg.connect(settings.SQL_DATABASE_URL, **CONNECTION_KWARGS)
     try:
-        conn = psycopg.connect(
-            settings.SQL_DATABASE_URL,
-            autocommit=True,          # avoid idle-in-transaction
-            row_factory=dict_row,
-            connect_timeout=10,
-        )
+        yield conn
+    finally:
+        conn.close()
 
-        with conn.cursor() as cur:
-            yield cur
 
-    except Exception as e:
+@contextmanager
+def get_cursor():
+    """
+    Borrow a pooled connection for the block and return it afterwards.
+    """
+    try:
+        with get_pool().connection() as conn:
+            with conn.cursor() as cur:
+                yield cur
+
+    except Exception:
         logger.exception("Database error in get_cursor")
         raise
 
-    finally:
-        if conn is not None:
-            conn.close()
-
 
+@asynccontextmanager
+async def get_async_cursor():
+    """
+    Async counterpart of get_cursor for FastAPI handlers: waiting for a
+    connection or a query yields the event loop instead of blocking it.
+    """
+    try:
+        pool = await get_async_pool()
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                yield cur
 
+    except Exception:
+        logger.exception("Database error in get_async_cursor")
+        raise
 
 
 # --- Testing ---
 if __name__ == "__main__":
-
-    pass
+    with get_cursor() as cur:
+        cur.execute("SELECT 1 AS ok")
+        print(cur.fetchone())
+    print(pool_stats())
+    close_pool()
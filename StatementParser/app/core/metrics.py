@@ -0,0 +1,131 @@
+"""
+Prometheus metrics for the statement hot path.
+
+- track(stage): context manager timing a block into stage_seconds{stage};
+  set ``span.rows`` to also count rows (rate() gives rows/sec)
+- instrument(stage, rows=len): the same as a decorator, rows counted from
+  the return value
+- Celery task durations and states come from the signals in
+  app.core.celery_signal, cache hits from app.core.cache
+
+The API serves /metrics; workers start their own exporter on METRICS_PORT.
+With several processes (uvicorn --workers, prefork) set
+PROMETHEUS_MULTIPROC_DIR to an empty directory so every process writes
+there and the exporter sums them.
+
+> source .env
+> python app/core/metrics.py
+"""
+
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+# PDF stages run from milliseconds to minutes on 1000 page statements
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+STAGE_SECONDS = Histogram(
+    "statement_stage_seconds", "Time spent per processing stage", ["stage"], buckets=STAGE_BUCKETS
+)
+STAGE_ROWS = Counter("statement_stage_rows", "Rows handled per processing stage", ["stage"])
+RULES_EVALUATED = Counter("rule_engine_rules_evaluated", "Rule evaluations (rules x transactions)")
+CACHE_EVENTS = Counter("cache_events", "Two-tier cache lookups by outcome", ["event"])
+
+TASK_SECONDS = Histogram(
+    "celery_task_seconds", "Celery task run time", ["task", "state"], buckets=STAGE_BUCKETS
+)
+TASK_RETRIES = Counter("celery_task_retries", "Celery task retries", ["task"])
+
+
+class Span:
+    """Yielded by track; ``rows`` is added to stage_rows when the block exits."""
+
+    __slots__ = ("rows",)
+
+    def __init__(self, rows: int = 0):
+        self.rows = rows
+
+
+@contextmanager
+def track(stage: str, rows: int = 0):
+    span = Span(rows)
+    start = time.perf_counter()
+    try:
+        yield span
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+        if span.rows:
+            STAGE_ROWS.labels(stage).inc(span.rows)
+
+
+def instrument(stage: str, rows: Callable | None = None):
+    """Decorator form of track (sync or async); ``rows(result)`` gives the row count."""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with track(stage) as span:
+                    result = await func(*args, **kwargs)
+                    if rows:
+                        span.rows = rows(result)
+                    return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track(stage) as span:
+                result = func(*args, **kwargs)
+                if rows:
+                    span.rows = rows(result)
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def _registry() -> CollectorRegistry:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Exposition body and content type."""
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+
+def start_exporter(port: int) -> None:
+    """Serve /metrics for a worker from a background thread."""
+    start_http_server(port, registry=_registry())
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a dead process's live gauges in multiprocess mode."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
+
+
+if __name__ == "__main__":
+    with track("example", rows=10):
+        time.sleep(0.01)
+    print(render_metrics()[0].decode())
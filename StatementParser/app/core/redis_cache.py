@@ -5,7 +5,6 @@ Handles redis related operations
 > python ./app/core/redis_handler.py
 """
 
-import json
 import logging
 import threading
 from urllib.parse import urlparse, urlunparse
@@ -13,10 +12,34 @@ from urllib.parse import urlparse, urlunparse
 import redis
 
 from app.config.settings import settings
+from app.core.codecs import Serializer, serializer_for
 
 logger = logging.getLogger("app")
 
 
+SCAN_BATCH_SIZE = 500
+# What clear_all_cache removes unless told otherwise
+CACHE_PATTERN = "cache:*"
+
+
+def scan_delete(client: redis.Redis, pattern: str, batch_size: int = SCAN_BATCH_SIZE) -> int:
+    """
+    UNLINK every key matching ``pattern``, walking the keyspace with SCAN
+    (never KEYS/FLUSHDB) and sending one pipelined UNLINK per batch.
+    Returns the number of keys removed.
+    """
+    removed = 0
+    batch = []
+    for key in client.scan_iter(match=pattern, count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            removed += client.unlink(*batch)
+            batch = []
+    if batch:
+        removed += client.unlink(*batch)
+    return removed
+
+
 def _force_db(url: str, db: int) -> str:
     """Replace the path with /{db} while keeping scheme/host/port/user/pass/query."""
     p = urlparse(url)
@@ -64,9 +87,12 @@ class RedisCache(redis.Redis):
             base = redis.from_url(url, decode_responses=decode_responses)
             pool = base.connection_pool
             super().__init__(connection_pool=pool, decode_responses=decode_responses)
+            # Same server/db without decoding, for codec framed payloads
+            self.binary = redis.from_url(url, decode_responses=False)
         else:
             # fallback to kwargs such as host, port, password, db …
             super().__init__(decode_responses=decode_responses, **kwargs)
+            self.binary = redis.Redis(decode_responses=False, **kwargs)
 
         self._initialized = True
         logger.info(
@@ -75,18 +101,20 @@ class RedisCache(redis.Redis):
             self.connection_pool.connection_kwargs.get("db", 0),
         )
 
-    def set_cache(self, key, data, expiration_seconds=3600):
+    def set_cache(self, key, data, expiration_seconds=3600, serializer: Serializer | None = None):
         """
         Sets a key with a serialized value and an optional expiration time.
 
         Args:
             key (str): The cache key.
-            data: The Python object to store. It will be serialized to JSON.
+            data: The Python object to store. Encoded with the key namespace's
+                codec (app.core.codecs), so Decimal/date values round trip.
             expiration_seconds (int): The cache expiration time in seconds.
+            serializer: Overrides the namespace codec.
         """
         try:
-            serialized_data = json.dumps(data)
-            self.setex(key, expiration_seconds, serialized_data)
+            payload = (serializer or serializer_for(key)).encode(data)
+            self.binary.setex(key, expiration_seconds, payload)
             logger.debug(f"Cache set for key: {key}")
         except redis.RedisError as e:
             logger.error(f"Error setting cache for key '{key}': {e}")
@@ -95,15 +123,51 @@ class RedisCache(redis.Redis):
 
     # To prevent override from parent
     def get_kache(self, key: str):
-        """Get and JSON-deserialize if possible."""
-        val = self.get(key)
+        """Get and decode; plain strings that aren't JSON come back as is."""
+        return self._decode(key, self.binary.get(key))
+
+    def _decode(self, key: str, val: bytes | None):
         if val is None:
             return None
         try:
-            return json.loads(val.encode("utf-8"))
-        except json.JSONDecodeError as jde:
-            logger.error(f"Decode failed for key: {key} : {val}, error: {jde}")
-            return val
+            return Serializer.decode(val, key)
+        except (ValueError, UnicodeDecodeError) as err:
+            logger.error(f"Decode failed for key: {key}, error: {err}")
+            return val.decode("utf-8", errors="replace")
+
+    def get_many(self, keys: list[str]) -> dict:
+        """One MGET for all keys; keys that are missing are left out."""
+        if not keys:
+            return {}
+        values = self.binary.mget(keys)
+        return {key: self._decode(key, val) for key, val in zip(keys, values) if val is not None}
+
+    def set_many(self, mapping: dict, expiration_seconds=3600, serializer: Serializer | None = None) -> int:
+        """
+        Set every key in one pipelined round trip. Each key uses its
+        namespace's codec unless ``serializer`` is given. Returns keys written.
+        """
+        if not mapping:
+            return 0
+        try:
+            pipe = self.binary.pipeline(transaction=False)
+            for key, data in mapping.items():
+                pipe.set(key, (serializer or serializer_for(key)).encode(data), ex=expiration_seconds)
+            written = sum(1 for ok in pipe.execute() if ok)
+            logger.debug(f"Cache set for {written} keys")
+            return written
+        except redis.RedisError as e:
+            logger.error(f"Error setting cache for {len(mapping)} keys: {e}")
+            return 0
+
+    def delete_many(self, keys: list[str]) -> int:
+        return self.unlink(*keys) if keys else 0
+
+    def delete_pattern(self, pattern: str, batch_size: int = SCAN_BATCH_SIZE) -> int:
+        """Invalidate a namespace, e.g. ``cache:bank_account:42:*``, without blocking Redis."""
+        removed = scan_delete(self, pattern, batch_size)
+        logger.debug(f"Deleted {removed} keys matching {pattern}")
+        return removed
 
     def clear_cache(self, key: str):
         """
@@ -111,11 +175,15 @@ class RedisCache(redis.Redis):
         """
         self.delete(key)
 
-    def clear_all_cache(self):
+    def clear_all_cache(self, pattern: str = CACHE_PATTERN, *, outside_cache: bool = False):
         """
-        clear the cache from connected db-0
+        clear the cache keys of the connected db by SCAN + UNLINK, never FLUSHDB.
+        The db is shared with task progress, staged task payloads and upload
+        claims, so a pattern outside ``cache:`` needs outside_cache=True
         """
-        self.flushdb()
+        if not pattern.startswith("cache:") and not outside_cache:
+            raise ValueError(f"Pattern {pattern!r} is outside the cache namespace, pass outside_cache=True")
+        return self.delete_pattern(pattern)
 
     @classmethod
     def from_env(cls, *, force_db0: bool = True):
@@ -189,7 +257,7 @@ if __name__ == "__main__":
         else:
             print(f"Cache miss for user {user_id}. Key was cleared.")
 
-        # Example of clearing ALL cache (use with caution)
+        # Example of clearing the cache: namespace (use with caution)
         # cache.clear_all_cache()
 
     main()
@@ -0,0 +1,102 @@
+"""
+Per rule profiling counters, kept in one Redis hash per user.
+
+Filled from TransactionCategorizer(profile=True) runs (uploads and rule
+engine re-runs when RULE_PROFILING is on, or a rule engine call with
+``profile``), read by the rules UI to spot expensive rules that never match.
+
+Hash fields: ``{rule_id}:evaluations``, ``{rule_id}:matches``,
+``{rule_id}:us`` (cumulative microseconds) and ``{rule_id}:assigned:{field}``.
+
+> source .env
+> python app/core/rule_stats.py <user_id>
+"""
+
+import logging
+
+from app.core.redis_cache import redis_cache
+
+logger = logging.getLogger("app")
+
+RULE_STATS_TTL = 60 * 60 * 24 * 90
+
+
+def rule_stats_key(user_id: int) -> str:
+    return f"rule_stats:{user_id}"
+
+
+def record_rule_stats(user_id: int, stats: dict) -> None:
+    """
+    Add a categorizer's ``stats`` to the user's totals in one pipeline.
+    Best effort, like progress: failures are logged, never raised.
+    """
+    if not stats:
+        return
+
+    key = rule_stats_key(user_id)
+    try:
+        pipe = redis_cache.pipeline(transaction=False)
+        for rule_id, rule in stats.items():
+            pipe.hincrby(key, f"{rule_id}:evaluations", rule.evaluations)
+            pipe.hincrby(key, f"{rule_id}:matches", rule.matches)
+            pipe.hincrby(key, f"{rule_id}:us", round(rule.seconds * 1_000_000))
+            for field_name, count in rule.assigned.items():
+                pipe.hincrby(key, f"{rule_id}:assigned:{field_name}", count)
+        pipe.expire(key, RULE_STATS_TTL)
+        pipe.execute()
+    except Exception:
+        logger.warning(f"Rule stats update failed for user {user_id}", exc_info=True)
+
+
+def _summary(counters: dict) -> dict:
+    evaluations = counters.get("evaluations", 0)
+    matches = counters.get("matches", 0)
+    micros = counters.get("us", 0)
+    return {
+        "evaluations": evaluations,
+        "matches": matches,
+        "match_ratio": round(matches / evaluations, 4) if evaluations else None,
+        "total_ms": round(micros / 1000, 3),
+        "avg_us": round(micros / evaluations, 2) if evaluations else None,
+        "assigned": counters.get("assigned", {}),
+    }
+
+
+def get_rule_stats(user_id: int) -> dict[str, dict]:
+    """Summary per rule id (as str): counts, match ratio, time and assigned fields."""
+    raw = redis_cache.hgetall(rule_stats_key(user_id))
+
+    counters: dict[str, dict] = {}
+    for name, value in raw.items():
+        rule_id, _, metric = name.partition(":")
+        rule = counters.setdefault(rule_id, {})
+        if metric.startswith("assigned:"):
+            rule.setdefault("assigned", {})[metric.removeprefix("assigned:")] = int(value)
+        else:
+            rule[metric] = int(value)
+
+    return {rule_id: _summary(c) for rule_id, c in counters.items()}
+
+
+def reset_rule_stats(user_id: int, rule_id: int | None = None) -> None:
+    """Forget one rule's stats (its DSL changed) or all of the user's."""
+    key = rule_stats_key(user_id)
+    if rule_id is None:
+        redis_cache.delete(key)
+        return
+
+    prefix = f"{rule_id}:"
+    fields = [name for name in redis_cache.hkeys(key) if name.startswith(prefix)]
+    if fields:
+        redis_cache.hdel(key, *fields)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show rule profiling stats")
+    parser.add_argument("user_id", type=int)
+    args = parser.parse_args()
+
+    for rule_id, summary in sorted(get_rule_stats(args.user_id).items(), key=lambda i: -i[1]["total_ms"]):
+        print(rule_id, summary)
@@ -0,0 +1,95 @@
+"""
+Superset dashboard cache after an ingestion.
+
+Superset caches chart data by query, so nothing is dropped when new
+transactions land. Instead each ingestion bumps data version counters that
+Superset datasets mix into their cache key (``data_version`` in
+superset_config.py):
+
+- ss_data_version:{user_id}            every chart of the user
+- ss_data_version:{user_id}:{YYYY-MM}  charts filtered to that month
+
+Other users' and months' cached charts keep their keys. Then Superset's own
+``cache-warmup`` task is queued on the ``superset`` queue (same broker) for
+the dashboards tagged with SUPERSET_WARMUP_TAGS or ``ss_user_{user_id}``.
+
+> source .env
+> python app/core/superset_cache.py --user_id 1 --months 2025-01 2025-02
+"""
+
+import logging
+from functools import lru_cache
+
+import redis
+from app.config.settings import settings
+from celery import current_app
+
+logger = logging.getLogger("app")
+
+DATA_VERSION_PREFIX = "ss_data_version"
+WARMUP_TASK = "cache-warmup"
+WARMUP_STRATEGY = "dashboard_tags"
+
+
+def data_version_keys(user_id: int, months=()) -> list[str]:
+    return [f"{DATA_VERSION_PREFIX}:{user_id}"] + [f"{DATA_VERSION_PREFIX}:{user_id}:{m}" for m in months]
+
+
+def touched_months(transactions: list[dict]) -> list[str]:
+    """Distinct YYYY-MM of the transactions, ISO strings or dates alike."""
+    return sorted({str(t["transaction_date"])[:7] for t in transactions if t.get("transaction_date")})
+
+
+@lru_cache(maxsize=1)
+def _version_client() -> redis.Redis:
+    # Superset reads the counters, so they live where superset_config looks
+    return redis.Redis.from_url(settings.DATA_VERSION_REDIS_URL, decode_responses=True)
+
+
+def bump_data_version(user_id: int, months=()) -> list[int]:
+    """Increment the user and month counters in one round trip."""
+    pipe = _version_client().pipeline(transaction=False)
+    for key in data_version_keys(user_id, months):
+        pipe.incr(key)
+    return pipe.execute()
+
+
+def warmup_tags(user_id: int) -> list[str]:
+    tags = [t.strip() for t in settings.SUPERSET_WARMUP_TAGS.split(",") if t.strip()]
+    return [*tags, f"ss_user_{user_id}"]
+
+
+def schedule_dashboard_warmup(user_id: int, months=(), app=None) -> str | None:
+    """
+    Bump the data versions of ``user_id``/``months`` and queue Superset's
+    warm-up. Best effort: the ingestion already succeeded, failures are logged.
+    Returns the warm-up task id.
+    """
+    if not settings.SUPERSET_WARMUP_ENABLED:
+        return None
+
+    try:
+        bump_data_version(user_id, months)
+        result = (app or current_app).send_task(
+            WARMUP_TASK,
+            kwargs={"strategy_name": WARMUP_STRATEGY, "tags": warmup_tags(user_id)},
+            queue=settings.SUPERSET_WARMUP_QUEUE,
+        )
+        logger.info(f"Superset warm-up {result.id} queued for user {user_id} months {list(months)}")
+        return result.id
+    except Exception:
+        logger.warning(f"Superset warm-up failed for user {user_id}", exc_info=True)
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.core.celery_app import celery_app
+
+    parser = argparse.ArgumentParser(description="Invalidate and warm a user's Superset dashboards")
+    parser.add_argument("--user_id", type=int, required=True)
+    parser.add_argument("--months", nargs="*", default=[], help="YYYY-MM")
+    args = parser.parse_args()
+
+    print(schedule_dashboard_warmup(args.user_id, args.months, app=celery_app))
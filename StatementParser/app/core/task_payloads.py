@@ -0,0 +1,71 @@
+"""
+Large task inputs staged in Redis instead of the task message.
+
+Celery copies task args into the broker message and, with
+``result_extended``, into the stored task meta as well; a chord keeps its
+header results there too. Statement bytes and packed transactions are
+written here with a TTL and tasks only pass the key; the worker drops the
+key once it no longer needs the data, the TTL covers failed runs.
+
+> source .env
+> python app/core/task_payloads.py <key>
+"""
+
+import logging
+import uuid
+
+from app.core.codecs import DEFAULT_SERIALIZER, Serializer, register_namespace
+from app.core.redis_cache import redis_cache
+
+logger = logging.getLogger("app")
+
+KEY_PREFIX = "task_payload"
+# Long enough for a backed up queue and a few retries
+PAYLOAD_TTL = 60 * 60 * 6
+
+register_namespace(f"{KEY_PREFIX}:", DEFAULT_SERIALIZER)
+
+
+def stage_bytes(data: bytes, ttl: int = PAYLOAD_TTL) -> str:
+    """Store ``data`` under a new key and return the key."""
+    key = f"{KEY_PREFIX}:{uuid.uuid4().hex}"
+    redis_cache.binary.set(key, data, ex=ttl)
+    return key
+
+
+def load_bytes(key: str) -> bytes:
+    data = redis_cache.binary.get(key)
+    if data is None:
+        raise LookupError(f"Staged payload {key} expired or missing")
+    return data
+
+
+def stage_object(obj, ttl: int = PAYLOAD_TTL) -> str:
+    """stage_bytes of ``obj`` encoded with the namespace codec, Decimal and date kept."""
+    return stage_bytes(DEFAULT_SERIALIZER.encode(obj), ttl)
+
+
+def load_object(key: str):
+    return Serializer.decode(load_bytes(key), key)
+
+
+def drop_payloads(*keys: str) -> None:
+    """Best effort: a key left behind expires with its TTL."""
+    keys = [k for k in keys if k]
+    if not keys:
+        return
+    try:
+        redis_cache.binary.unlink(*keys)
+    except Exception:
+        logger.warning("Could not drop staged payloads %s", keys, exc_info=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show a staged task payload")
+    parser.add_argument("key")
+    args = parser.parse_args()
+
+    data = load_bytes(args.key)
+    print(f"{args.key}: {len(data)} bytes, ttl {redis_cache.ttl(args.key)}s")
@@ -0,0 +1,185 @@
+"""
+Profile selected Celery task runs (BaseTaskSignal.__call__).
+
+A run is profiled when its task name is listed, or at random for
+``sample_rate`` of runs. Output goes to TASK_PROFILE_DIR as
+``{task_name}.{task_id}.*``:
+
+- sample:   stack sampler thread (stdlib), ``.collapsed`` lines of
+            ``frame;frame;frame count``, ready for flamegraph.pl or speedscope
+- cprofile: ``.prof`` (pstats, snakeviz / flameprof) and a ``.txt`` summary
+
+Defaults come from settings; the ``task_profiling`` Redis hash overrides them
+on running workers (read at most every CONFIG_REFRESH_SECONDS), so profiling
+can be switched on in production without a redeploy:
+
+> source .env
+> python app/core/task_profiler.py --tasks app.tasks.bank_statement_upload.process_bank_pdf --mode sample
+> python app/core/task_profiler.py --sample_rate 0.02
+> python app/core/task_profiler.py --off
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.config.settings import settings
+from app.core.redis_cache import redis_cache
+
+logger = logging.getLogger("app")
+
+CONFIG_KEY = "task_profiling"
+CONFIG_REFRESH_SECONDS = 30
+MODES = ("sample", "cprofile")
+SAMPLE_INTERVAL = 0.005
+SUMMARY_LINES = 40
+
+# -inf: the first call loads, even on a host whose monotonic clock is < 30s
+_config = {"loaded_at": float("-inf")}
+_config_lock = threading.Lock()
+
+
+def _settings_config() -> dict:
+    return {
+        "tasks": settings.TASK_PROFILE_TASKS,
+        "sample_rate": settings.TASK_PROFILE_SAMPLE_RATE,
+        "mode": settings.TASK_PROFILE_MODE,
+    }
+
+
+def profiling_config() -> dict:
+    """Settings overlaid with the Redis hash, cached per process."""
+    now = time.monotonic()
+    if now - _config["loaded_at"] < CONFIG_REFRESH_SECONDS:
+        return _config
+
+    with _config_lock:
+        config = _settings_config()
+        try:
+            config.update(redis_cache.hgetall(CONFIG_KEY))
+        except Exception:
+            logger.warning("Task profiling config unavailable, using settings", exc_info=True)
+
+        _config.update(
+            tasks={t.strip() for t in (config["tasks"] or "").split(",") if t.strip()},
+            sample_rate=float(config["sample_rate"] or 0),
+            mode=config["mode"] if config["mode"] in MODES else MODES[0],
+            loaded_at=now,
+        )
+    return _config
+
+
+def profiling_mode(task_name: str) -> str | None:
+    """Mode to profile this run with, None to run it plain."""
+    config = profiling_config()
+    if task_name in config["tasks"] or (config["sample_rate"] and random.random() < config["sample_rate"]):
+        return config["mode"]
+    return None
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}:{code.co_qualname}"
+
+
+class StackSampler:
+    """Samples one thread's Python stack every ``interval`` seconds."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+def collapsed(stacks: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+@contextmanager
+def profile_task(task_name: str, task_id: str, mode: str, output_dir: Path | None = None):
+    """Profile the block and write ``{task_name}.{task_id}.*``, even when it raises."""
+    output_dir = Path(output_dir or settings.TASK_PROFILE_DIR)
+    base = output_dir / f"{task_name}.{task_id}"
+    start = time.perf_counter()
+
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one cProfile per process, a task on another
+            # pool thread may hold it: run this one unprofiled
+            logger.warning(f"Another profiler is active, {task_name} ({task_id}) runs unprofiled")
+            yield
+            return
+    else:
+        sampler = StackSampler(threading.get_ident()).start()
+
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            if mode == "cprofile":
+                profiler.disable()
+                profiler.dump_stats(f"{base}.prof")
+                summary = io.StringIO()
+                pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(SUMMARY_LINES)
+                Path(f"{base}.txt").write_text(summary.getvalue())
+                path = f"{base}.prof"
+            else:
+                path = f"{base}.collapsed"
+                Path(path).write_text(collapsed(sampler.stop()))
+            logger.info(f"Profiled {task_name} ({task_id}) in {elapsed:.2f}s -> {path}")
+        except Exception:
+            logger.warning(f"Could not write profile of {task_name} ({task_id})", exc_info=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Switch task profiling on running workers")
+    parser.add_argument("--tasks", help="Comma separated task names, always profiled")
+    parser.add_argument("--sample_rate", type=float, help="Fraction of other runs profiled, 0-1")
+    parser.add_argument("--mode", choices=MODES)
+    parser.add_argument("--off", action="store_true", help="Back to the settings defaults")
+    args = parser.parse_args()
+
+    if args.off:
+        redis_cache.delete(CONFIG_KEY)
+    else:
+        values = {"tasks": args.tasks, "sample_rate": args.sample_rate, "mode": args.mode}
+        values = {k: v for k, v in values.items() if v is not None}
+        if values:
+            redis_cache.hset(CONFIG_KEY, mapping=values)
+    print(redis_cache.hgetall(CONFIG_KEY) or _settings_config())
@@ -0,0 +1,71 @@
+"""
+Task progress shared between Celery workers and the API.
+
+Counters live in a Redis hash per task id, so chord subtasks of a fanned out
+statement can add to the same totals, and every update is published on a
+channel of the same name for the SSE endpoint.
+
+> source .env
+> python app/core/task_progress.py <task_id>
+"""
+
+import json
+import logging
+
+from app.core.redis_cache import redis_cache
+
+logger = logging.getLogger("app")
+
+PROGRESS_TTL = 60 * 60 * 24
+
+
+def progress_key(task_id: str) -> str:
+    """Hash key and pub/sub channel for a task."""
+    return f"task_progress:{task_id}"
+
+
+def _decode(snapshot: dict) -> dict:
+    return {k: int(v) if v.lstrip("-").isdigit() else v for k, v in snapshot.items()}
+
+
+def publish_progress(task_id: str, stage: str, increments: dict | None = None, **values) -> dict:
+    """
+    Set ``values``, add ``increments`` and publish the resulting snapshot.
+    Progress is best effort: Redis errors are logged and never fail the task.
+    """
+    if not task_id:
+        return {}
+
+    key = progress_key(task_id)
+    try:
+        pipe = redis_cache.pipeline()
+        pipe.hset(key, mapping={"stage": stage, **values})
+        for field, amount in (increments or {}).items():
+            pipe.hincrby(key, field, amount)
+        pipe.expire(key, PROGRESS_TTL)
+        pipe.hgetall(key)
+        snapshot = _decode(pipe.execute()[-1])
+
+        redis_cache.publish(key, json.dumps(snapshot))
+        return snapshot
+    except Exception:
+        logger.warning(f"Progress update failed for {task_id}", exc_info=True)
+        return {}
+
+
+def get_progress(task_id: str) -> dict:
+    try:
+        return _decode(redis_cache.hgetall(progress_key(task_id)))
+    except Exception:
+        logger.warning(f"Progress read failed for {task_id}", exc_info=True)
+        return {}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show task progress")
+    parser.add_argument("task_id")
+    args = parser.parse_args()
+
+    print(get_progress(args.task_id))
@@ -0,0 +1,62 @@
+"""
+Cross-batch dedupe of uploaded statements by content hash.
+
+The batch upload claims ``statement_upload:{to_email}:{sha256}`` with SET NX
+before queueing a file. The claim is released when the request fails before
+the file is queued, or when its task fails (``release_upload_claim`` is the
+errback), so only a statement that was processed is reported as a
+duplicate within UPLOAD_HASH_TTL.
+
+> source .env
+> python app/core/upload_claims.py --to_email user@example.com --sha256 <digest> --release
+"""
+
+import logging
+
+from app.core.redis_cache import redis_cache
+
+logger = logging.getLogger("app")
+
+UPLOAD_HASH_TTL = 60 * 60 * 24 * 30  # cross-batch dedupe window
+
+
+def upload_claim_key(to_email: str, digest: str) -> str:
+    return f"statement_upload:{to_email}:{digest}"
+
+
+def claim_upload(key: str) -> bool:
+    """
+    Claim the content hash, False if it was already claimed inside the
+    dedupe window. Redis errors never block an upload.
+    """
+    try:
+        return bool(redis_cache.set(key, 1, nx=True, ex=UPLOAD_HASH_TTL))
+    except Exception:
+        logger.warning("Upload dedupe unavailable, queueing anyway", exc_info=True)
+        return True
+
+
+def release_upload_claims(*keys: str) -> None:
+    """Best effort, a claim that cannot be released expires with its TTL."""
+    keys = [k for k in keys if k]
+    if not keys:
+        return
+    try:
+        redis_cache.delete(*keys)
+    except Exception:
+        logger.warning("Could not release upload claims %s", keys, exc_info=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or release an upload claim")
+    parser.add_argument("--to_email", required=True)
+    parser.add_argument("--sha256", required=True)
+    parser.add_argument("--release", action="store_true")
+    args = parser.parse_args()
+
+    key = upload_claim_key(args.to_email, args.sha256)
+    if args.release:
+        release_upload_claims(key)
+    print(key, "claimed" if redis_cache.exists(key) else "free")
@@ -1,2 +1,6 @@
 from .bank_account import get_or_create_bank_account
 from .transactions import bulk_insert_transactions
+from .partitions import ensure_transaction_partitions
+from .rollups import refresh_all_rollups, refresh_rollups
+from .rules import get_active_rules, invalidate_rules, rules_for_account, warm_rules
+from .user import get_active_user_id, get_active_user_ids, invalidate_user_cache, set_user_active
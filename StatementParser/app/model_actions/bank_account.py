@@ -1,10 +1,48 @@
 import logging
 from typing import Any
 
+from app.core.cache import cached
 from app.core.database import get_cursor
 
 logger = logging.getLogger("app")
 
+# One round trip for both cases. The no-op DO UPDATE makes RETURNING
+# give back the existing row on conflict; xmax = 0 only for a fresh insert.
+UPSERT_BANK_ACCOUNT_SQL = """
+    INSERT INTO ss_bank_accounts (user_id, number, ifsc_code, type)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT ON CONSTRAINT uq_bank_accounts_user_number
+    DO UPDATE SET number = EXCLUDED.number
+    RETURNING *, (xmax = 0) AS created
+"""
+
+# Account ids never change once created, so a cached row skips the upsert
+BANK_ACCOUNT_TTL = 60 * 60
+
+
+@cached(ttl=BANK_ACCOUNT_TTL, key="bank_account:{user_id}:{number}")
+def _upsert_bank_account(user_id: int, number: str, ifsc_code: str, account_type: str, cur=None) -> dict:
+    """A connection is only checked out on a cache miss."""
+
+    def _logic(cursor):
+        cursor.execute(
+            UPSERT_BANK_ACCOUNT_SQL,
+            (user_id, number, ifsc_code, account_type),
+            prepare=True,
+        )
+        row = dict(cursor.fetchone())
+
+        created = row.pop("created")
+        logger.debug("Bank account %s %s", number, "created" if created else "already exists")
+        return row
+
+    if cur:
+        return _logic(cur)
+    else:
+        with get_cursor() as new_cur:
+            return _logic(new_cur)
+
+
 def get_or_create_bank_account(
     user_id: int,
     number: str,
@@ -14,52 +52,14 @@ def get_or_create_bank_account(
 ) -> tuple[dict, bool]:
     """
     Get existing bank account or create new one.
-    Uses provided cursor or creates a temporary one.
+    Cached per (user_id, number); on a miss uses the provided cursor or a temporary one.
     Returns (account_dict, is_success)
     """
 
-    def _logic(cursor):
-        # 2. Try to get existing
-        cursor.execute(
-            "SELECT * FROM ss_bank_accounts WHERE number = %s",
-            (number,)
-        )
-        row = cursor.fetchone()
-
-        if row:
-            logger.debug(f"Bank account {number} already exists")
-            return dict(row), True
-
-        # 3.
-        try:
-            cursor.execute(
-                """
-                INSERT INTO ss_bank_accounts (user_id, number, ifsc_code, type)
-                VALUES (%s, %s, %s, %s)
-                RETURNING *
-                """,
-                (user_id, number, ifsc_code, account_type)
-            )
-            logger.debug(f"Bank account {number} created")
-            new_row = cursor.fetchone()
-            return dict(new_row), True
-        except Exception:
-            # Fallback: If insert fails (e.g. race condition), try fetching once more
-            cursor.execute("SELECT * FROM ss_bank_accounts WHERE number = %s", (number,))
-            row = cursor.fetchone()
-            if row:
-                return dict(row), True
-            raise
-
-    # 4. Use existing cursor or checkout a new one
     try:
-        if cur:
-            return _logic(cur)
-        else:
-            with get_cursor() as new_cur:
-                return _logic(new_cur)
+        return _upsert_bank_account(user_id, number, ifsc_code, account_type, cur=cur), True
 
     except Exception as ex:
-        logger.exception(f"Failed to get or create bank details for account {number}")
+        logger.exception("Failed to get or create bank details for account %s", number)
         # Return False for success status so the task knows it failed
         raise ex
@@ -0,0 +1,75 @@
+"""
+Monthly partitions of ss_transactions (SuperSetBoard/sql/7_partition_schema.sql).
+
+Rows of a month without a partition go to ss_transactions_default;
+ensure_transaction_partitions creates the coming months and moves such rows
+into their own partitions.
+
+Only queries with a transaction_date range are pruned to the months they
+read: run_rule_engine with from_date/to_date and the rollup refresh, which
+is called with each user's span. run_rule_engine without dates reads every
+partition.
+
+> source .env
+> python app/model_actions/partitions.py --months_ahead 3
+"""
+
+import logging
+
+from app.core.database import get_cursor
+
+logger = logging.getLogger("app")
+
+PARTITION_MONTHS_AHEAD = 3
+
+ENSURE_PARTITIONS_SQL = "SELECT ss_ensure_transaction_partitions(%s) AS created"
+
+LIST_PARTITIONS_SQL = """
+    SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bounds
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'ss_transactions'::regclass
+    ORDER BY c.relname
+"""
+
+
+def ensure_transaction_partitions(months_ahead: int = PARTITION_MONTHS_AHEAD, cur=None) -> int:
+    """Create missing monthly partitions. Returns partitions created."""
+
+    def _logic(cursor):
+        cursor.execute(ENSURE_PARTITIONS_SQL, (months_ahead,))
+        return cursor.fetchone()["created"]
+
+    if cur:
+        return _logic(cur)
+    else:
+        with get_cursor() as new_cur:
+            return _logic(new_cur)
+
+
+def list_transaction_partitions(cur=None) -> list[dict]:
+    """Partition name and bounds, oldest first (default partition last)."""
+
+    def _logic(cursor):
+        cursor.execute(LIST_PARTITIONS_SQL)
+        return cursor.fetchall()
+
+    if cur:
+        return _logic(cur)
+    else:
+        with get_cursor() as new_cur:
+            return _logic(new_cur)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Create monthly ss_transactions partitions")
+    parser.add_argument("--months_ahead", type=int, default=PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--list", action="store_true", help="Only list partitions")
+    args = parser.parse_args()
+
+    if not args.list:
+        print(f"Partitions created: {ensure_transaction_partitions(args.months_ahead)}")
+    for partition in list_transaction_partitions():
+        print(f"{partition['name']:<32} {partition['bounds']}")
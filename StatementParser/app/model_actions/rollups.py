@@ -0,0 +1,101 @@
+"""
+Monthly rollup behind the Superset summary views (ss_txn_monthly_rollup,
+SuperSetBoard/sql/6_rollup_schema.sql).
+
+bulk_insert_transactions refreshes the months it wrote; the refresh_rollups
+beat task rebuilds everything nightly to pick up edits made outside the app.
+
+> source .env
+> python app/model_actions/rollups.py --user_id 1 --from_date 2025-01-01 --to_date 2025-03-31
+"""
+
+import logging
+
+from app.core.database import get_cursor
+
+logger = logging.getLogger("app")
+
+REFRESH_ROLLUP_SQL = "SELECT ss_refresh_monthly_rollup(%s, %s::timestamptz, %s::timestamptz) AS rows"
+REFRESH_ALL_ROLLUPS_SQL = "SELECT ss_refresh_monthly_rollup_all() AS rows"
+
+
+def rollup_spans(transactions: list[dict]) -> dict[int, tuple]:
+    """(first, last) transaction_date per user, the months a write touched."""
+    dates: dict[int, list] = {}
+    for txn in transactions:
+        if txn.get("user_id") and txn.get("transaction_date"):
+            dates.setdefault(txn["user_id"], []).append(txn["transaction_date"])
+
+    # ISO strings from the parser, datetimes from the rule engine: both sort as str
+    return {user_id: (min(values, key=str), max(values, key=str)) for user_id, values in dates.items()}
+
+
+def refresh_rollups(transactions: list[dict], cur=None) -> int:
+    """
+    Rebuild the rollup months touched by ``transactions``. Best effort:
+    the rows are already written, a failure is logged and left to the
+    nightly refresh. Returns rollup rows written.
+    """
+    spans = rollup_spans(transactions)
+    if not spans:
+        return 0
+
+    def _logic(cursor):
+        written = 0
+        for user_id, (first, last) in spans.items():
+            cursor.execute(REFRESH_ROLLUP_SQL, (user_id, first, last), prepare=True)
+            written += cursor.fetchone()["rows"]
+        return written
+
+    try:
+        if cur:
+            return _logic(cur)
+        else:
+            with get_cursor() as new_cur:
+                return _logic(new_cur)
+    except Exception:
+        logger.warning(f"Rollup refresh failed for users {list(spans)}", exc_info=True)
+        return 0
+
+
+async def refresh_rollups_async(transactions: list[dict], cur) -> int:
+    """refresh_rollups on an async cursor."""
+    written = 0
+    try:
+        for user_id, (first, last) in rollup_spans(transactions).items():
+            await cur.execute(REFRESH_ROLLUP_SQL, (user_id, first, last), prepare=True)
+            written += (await cur.fetchone())["rows"]
+    except Exception:
+        logger.warning("Rollup refresh failed", exc_info=True)
+    return written
+
+
+def refresh_all_rollups(cur=None) -> int:
+    """Rebuild the whole rollup. Returns rollup rows written."""
+
+    def _logic(cursor):
+        cursor.execute(REFRESH_ALL_ROLLUPS_SQL)
+        return cursor.fetchone()["rows"]
+
+    if cur:
+        return _logic(cur)
+    else:
+        with get_cursor() as new_cur:
+            return _logic(new_cur)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Refresh the monthly transaction rollup")
+    parser.add_argument("--user_id", type=int, help="Only this user, all users when omitted")
+    parser.add_argument("--from_date", help="YYYY-MM-DD")
+    parser.add_argument("--to_date", help="YYYY-MM-DD")
+    args = parser.parse_args()
+
+    if args.user_id:
+        with get_cursor() as cursor:
+            cursor.execute(REFRESH_ROLLUP_SQL, (args.user_id, args.from_date, args.to_date))
+            print(f"Rollup rows written: {cursor.fetchone()['rows']}")
+    else:
+        print(f"Rollup rows written: {refresh_all_rollups()}")
@@ -0,0 +1,82 @@
+import logging
+
+from app.core.cache import cached, tiered_cache
+from app.core.database import get_cursor
+
+logger = logging.getLogger("app")
+
+RULES_TTL = 5 * 60
+
+
+@cached(ttl=RULES_TTL, key="rules:user:{user_id}")
+def get_active_rules(user_id: int, cur=None) -> list[dict]:
+    """
+    Every active categorization rule of the user (id, dsl_text, bank_account_id).
+    Cached per user; rule writes call invalidate_rules.
+    """
+
+    def _logic(cursor):
+        cursor.execute(
+            """
+            SELECT id, dsl_text, bank_account_id FROM ss_categorization_rules
+            WHERE user_id = %s AND is_active = true
+            ORDER BY id
+            """,
+            (user_id,),
+            prepare=True,
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    if cur:
+        return _logic(cur)
+    else:
+        with get_cursor() as new_cur:
+            return _logic(new_cur)
+
+
+def rules_for_account(rules: list[dict], bank_account_id: int | None) -> list[dict]:
+    """Rules that apply to the account: account specific ones plus the global ones."""
+    return [r for r in rules if r["bank_account_id"] is None or r["bank_account_id"] == bank_account_id]
+
+
+def invalidate_rules(user_id: int) -> None:
+    get_active_rules.invalidate(user_id)
+
+
+def warm_rules(user_ids: list[int], cur=None) -> int:
+    """
+    Load the rule sets of many users with one query and cache them with one
+    pipelined write. Users already cached are skipped. Returns users loaded.
+    """
+    keys = {get_active_rules.cache_key(user_id): user_id for user_id in user_ids}
+    missing = [user_id for key, user_id in keys.items() if key not in tiered_cache.get_many(list(keys))]
+    if not missing:
+        return 0
+
+    def _logic(cursor):
+        cursor.execute(
+            """
+            SELECT user_id, id, dsl_text, bank_account_id FROM ss_categorization_rules
+            WHERE user_id = ANY(%s) AND is_active = true
+            ORDER BY id
+            """,
+            (missing,),
+        )
+        return cursor.fetchall()
+
+    if cur:
+        rows = _logic(cur)
+    else:
+        with get_cursor() as new_cur:
+            rows = _logic(new_cur)
+
+    bundles = {user_id: [] for user_id in missing}
+    for row in rows:
+        row = dict(row)
+        bundles[row.pop("user_id")].append(row)
+
+    tiered_cache.set_many(
+        {get_active_rules.cache_key(user_id): rules for user_id, rules in bundles.items()},
+        ttl=RULES_TTL,
+    )
+    return len(missing)
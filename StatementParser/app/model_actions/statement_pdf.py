@@ -8,6 +8,24 @@ from app.core.database import get_cursor
 
 logger = logging.getLogger("app")
 
+UPSERT_STATEMENT_PDF_SQL = """
+    INSERT INTO ss_statement_pdfs (
+        user_id,
+        sender_email,
+        filename,
+        encrypted_password,
+        is_active
+    )
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (user_id, sender_email, filename)
+    DO UPDATE SET
+        encrypted_password = EXCLUDED.encrypted_password,
+        is_active = EXCLUDED.is_active,
+        updated_at = NOW()
+    RETURNING *
+"""
+
+
 def create_or_update_bank_pdf(
     user_id: int,
     sender_email: str,
@@ -26,22 +44,7 @@ def create_or_update_bank_pdf(
     try:
 
         cur.execute(
-            """
-            INSERT INTO ss_statement_pdfs (
-                user_id,
-                sender_email,
-                filename,
-                encrypted_password,
-                is_active
-            )
-            VALUES (%s, %s, %s, %s, %s)
-            ON CONFLICT (user_id, sender_email, filename)
-            DO UPDATE SET
-                encrypted_password = EXCLUDED.encrypted_password,
-                is_active = EXCLUDED.is_active,
-                updated_at = NOW()
-            RETURNING *
-            """,
+            UPSERT_STATEMENT_PDF_SQL,
             (
                 user_id,
                 sender_email,
@@ -59,6 +62,35 @@ def create_or_update_bank_pdf(
         logger.exception("Failed to create/update bank PDF rule")
         raise ex
 
+
+async def create_or_update_bank_pdf_async(
+    user_id: int,
+    sender_email: str,
+    filename: str,
+    pdf_password: str,
+    cur,
+    is_active: bool = True
+) -> dict:
+    """
+    create_or_update_bank_pdf on an async cursor (get_async_cursor).
+    """
+
+    encrypted_password = encrypt_password(pdf_password)
+
+    try:
+        await cur.execute(
+            UPSERT_STATEMENT_PDF_SQL,
+            (user_id, sender_email, filename, encrypted_password, is_active)
+        )
+
+        row = await cur.fetchone()
+        logger.debug("Bank PDF rule created/updated")
+        return dict(row)
+
+    except Exception as ex:
+        logger.exception("Failed to create/update bank PDF rule")
+        raise ex
+
 def get_statement_pdf_password(
     user_id: int,
     sender_email: str,
@@ -109,6 +141,51 @@ def get_statement_pdf_password(
         logger.exception(f"Error fetching password for {filename}")
         raise ex
 
+def get_statement_pdf_passwords(
+    user_id: int,
+    sender_email: str,
+    filename: str,
+    cur = None
+) -> list[str]:
+    """
+    Every active password stored for the sender, best guess first:
+    rules whose filename suffix matches, then the most recently updated.
+    """
+
+    def _logic(cursor):
+        suffix = filename[-8:] if filename else ""
+        file_pattern = rf"{re.escape(suffix)}$"
+
+        cursor.execute(
+            """
+            SELECT encrypted_password
+            FROM ss_statement_pdfs
+            WHERE user_id = %s
+              AND sender_email = %s
+              AND is_active = TRUE
+            ORDER BY (filename ~ %s) DESC, updated_at DESC
+            """,
+            (user_id, sender_email, file_pattern)
+        )
+
+        passwords = []
+        for row in cursor.fetchall():
+            try:
+                passwords.append(decrypt_password(row["encrypted_password"]))
+            except Exception as dec_err:
+                logger.error(f"Decryption failed: {dec_err}")
+        return passwords
+
+    try:
+        if cur:
+            return _logic(cur)
+        else:
+            with get_cursor() as new_cur:
+                return _logic(new_cur)
+    except Exception as ex:
+        logger.exception(f"Error fetching passwords for {filename}")
+        raise ex
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Test bank_pdfs DB helpers")
     parser.add_argument("--user-id", type=int, required=True)
@@ -1,25 +1,16 @@
 import logging
 from typing import Any
 
+import psycopg
 from app.core.database import get_cursor
+from app.core.metrics import instrument
+from app.model_actions.rollups import refresh_rollups, refresh_rollups_async
 
 logger = logging.getLogger(name="app")
 
 
-def bulk_insert_transactions(
-    transactions: list[dict],
-    chunk_size: int = 50,
-    cur=None,
-    update=False
-) -> dict[str, Any]:
-    """
-    Inserts transactions in bulk. If a bulk chunk fails,
-    it falls back to row-by-row insertion
-    """
-    if not transactions:
-        return {'inserted': 0, 'failed': 0, 'errors': []}
-
-    # 1. Prepare SQL Components
+def _upsert_statement(transactions: list[dict]) -> tuple[list[str], str]:
+    """Column order and INSERT ... ON CONFLICT statement for a batch."""
     column_names = list(transactions[0].keys())
 
     # DO NOT REMOVE:
@@ -41,48 +32,163 @@ def bulk_insert_transactions(
         ON CONFLICT ON CONSTRAINT uq_transaction_reference
         DO UPDATE SET {set_clause}, updated_at = CURRENT_TIMESTAMP
     """
+    return column_names, query
+
+
+def _batches(transactions: list[dict], column_names: list[str], chunk_size: int) -> list[tuple[int, list[tuple]]]:
+    """(start index, row values) per chunk."""
+    return [
+        (i, [tuple(t.get(col) for col in column_names) for t in transactions[i : i + chunk_size]])
+        for i in range(0, len(transactions), chunk_size)
+    ]
+
+
+def _new_result() -> dict[str, Any]:
+    return {'inserted': 0, 'failed': 0, 'errors': []}
+
+
+def _upsert_plan(transactions: list[dict], chunk_size: int) -> tuple[str, list[tuple[int, list[tuple]]]]:
+    """Upsert statement and (start index, row values) chunks for a batch."""
+    column_names, query = _upsert_statement(transactions)
+    return query, _batches(transactions, column_names, chunk_size)
+
+
+def _pipeline_failed(error: Exception) -> None:
+    logger.warning("Pipelined upsert failed. Error: %s. Retrying chunk-wise.", error)
+
+
+def _chunk_failed(start: int, chunk_size: int, error: Exception) -> None:
+    logger.warning("Bulk chunk %d failed. Error: %s. Falling back to row-wise.", start // chunk_size, error)
+
 
-    result = {'inserted': 0, 'failed': 0, 'errors': []}
+def _row_failed(result: dict[str, Any], transactions: list[dict], index: int, error: Exception) -> None:
+    result['failed'] += 1
+    result['errors'].append({
+        'index': index,
+        'reference_id': transactions[index].get('reference_id'),
+        'error': str(error)
+    })
+    logger.error("Failed to insert row %d: %s", index, error)
+
+
+@instrument("bulk_insert", rows=lambda result: result['inserted'])
+def bulk_insert_transactions(
+    transactions: list[dict],
+    chunk_size: int = 50,
+    cur=None,
+    rollup=True
+) -> dict[str, Any]:
+    """
+    Upserts transactions in bulk: rows already stored (uq_transaction_reference)
+    are updated in place. All chunks go out in one pipeline; if that
+    fails it retries chunk by chunk, and a failing chunk falls back to
+    row-by-row insertion. ``rollup`` then refreshes the monthly rollup for
+    the months written.
+
+    The ``update`` flag is gone: the statement always had an ON CONFLICT
+    DO UPDATE clause, so ``update=False`` upserted too. Callers passing it
+    must drop it.
+    """
+    result = _new_result()
+    if not transactions:
+        return result
+
+    query, batches = _upsert_plan(transactions, chunk_size)
+
+    def _pipelined(cursor) -> bool:
+        """All chunks in one pipeline, a single sync at the end. False if any failed."""
+        if not psycopg.Pipeline.is_supported():
+            return False
+        try:
+            with cursor.connection.pipeline():
+                for _, values in batches:
+                    cursor.executemany(query, values)
+        except psycopg.Error as pipe_ex:
+            _pipeline_failed(pipe_ex)
+            return False
+        result['inserted'] = len(transactions)
+        return True
 
     def _process(cursor):
-        for i in range(0, len(transactions), chunk_size):
-            chunk = transactions[i : i + chunk_size]
-            values = [tuple(t.get(col) for col in column_names) for t in chunk]
+        # The upsert is idempotent, so chunks that landed before a pipeline
+        # error are simply written again by the chunk-wise pass.
+        if _pipelined(cursor):
+            return
 
+        for i, values in batches:
             try:
-                # Try Bulk Insert
-
                 cursor.executemany(query, values)
-                result['inserted'] += len(chunk)
+                result['inserted'] += len(values)
             except Exception as bulk_ex:
-                logger.warning(f"Bulk chunk {i//chunk_size} failed. Error: {bulk_ex}. Falling back to row-wise.")
+                _chunk_failed(i, chunk_size, bulk_ex)
 
                 # Fallback: Row-by-row logic
-                for j, txn in enumerate(chunk):
-                    row_values = tuple(txn.get(col) for col in column_names)
+                for j, row_values in enumerate(values):
                     try:
-
                         cursor.execute(query, row_values)
                         result['inserted'] += 1
                     except Exception as row_error:
-                        result['failed'] += 1
-                        result['errors'].append({
-                            'index': i + j,
-                            'reference_id': txn.get('reference_id'),
-                            'error': str(row_error)
-                        })
-                        logger.error(f"Failed to insert row {i + j}: {row_error}")
+                        _row_failed(result, transactions, i + j, row_error)
+
+    def _write(cursor):
+        _process(cursor)
+        if rollup and result['inserted']:
+            refresh_rollups(transactions, cur=cursor)
 
     # 2. Execution logic
     try:
         if cur:
-            _process(cur)
+            _write(cur)
         else:
             with get_cursor() as new_cur:
-                _process(new_cur)
+                _write(new_cur)
     except Exception as ex:
         # This only triggers if the connection itself dies, not just a row failure
         logger.exception("Database connection failure during bulk insert")
         raise ex
 
     return result
+
+
+@instrument("bulk_insert", rows=lambda result: result['inserted'])
+async def bulk_insert_transactions_async(
+    transactions: list[dict],
+    cur,
+    chunk_size: int = 50,
+    rollup: bool = True,
+) -> dict[str, Any]:
+    """bulk_insert_transactions on an async cursor, same fallbacks."""
+    result = _new_result()
+    if not transactions:
+        return result
+
+    query, batches = _upsert_plan(transactions, chunk_size)
+
+    pipelined = False
+    if psycopg.Pipeline.is_supported():
+        try:
+            async with cur.connection.pipeline():
+                for _, values in batches:
+                    await cur.executemany(query, values)
+            result['inserted'] = len(transactions)
+            pipelined = True
+        except psycopg.Error as pipe_ex:
+            _pipeline_failed(pipe_ex)
+
+    for i, values in ([] if pipelined else batches):
+        try:
+            await cur.executemany(query, values)
+            result['inserted'] += len(values)
+        except Exception as bulk_ex:
+            _chunk_failed(i, chunk_size, bulk_ex)
+
+            for j, row_values in enumerate(values):
+                try:
+                    await cur.execute(query, row_values)
+                    result['inserted'] += 1
+                except Exception as row_error:
+                    _row_failed(result, transactions, i + j, row_error)
+
+    if rollup and result['inserted']:
+        await refresh_rollups_async(transactions, cur)
+    return result
@@ -0,0 +1,89 @@
+import logging
+
+from app.core.cache import cached, tiered_cache
+from app.core.database import get_cursor
+
+logger = logging.getLogger("app")
+
+USER_ID_SQL = "SELECT id FROM ss_users WHERE email = %s AND is_active=true"
+
+# Bounds how long a user deactivated outside set_user_active keeps resolving
+USER_TTL = 5 * 60
+# Unknown emails are remembered briefly so repeated bad uploads skip the DB
+USER_NEGATIVE_TTL = 60
+
+
+@cached(ttl=USER_TTL, key="user:email:{email}", negative_ttl=USER_NEGATIVE_TTL)
+def get_active_user_id(email: str, cur=None) -> int | None:
+    """
+    Id of the active user with this email, None if there is none.
+    """
+
+    def _logic(cursor):
+        cursor.execute(USER_ID_SQL, (email,), prepare=True)
+        row = cursor.fetchone()
+        return row["id"] if row else None
+
+    if cur:
+        return _logic(cur)
+    else:
+        with get_cursor() as new_cur:
+            return _logic(new_cur)
+
+
+def invalidate_user_cache(user_id: int, email: str | None = None) -> None:
+    """
+    Drop everything cached for a user: bank accounts (by SCAN), the rule set
+    and, when the email is known, the email lookup.
+    """
+    tiered_cache.delete_pattern(f"bank_account:{user_id}:*")
+
+    keys = [f"rules:user:{user_id}"]
+    if email:
+        keys.append(get_active_user_id.cache_key(email))
+    tiered_cache.delete(*keys)
+
+
+def set_user_active(email: str, is_active: bool, cur=None) -> int | None:
+    """
+    Activate or deactivate a user and drop their cached entries, so a
+    deactivated user stops resolving right away. Returns the user id, None if unknown.
+    """
+
+    def _logic(cursor):
+        cursor.execute("UPDATE ss_users SET is_active = %s WHERE email = %s RETURNING id", (is_active, email))
+        row = cursor.fetchone()
+        return row["id"] if row else None
+
+    if cur:
+        user_id = _logic(cur)
+    else:
+        with get_cursor() as new_cur:
+            user_id = _logic(new_cur)
+
+    if user_id is not None:
+        invalidate_user_cache(user_id, email)
+    return user_id
+
+
+def get_active_user_ids(cur=None) -> list[int]:
+    def _logic(cursor):
+        cursor.execute("SELECT id FROM ss_users WHERE is_active = true ORDER BY id")
+        return [row["id"] for row in cursor.fetchall()]
+
+    if cur:
+        return _logic(cur)
+    else:
+        with get_cursor() as new_cur:
+            return _logic(new_cur)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Activate or deactivate a user")
+    parser.add_argument("email")
+    parser.add_argument("--deactivate", action="store_true")
+    args = parser.parse_args()
+
+    print(set_user_active(args.email, is_active=not args.deactivate))
@@ -1,9 +1,9 @@
 import re
-import pdfplumber
 
 from app.common.enums import AccountType
 from app.pdf_normalizer.parsers.base_parser import BankStatementParser
 from app.pdf_normalizer.parsers.base_parsing_rules import DateAmountRule
+from app.pdf_normalizer.parsers.base_regexs import KOTAK_DATE_RE
 from app.pdf_normalizer.utils import account_details_dict, ss_transactions_template
 from app.pdf_normalizer.values_extract import (
     determine_transaction_type,
@@ -44,60 +44,54 @@ class KotakBankParser(BankStatementParser):
 
     
 
-    def parse_rows(self, rows):
-        import pdfplumber
-
-        txns = []
+    def table_rows(self, tables):
+        """Kotak rows are read as is, dates are '14 Dec 2025' and rows are not merged."""
+        rows = []
+        for data in tables:
+            if not data:
+                continue
 
-        with pdfplumber.open(self.pdf_path) as pdf:
-            for page in pdf.pages:
-                for table in page.find_tables():
-                    data = table.extract()
-                    if not data:
-                        continue
+            for row in data:
+                if not row or len(row) < 7:
+                    continue
+                rows.append([c.replace("\n", " ").strip() if c else "" for c in row])
+        return rows
 
-                    for row in data:
-                        if not row or len(row) < 7:
-                            continue
-
-                        row = [c.replace("\n", " ").strip() if c else "" for c in row]
+    def parse_rows(self, rows):
+        txns = []
 
-                        # Skip headers / opening balance
-                        if "OPENING BALANCE" in row[2].upper():
-                            continue
+        for row in rows:
+            # Skip headers / opening balance
+            if "OPENING BALANCE" in row[2].upper():
+                continue
 
-                        # Kotak date: 14 Dec 2025
-                        if not re.match(r"\d{1,2}\s+[A-Za-z]{3}\s+\d{4}", row[1]):
-                            continue
+            # Kotak date: 14 Dec 2025
+            if not KOTAK_DATE_RE.match(row[1]):
+                continue
 
-                        txn = ss_transactions_template()
+            txn = ss_transactions_template()
 
-                        txn["transaction_date"] = parse_date(row[1])
-                        txn["description"] = row[2]
+            txn["transaction_date"] = parse_date(row[1])
+            txn["description"] = row[2]
 
-                        if txn["description"].upper().startswith("INT.PD"):
-                            txn["payment_method"] = "INTEREST"
-                        else:
-                            txn["payment_method"] = extract_payment_method(txn["description"])
+            if txn["description"].upper().startswith("INT.PD"):
+                txn["payment_method"] = "INTEREST"
+            else:
+                txn["payment_method"] = extract_payment_method(txn["description"])
 
 
-                        txn["reference_id"] = row[3]
+            txn["reference_id"] = row[3]
 
-                        debit = row[4]
-                        credit = row[5]
+            debit = row[4]
+            credit = row[5]
 
-                        txn["amount"] = parse_amount(credit or debit)
-                        txn["type"] = "credit" if credit else "debit"
+            txn["amount"] = parse_amount(credit or debit)
+            txn["type"] = "credit" if credit else "debit"
 
 
-                        txn["entity_name"] = extract_entity_name(txn["description"])
-                        txn["payment_method"] = extract_payment_method(txn["description"])
+            txn["entity_name"] = extract_entity_name(txn["description"])
+            txn["payment_method"] = extract_payment_method(txn["description"])
 
-                        txns.append(txn)
+            txns.append(txn)
 
         return txns
-
-
-
-
-
@@ -3,6 +3,7 @@ import re
 
 from app.pdf_normalizer.parsers.base_parser import BankStatementParser
 from app.pdf_normalizer.parsers.base_parsing_rules import DateAmountRule
+from app.pdf_normalizer.parsers.base_regexs import SBI_UPI_REF_RE
 from app.pdf_normalizer.utils import account_details_dict, ss_transactions_template
 from app.pdf_normalizer.values_extract import (
     determine_transaction_type,
@@ -105,6 +106,14 @@ class SBIBankParser(BankStatementParser):
 
         return txn
 
+    def dedup_key(self, txn: dict) -> tuple:
+        return (
+            txn["transaction_date"],
+            txn["amount"],
+            txn["description"],
+            txn.get("reference_id"),
+        )
+
     # -------------------------------------------------
     # Transaction parsing
     # -------------------------------------------------
@@ -141,7 +150,7 @@ class SBIBankParser(BankStatementParser):
                 template["payment_method"] = extract_payment_method(description)
 
                 # Reference ID
-                ref_match = re.search(r"UPI/(CR|DR)/(\d+)", description)
+                ref_match = SBI_UPI_REF_RE.search(description)
                 template["reference_id"] = ref_match.group(2) if ref_match else None
 
                 # Amount & type
@@ -160,12 +169,7 @@ class SBIBankParser(BankStatementParser):
                 template = self._sbi_post_process(template)
 
                 # Dedup
-                key = (
-                    template["transaction_date"],
-                    template["amount"],
-                    template["description"],
-                    template.get("reference_id"),
-                )
+                key = self.dedup_key(template)
 
                 if key not in seen:
                     seen.add(key)
@@ -0,0 +1,117 @@
+"""
+Format-sniffing date parser shared by every bank parser.
+
+Tries the small set of formats banks actually print with precompiled regexes,
+memoizes the result per distinct string and only falls back to
+``dateutil.parser.parse`` when no known format matches.
+
+> python app/pdf_normalizer/date_parser.py "14 Dec 2025"
+"""
+
+from datetime import date
+from functools import lru_cache
+
+from app.pdf_normalizer.parsers.base_regexs import (
+    ISO_DATE_RE,
+    NUMERIC_DATE_RE,
+    TEXT_DATE_RE,
+)
+from dateutil import parser as dateutil_parser
+
+MONTHS = {
+    name: index
+    for index, names in enumerate(
+        [
+            ("jan", "january"),
+            ("feb", "february"),
+            ("mar", "march"),
+            ("apr", "april"),
+            ("may",),
+            ("jun", "june"),
+            ("jul", "july"),
+            ("aug", "august"),
+            ("sep", "sept", "september"),
+            ("oct", "october"),
+            ("nov", "november"),
+            ("dec", "december"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+
+_THIS_YEAR = date.today().year
+
+
+def _expand_year(year: str) -> int:
+    """Two digit years resolve like dateutil: within 50 years of today."""
+    value = int(year)
+    if len(year) > 2:
+        return value
+
+    value += _THIS_YEAR // 100 * 100
+    if value >= _THIS_YEAR + 50:
+        value -= 100
+    elif value < _THIS_YEAR - 50:
+        value += 100
+    return value
+
+
+def _build(year: int, month: int, day: int) -> date | None:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _sniff(text: str) -> date | None:
+    """Parse known bank formats, day first. None if nothing matched."""
+    match = NUMERIC_DATE_RE.match(text)
+    if match:
+        day, month, year = match.groups()
+        return _build(_expand_year(year), int(month), int(day))
+
+    match = TEXT_DATE_RE.match(text)
+    if match:
+        day, month_name, year = match.groups()
+        month = MONTHS.get(month_name.lower())
+        return _build(_expand_year(year), month, int(day)) if month else None
+
+    match = ISO_DATE_RE.match(text)
+    if match:
+        year, month, day = match.groups()
+        return _build(int(year), int(month), int(day))
+
+    return None
+
+
+@lru_cache(maxsize=8192)
+def parse_date_value(text: str) -> date | None:
+    """
+    Parse a statement date cell to a ``date``.
+
+    Returns None when neither a known format nor dateutil can parse it.
+    Results, including misses, are cached per distinct string.
+    """
+    text = text.strip()
+    if not text:
+        return None
+
+    value = _sniff(text)
+    if value is not None:
+        return value
+
+    try:
+        return dateutil_parser.parse(text, dayfirst=True).date()
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parse a statement date")
+    parser.add_argument("input", help="Date text")
+    args = parser.parse_args()
+
+    print(parse_date_value(args.input))
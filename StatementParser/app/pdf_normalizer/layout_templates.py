@@ -0,0 +1,253 @@
+"""
+Per-bank table layout templates.
+
+For a given bank the transaction table geometry is stable across statements,
+so the column x-boundaries are learned once from a table found by the generic
+``page.find_tables()`` and stored. Later pages of that bank reuse them through
+explicit ``table_settings`` on a horizontally cropped page, and fall back to the
+generic finder whenever the fast path fails validation.
+
+A template also records which column holds the dates and which hold amounts.
+A page whose rows break that (a statement in a new layout from the same bank)
+discards the template, and the generic finder learns the new one.
+"""
+
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from app.pdf_normalizer.parsers.base_regexs import AMOUNT_RE, DATE_CELL_RE
+
+logger = logging.getLogger("app")
+
+TEMPLATE_DIR = Path("./app/temp/layout_templates")
+
+# Minimum number of columns for a table to be considered a transaction table
+MIN_COLUMNS = 3
+
+# Boundaries closer than this (in PDF points) are treated as the same line
+SNAP_TOLERANCE = 1.0
+
+
+def is_date_cell(cell: str | None) -> bool:
+    """Check if a raw table cell holds a date value."""
+    if not cell:
+        return False
+    return bool(DATE_CELL_RE.match(cell.replace("\n", " ").strip()))
+
+
+def count_date_rows(rows: list[list[str | None]]) -> int:
+    """Count rows that carry a date in their first or second cell."""
+    return sum(1 for row in rows if row and any(is_date_cell(c) for c in row[:2]))
+
+
+def is_transaction_table(rows: list[list[str | None]]) -> bool:
+    """A table whose rows are mostly dated, i.e. worth learning a template from."""
+    if not rows or len(rows[0]) < MIN_COLUMNS:
+        return False
+    return count_date_rows(rows) >= max(1, len(rows) // 2)
+
+
+def has_amount(cell: str | None) -> bool:
+    return bool(cell) and AMOUNT_RE.search(cell) is not None
+
+
+def column_roles(rows: list[list[str | None]]) -> tuple[int, list[int]]:
+    """
+    Date column (most date cells) and amount columns (an amount in at least
+    half of the dated rows) of a transaction table.
+    """
+    width = len(rows[0])
+    date_column = max(range(width), key=lambda c: sum(1 for row in rows if is_date_cell(row[c])))
+    dated = [row for row in rows if is_date_cell(row[date_column])]
+    amount_columns = [
+        c for c in range(width)
+        if c != date_column and sum(1 for row in dated if has_amount(row[c])) * 2 >= len(dated)
+    ]
+    return date_column, amount_columns
+
+
+@dataclass
+class LayoutTemplate:
+    """
+    Column geometry of a bank's transaction table.
+
+    - columns: x-boundaries from left to right, len(columns) - 1 columns
+    - date_column / amount_columns: column roles, see ``column_roles``
+    - horizontal_strategy: pdfplumber strategy used for the rows
+    """
+
+    bank_name: str
+    columns: list[float]
+    date_column: int = 0
+    amount_columns: list[int] = field(default_factory=list)
+    horizontal_strategy: str = "lines"
+
+    @property
+    def num_columns(self) -> int:
+        return len(self.columns) - 1
+
+    @property
+    def x0(self) -> float:
+        return self.columns[0]
+
+    @property
+    def x1(self) -> float:
+        return self.columns[-1]
+
+    def table_settings(self) -> dict:
+        """pdfplumber settings that skip vertical edge detection."""
+        return {
+            "vertical_strategy": "explicit",
+            "explicit_vertical_lines": self.columns,
+            "horizontal_strategy": self.horizontal_strategy,
+        }
+
+    @classmethod
+    def from_table(cls, bank_name: str, table) -> "LayoutTemplate":
+        """Learn column boundaries and roles from a pdfplumber ``Table``."""
+        xs = sorted({round(x, 1) for cell in table.cells for x in (cell[0], cell[2])})
+
+        columns = []
+        for x in xs:
+            if not columns or x - columns[-1] > SNAP_TOLERANCE:
+                columns.append(x)
+
+        date_column, amount_columns = column_roles(table.extract())
+        return cls(bank_name=bank_name, columns=columns, date_column=date_column, amount_columns=amount_columns)
+
+    def is_continuation(self, row: list[str | None]) -> bool:
+        """Text only outside the date and amount columns: a wrapped description."""
+        filled = {i for i, cell in enumerate(row) if cell and cell.strip()}
+        return bool(filled) and not filled & {self.date_column, *self.amount_columns}
+
+    def extract(self, page) -> list[list[str | None]] | None:
+        """
+        Extract the table rows of a page using the stored geometry.
+
+        Returns None when the page has no dated rows in this geometry, so the
+        caller can fall back to ``page.find_tables()``.
+        """
+        x0 = max(self.x0, page.bbox[0])
+        x1 = min(self.x1, page.bbox[2])
+        if x1 <= x0:
+            return None
+
+        cropped = page.crop((x0, page.bbox[1], x1, page.bbox[3]))
+        rows = [row for table in cropped.extract_tables(self.table_settings()) for row in table]
+        rows = [row for row in rows if len(row) == self.num_columns]
+
+        # Explicit lines span the full page height, so header and footer boxes
+        # come through as rows too. Keep the dated block and the wrapped
+        # description of its last transaction, so date column detection and
+        # row merging see the same rows as the generic finder.
+        dated = [i for i, row in enumerate(rows) if is_date_cell(row[self.date_column])]
+        if not dated:
+            return None
+
+        end = dated[-1] + 1
+        while end < len(rows) and self.is_continuation(rows[end]):
+            end += 1
+        return rows[dated[0] : end]
+
+    def matches(self, rows: list[list[str | None]]) -> bool:
+        """Every dated row has an amount in one of the template's amount columns."""
+        if not self.amount_columns:
+            return False
+        dated = [row for row in rows if is_date_cell(row[self.date_column])]
+        return all(any(has_amount(row[c]) for c in self.amount_columns) for row in dated)
+
+
+class LayoutTemplateStore:
+    """
+    Learned templates, kept in memory and persisted as JSON per bank
+    so every worker process reuses them.
+    """
+
+    def __init__(self, directory: Path = TEMPLATE_DIR):
+        self.directory = Path(directory)
+        self._templates: dict[str, LayoutTemplate | None] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, bank_name: str) -> Path:
+        return self.directory / f"{bank_name.lower()}.json"
+
+    def get(self, bank_name: str) -> LayoutTemplate | None:
+        if bank_name in self._templates:
+            return self._templates[bank_name]
+
+        template = None
+        path = self._path(bank_name)
+        if path.exists():
+            try:
+                template = LayoutTemplate(**json.loads(path.read_text()))
+            except Exception:
+                logger.exception(f"Invalid layout template {path}, ignoring")
+
+        self._templates[bank_name] = template
+        return template
+
+    def save(self, template: LayoutTemplate) -> None:
+        with self._lock:
+            self._templates[template.bank_name] = template
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._path(template.bank_name).write_text(json.dumps(asdict(template)))
+            except OSError:
+                logger.exception(f"Failed to persist layout template for {template.bank_name}")
+
+        logger.info(
+            "Learned layout template for %s: %s columns",
+            template.bank_name,
+            template.num_columns,
+        )
+
+    def discard(self, bank_name: str) -> None:
+        with self._lock:
+            self._templates[bank_name] = None
+            self._path(bank_name).unlink(missing_ok=True)
+
+
+layout_store = LayoutTemplateStore()
+
+
+def extract_page_tables(
+    page, bank_name: str | None = None, store: LayoutTemplateStore = layout_store
+) -> list[list[list[str | None]]]:
+    """
+    Return the raw table data of a page.
+
+    Known layouts go through the bank's template; anything else goes through
+    the generic ``page.find_tables()``, which also (re)learns the template for
+    the bank. A template whose column roles do not match the page is
+    discarded first.
+    """
+    template = store.get(bank_name) if bank_name else None
+
+    if template:
+        rows = template.extract(page)
+        if rows is not None:
+            if template.matches(rows):
+                return [rows]
+            logger.warning(f"Layout template for {bank_name} does not match this statement, relearning")
+            store.discard(bank_name)
+            template = None
+
+    tables = []
+    learned = False
+
+    for table in page.find_tables():
+        data = table.extract()
+        tables.append(data)
+
+        if not bank_name or learned or not is_transaction_table(data):
+            continue
+
+        candidate = LayoutTemplate.from_table(bank_name, table)
+        if candidate.num_columns == len(data[0]) and candidate.amount_columns and candidate != template:
+            store.save(candidate)
+        learned = True
+
+    return tables
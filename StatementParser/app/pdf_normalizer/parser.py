@@ -8,14 +8,14 @@ Docstring :
 > python app/pdf_normalizer/parser.py files/hdfc.pdf
 """
 
+import pdfplumber
 from app.common.enums import BankName
+from app.core.metrics import track
 from app.pdf_normalizer.banks import HdfcBankParser, SBIBankParser, UnionBankParser, KotakBankParser
 from app.pdf_normalizer.layout_detector import BankDetector
-from app.pdf_normalizer.utils import (
-    debug_tables,
-    extract_table_rows,
-    get_bank_identifier,
-)
+from app.pdf_normalizer.parsers.base_parser import BankStatementParser
+from app.pdf_normalizer.pdf_source import PdfSource
+from app.pdf_normalizer.utils import debug_tables, get_bank_identifier
 
 BANK_PARSER_MAP = {
     BankName.UNION: UnionBankParser,
@@ -24,10 +24,22 @@ BANK_PARSER_MAP = {
 }
 
 
-def parse_statement(pdf_path: str, bank_name: BankName = None):
+def detect_parser(text: str, bank_name: BankName = None) -> BankStatementParser:
+    """Parser instance for the bank, detected from the statement text if not given."""
+    if not bank_name:
+        detector = BankDetector(list(BANK_PARSER_MAP.values()))
+        parser_cls = detector.detect(text)
+    else:
+        parser_cls = BANK_PARSER_MAP[bank_name]
+
+    return parser_cls()
+
+
+def parse_statement(pdf_path: PdfSource, bank_name: BankName = None):
     """
     Docstring for parse_statement
 
+    - pdf_path: file path, or an in-memory buffer / mmap of the statement
     - Returns:
         - {
             "account_details: {
@@ -40,24 +52,61 @@ def parse_statement(pdf_path: str, bank_name: BankName = None):
         }
     """
     text = get_bank_identifier(pdf_path)
+    parser = detect_parser(text, bank_name)
 
-    if not bank_name:
-        detector = BankDetector(list(BANK_PARSER_MAP.values()))
-        parser_cls = detector.detect(text)
-    else:
-        parser_cls = BANK_PARSER_MAP[bank_name]
-
-    parser = parser_cls()
-    parser.pdf_path = pdf_path
-    
     # rows = debug_tables(pdf_path)
-    rows = extract_table_rows(pdf_path)
+    rows = parser.extract_rows(pdf_path)
     account_details = parser.parse_account_details(text=text)
-    transactions = parser.parse_rows(rows)
+    with track("parse_rows", rows=len(rows)):
+        transactions = parser.parse_rows(rows)
     details = {"account_details": account_details, "transactions": transactions}
     return details
 
 
+def count_pages(pdf_path: PdfSource) -> int:
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def page_ranges(page_count: int, pages_per_chunk: int) -> list[range]:
+    """Split [0, page_count) into consecutive ranges of ``pages_per_chunk`` pages."""
+    return [
+        range(start, min(start + pages_per_chunk, page_count))
+        for start in range(0, page_count, pages_per_chunk)
+    ]
+
+
+def parse_page_range(pdf_path: PdfSource, bank_name: BankName, pages: range) -> list[dict]:
+    """Extract and normalize the transactions of one page range."""
+    parser = BANK_PARSER_MAP[bank_name]()
+    rows = parser.extract_rows(pdf_path, pages=pages)
+    with track("parse_rows", rows=len(rows)):
+        return parser.parse_rows(rows)
+
+
+def merge_page_ranges(bank_name: BankName, chunks: list[list[dict]]) -> list[dict]:
+    """
+    Stitch per range transactions back in page order.
+
+    Rows never straddle two ranges (they are merged per table and ranges split
+    on page boundaries), so only the parser's dedup has to run across chunks.
+    """
+    parser = BANK_PARSER_MAP[bank_name]()
+    seen = set()
+    transactions = []
+
+    for chunk in chunks:
+        for txn in chunk:
+            key = parser.dedup_key(txn)
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            transactions.append(txn)
+
+    return transactions
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -1,6 +1,12 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List
 
+import pdfplumber
+from app.core.metrics import instrument
+from app.pdf_normalizer.layout_templates import extract_page_tables
+from app.pdf_normalizer.pdf_source import PdfSource
+from app.pdf_normalizer.utils import find_date_column, merge_table_rows
+
 Transaction = Dict[str, str]
 
 
@@ -19,3 +25,38 @@ class BankStatementParser(ABC):
     @abstractmethod
     def parse_rows(self, rows: List[List[str]]) -> List[Transaction]:
         """Convert rows → normalized transactions"""
+
+    def table_rows(self, tables: List[List[List[str]]]) -> List[List[str]]:
+        """Rows from one page's tables: date column tables, continuation rows merged."""
+        rows = []
+        for data in tables:
+            if not data:
+                continue
+
+            # Find date column - skip table if none found
+            date_col = find_date_column(data)
+            if date_col is None:
+                continue
+
+            rows.extend(merge_table_rows(data, date_col))
+        return rows
+
+    @instrument("extract_rows", rows=len)
+    def extract_rows(self, pdf_path: PdfSource, pages: range | None = None) -> List[List[str]]:
+        """
+        Table rows for ``parse_rows``.
+
+        ``pages`` limits extraction to a page range (0 based, stop exclusive).
+        Rows are merged per table, so ranges split on page boundaries give
+        the same rows as one full pass.
+        """
+        rows = []
+        with pdfplumber.open(pdf_path) as pdf:
+            selected = pdf.pages if pages is None else pdf.pages[pages.start:pages.stop]
+            for page in selected:
+                rows.extend(self.table_rows(extract_page_tables(page, bank_name=self.bank_name)))
+        return rows
+
+    def dedup_key(self, txn: Transaction) -> tuple | None:
+        """Key for dropping repeated transactions, None keeps every row."""
+        return None
@@ -2,7 +2,7 @@ import re
 from abc import ABC, abstractmethod
 from typing import Dict, List
 
-from dateutil.parser import parse as parse_date
+from app.pdf_normalizer.date_parser import parse_date_value
 
 
 class ParsingRule(ABC):
@@ -14,7 +14,7 @@ class DateAmountRule(ParsingRule):
 
     @staticmethod
     def is_date(text: str) -> bool:
-        """Check if text is a valid date using dateutil."""
+        """Check if text is a valid date, known bank formats first then dateutil."""
         if not text or not text.strip():
             return False
 
@@ -40,11 +40,7 @@ class DateAmountRule(ParsingRule):
         ):
             return False
 
-        try:
-            parse_date(text)
-            return True
-        except (ValueError, TypeError):
-            return False
+        return parse_date_value(text) is not None
 
     def match(self, row: list[str]) -> tuple[bool, int | None]:
         """Check if row[0] or row[1] contains a date (min 6 chars)."""
@@ -1,5 +1,15 @@
+"""
+Compiled regex registry for pdf_normalizer.
+
+Every pattern used per row or per cell lives here, compiled once at import,
+so the row hot path never goes through ``re``'s pattern cache lookup.
+"""
+
 import re
 
+from app.common.constants import PAYMENT_METHODS
+from app.common.enums import BANK_EMAIL_PATTERNS
+
 ROW_RE = re.compile(
     r"""
     (?P<date>\d{2}/\d{2}/\d{2})\s+
@@ -16,3 +26,64 @@ ROW_RE = re.compile(
 DATE_RE = re.compile(r"^\d{2}-\d{2}-\d{4}")
 
 AMOUNT_RE = re.compile(r"-?[\d,]+\.\d{2}")
+
+# -------------------------------------------------
+# Dates
+# -------------------------------------------------
+# 01-11-25, 01/11/25, 01-11-2025, 16/05/2025
+DATE_LIKE_RE = re.compile(r"^\d{1,2}[-/]\d{1,2}[-/]\d{2,4}$")
+
+# 01-11-25, 16/05/2025, 14 Dec 2025, 20 Nov, 2025
+DATE_CELL_RE = re.compile(r"^\d{1,2}[-/ ](?:\d{1,2}|[A-Za-z]{3}),?[-/ ]\d{2,4}$")
+
+# Known bank formats for the fast date parser
+# 01/11/25, 01-11-2025, 01.11.2025
+NUMERIC_DATE_RE = re.compile(r"^(\d{1,2})[-/.](\d{1,2})[-/.](\d{4}|\d{2})$")
+# 14 Dec 2025, 14-Dec-25, 20 Nov, 2025, 5 September 2025
+TEXT_DATE_RE = re.compile(r"^(\d{1,2})[-\s]([A-Za-z]{3,9})\.?,?[-\s]\s*(\d{4}|\d{2})$")
+# 2025-12-14
+ISO_DATE_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+
+# Kotak: 14 Dec 2025
+KOTAK_DATE_RE = re.compile(r"\d{1,2}\s+[A-Za-z]{3}\s+\d{4}")
+
+# -------------------------------------------------
+# Amount / type
+# -------------------------------------------------
+NON_AMOUNT_CHARS_RE = re.compile(r"[^\d.]")
+
+CR_DR_RE = re.compile(r"\b(Cr|Dr)\b", re.IGNORECASE)
+
+# -------------------------------------------------
+# Entity name
+# -------------------------------------------------
+UPI_ENTITY_RE = re.compile(r"/(?:DR|CR)/([^/]+)/", re.IGNORECASE)
+NEFT_ENTITY_RE = re.compile(r"NEFT-[^-]+-([^-]+)", re.IGNORECASE)
+IMPS_ENTITY_RE = re.compile(r"IMPS-[^-]+-([^-]+)", re.IGNORECASE)
+RTGS_ENTITY_RE = re.compile(r"RTGS-[^-]+-([^-]+)", re.IGNORECASE)
+
+# SBI: UPI/DR/<ref>/<name>/...
+SBI_UPI_REF_RE = re.compile(r"UPI/(CR|DR)/(\d+)")
+
+
+# -------------------------------------------------
+# Payment method
+# -------------------------------------------------
+def _build_payment_method_re(methods: dict[str, str]) -> re.Pattern:
+    """
+    Combine PAYMENT_METHODS into one anchored alternation.
+
+    Alternatives are tried in dict order at position 0, anchored patterns
+    as-is and the rest behind a lazy ``.*?``, so ``lastgroup`` names the
+    same method the old per-pattern loop returned, in a single match call.
+    """
+    alternatives = []
+    for method, pattern in methods.items():
+        body = pattern[1:] if pattern.startswith("^") else f".*?(?:{pattern})"
+        alternatives.append(f"(?P<{method}>{body})")
+    return re.compile("|".join(alternatives))
+
+
+PAYMENT_METHOD_RE = _build_payment_method_re(PAYMENT_METHODS)
+
+BANK_EMAIL_RES = {bank: re.compile(pattern) for bank, pattern in BANK_EMAIL_PATTERNS.items()}
@@ -0,0 +1,48 @@
+"""
+In-memory statement sources.
+
+Uploads below ``INLINE_MAX_SIZE_MB`` are staged in Redis (app.core.task_payloads)
+and parsed from a ``BytesIO``; files on disk below ``MMAP_MAX_SIZE_MB`` are mmapped.
+pdfplumber opens the statement several times (bank detection, tables, Kotak
+rows), and all of those passes read the same buffer instead of the file.
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+from io import BytesIO
+from typing import BinaryIO, Iterator
+
+# Path on disk or an open binary buffer, anything pdfplumber.open accepts
+PdfSource = str | BinaryIO | mmap.mmap
+
+INLINE_MAX_SIZE_MB = 5
+MMAP_MAX_SIZE_MB = 50
+
+
+@contextmanager
+def open_statement(
+    file_path: str | None = None, content: bytes | None = None
+) -> Iterator[PdfSource]:
+    """
+    Yield the cheapest source for a statement.
+
+    - inline content -> BytesIO
+    - small file     -> read-only mmap of the file
+    - anything else  -> the path itself
+    """
+    if content is not None:
+        yield BytesIO(content)
+        return
+
+    if not file_path:
+        raise ValueError("Either file_path or content is required")
+
+    size = os.path.getsize(file_path)
+    if size == 0 or size > MMAP_MAX_SIZE_MB * 1024 * 1024:
+        yield file_path
+        return
+
+    with open(file_path, "rb") as fh:
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
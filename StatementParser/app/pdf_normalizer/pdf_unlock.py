@@ -11,34 +11,45 @@ Docstring for app.pdf_normalizer.pdf_unlock
 
 import argparse
 import logging
+import mmap
+import os
+import re
+from contextlib import contextmanager
 from datetime import datetime
 from io import BytesIO
+from typing import BinaryIO, Callable, Iterable, Iterator
 
 import pdfplumber
 import pikepdf
+from pdfminer.pdfdocument import PDFPasswordIncorrect
+from app.pdf_normalizer.pdf_source import PdfSource
 
 logger = logging.getLogger(name="app")
 
+# The last trailer (or xref stream dictionary) sits within this many bytes
+TRAILER_PROBE_BYTES = 4096
+STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
 
+def _is_password_error(error: Exception) -> bool:
+    # pdfplumber wraps pdfminer errors: PdfminerException(PDFPasswordIncorrect())
+    return isinstance(error, PDFPasswordIncorrect) or any(
+        isinstance(arg, PDFPasswordIncorrect) for arg in error.args
+    )
 
 def is_pdf_password_protected_bytes(pdf_bytes: bytes) -> bool:
-    try:
-        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-            _ = pdf.pages[0]
-        return False
-    except Exception as e:
-        return "password" in str(e).lower()
+    return is_pdf_password_protected(BytesIO(pdf_bytes))
 
-def is_pdf_password_protected(file_path: str) -> bool:
+def is_pdf_password_protected(file_path: PdfSource) -> bool:
     try:
         with pdfplumber.open(file_path) as pdf:
             _ = pdf.pages[0]  # try accessing first page
         return False
     except Exception as e:
-        # Typical error: "Password required or incorrect password"
-        print(e)
-
-    return True
+        if _is_password_error(e):
+            return True
+        # Broken or not a PDF: let parsing report it instead of asking for a password
+        logger.warning(f"Could not open PDF to check for a password: {e!r}")
+        return False
 
 def unlock_pdf(file_path: str, password: str):
 
@@ -59,6 +70,94 @@ def unlock_pdf(file_path: str, password: str):
     return output_path
 
 
+@contextmanager
+def _binary(source: PdfSource) -> Iterator[BinaryIO | mmap.mmap]:
+    """Seekable handle on the source, buffers are rewound afterwards."""
+    if isinstance(source, str):
+        with open(source, "rb") as fh:
+            yield fh
+        return
+
+    try:
+        yield source
+    finally:
+        source.seek(0)
+
+
+def is_pdf_encrypted(source: PdfSource) -> bool:
+    """
+    Check for an ``/Encrypt`` entry in the last trailer without parsing the PDF.
+
+    Reads the file tail (classic ``trailer`` dictionary) and, for PDF 1.5
+    cross-reference streams, the dictionary ``startxref`` points at. Falls
+    back to a full open when the tail is malformed.
+    """
+    with _binary(source) as fh:
+        fh.seek(0, os.SEEK_END)
+        size = fh.tell()
+        fh.seek(max(0, size - TRAILER_PROBE_BYTES))
+        tail = fh.read()
+
+        if b"/Encrypt" in tail:
+            return True
+
+        offsets = STARTXREF_RE.findall(tail)
+        if offsets and int(offsets[-1]) < size:
+            fh.seek(int(offsets[-1]))
+            head = fh.read(TRAILER_PROBE_BYTES)
+            # xref stream: dictionary comes before the binary stream data
+            end = head.find(b"stream")
+            return b"/Encrypt" in (head if end == -1 else head[:end])
+
+    logger.warning("No startxref in PDF tail, probing with a full open")
+    return is_pdf_password_protected(source)
+
+
+def _password_candidates(get_passwords: Callable[[], Iterable[str]]) -> Iterator[str]:
+    # Owner-only encryption opens with an empty user password
+    yield ""
+    seen = {""}
+    for password in get_passwords():
+        if password not in seen:
+            seen.add(password)
+            yield password
+
+
+def open_or_decrypt(
+    source: PdfSource, get_passwords: Callable[[], Iterable[str]]
+) -> PdfSource:
+    """
+    Return a source extraction can read as is.
+
+    - not encrypted / empty user password -> ``source`` unchanged
+    - otherwise tries each candidate from ``get_passwords`` (only called when
+      needed) against one pikepdf stream and returns the decrypted document
+      in memory, so no ``_unlocked_`` copy is left on disk
+    """
+    if not is_pdf_encrypted(source):
+        return source
+
+    stream = BytesIO(source) if isinstance(source, mmap.mmap) else source
+    for attempt, password in enumerate(_password_candidates(get_passwords)):
+        try:
+            pdf = pikepdf.open(stream, password=password)
+        except pikepdf.PasswordError:
+            continue
+
+        with pdf:
+            if not password:
+                if not isinstance(source, str):
+                    source.seek(0)
+                return source
+
+            logger.info(f"PDF decrypted with candidate #{attempt}")
+            buffer = BytesIO()
+            pdf.save(buffer)
+            buffer.seek(0)
+            return buffer
+
+    raise ValueError("Password not found")
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Unlock and extract text from password-protected PDFs")
@@ -1,13 +1,16 @@
-import re
 from datetime import datetime
 from decimal import Decimal
 from typing import Dict, List, Optional
 
 import pdfplumber
-from app.common.enums import BANK_EMAIL_PATTERNS, BankName
+from app.common.enums import BankName
+from app.core.metrics import instrument
+from app.pdf_normalizer.parsers.base_regexs import BANK_EMAIL_RES, DATE_LIKE_RE
+from app.pdf_normalizer.pdf_source import PdfSource
 
 
-def get_bank_identifier(pdf_path: str) -> str:
+@instrument("bank_identifier")
+def get_bank_identifier(pdf_path: PdfSource) -> str:
     """Read first two pages for bank detection and account details."""
     texts = []
 
@@ -25,7 +28,7 @@ def is_date_like(text: str) -> bool:
     if not text:
         return False
     # Matches formats like 01-11-25, 01/11/25, 01-11-2025, 16/05/2025
-    return bool(re.match(r"^\d{1,2}[-/]\d{1,2}[-/]\d{2,4}$", text.strip()))
+    return DATE_LIKE_RE.match(text.strip()) is not None
 
 
 def find_date_column(rows: list[list[str]]) -> int | None:
@@ -48,57 +51,43 @@ def find_date_column(rows: list[list[str]]) -> int | None:
     return None
 
 
-def extract_table_rows(pdf_path: str) -> list[list[str]]:
-    """Extract rows from tables that contain a date column."""
-    all_rows = []
-
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            for table in page.find_tables():
-                data = table.extract()
-                if not data:
-                    continue
+def merge_table_rows(data: list[list[str]], date_col: int) -> list[list[str]]:
+    """Clean table rows and merge continuation rows into the dated row above."""
+    rows = []
+    pending_row = []
 
-                # Find date column - skip table if none found
-                date_col = find_date_column(data)
-                if date_col is None:
-                    continue
+    for row in data:
+        if not row or not any(cell and cell.strip() for cell in row):
+            continue
 
-                expected_cols = len(data[0])
-                pending_row = []
+        cleaned = [
+            cell.strip().replace("\n", " ") if cell else "" for cell in row
+        ]
 
-                for row in data:
-                    if not row or not any(cell and cell.strip() for cell in row):
-                        continue
+        # Check if this is a complete row (has date)
+        has_date = (
+            is_date_like(cleaned[date_col])
+            if date_col < len(cleaned)
+            else False
+        )
 
-                    cleaned = [
-                        cell.strip().replace("\n", " ") if cell else "" for cell in row
-                    ]
-
-                    # Check if this is a complete row (has date)
-                    has_date = (
-                        is_date_like(cleaned[date_col])
-                        if date_col < len(cleaned)
-                        else False
-                    )
-
-                    if has_date:
-                        if pending_row:
-                            all_rows.append(pending_row)
-                        pending_row = cleaned
-                    elif pending_row:
-                        # Continuation row - merge
-                        for i, cell in enumerate(cleaned):
-                            if cell and i < len(pending_row):
-                                if pending_row[i]:
-                                    pending_row[i] += " " + cell
-                                else:
-                                    pending_row[i] = cell
+        if has_date:
+            if pending_row:
+                rows.append(pending_row)
+            pending_row = cleaned
+        elif pending_row:
+            # Continuation row - merge
+            for i, cell in enumerate(cleaned):
+                if cell and i < len(pending_row):
+                    if pending_row[i]:
+                        pending_row[i] += " " + cell
+                    else:
+                        pending_row[i] = cell
 
-                if pending_row:
-                    all_rows.append(pending_row)
+    if pending_row:
+        rows.append(pending_row)
 
-    return all_rows
+    return rows
 
 
 def has_date_header(row: list[str]) -> int | None:
@@ -113,16 +102,6 @@ def has_date_header(row: list[str]) -> int | None:
     return None
 
 
-def is_date_like(text: str) -> bool:
-    """Check if text looks like a date value."""
-    if not text:
-        return False
-    text = text.strip()
-    return bool(re.match(r"^\d{1,2}[-/]\d{1,2}[-/]\d{2,4}$", text))
-
-
-
-
 def extract_table_rows_v2(pdf_path: str) -> list[list[str]]:
     """Extract rows from tables that have a 'Date' column header."""
     all_rows = []
@@ -276,15 +255,40 @@ def ss_transactions_template(**kawrgs):
     }
 
 
+def pack_transactions(transactions: list[dict]) -> dict:
+    """
+    Column-oriented form for task payloads.
+
+    Only keys that differ from ``ss_transactions_template`` somewhere are kept,
+    rows become plain lists: {"fields": [...], "rows": [[...], ...]}
+    """
+    defaults = ss_transactions_template()
+    fields = []
+    for txn in transactions:
+        for key, value in txn.items():
+            if key not in fields and value != defaults.get(key):
+                fields.append(key)
+
+    return {
+        "fields": fields,
+        "rows": [[txn.get(key) for key in fields] for txn in transactions],
+    }
+
+
+def unpack_transactions(packed: dict) -> list[dict]:
+    """Inverse of ``pack_transactions``, template defaults filled back in."""
+    fields = packed["fields"]
+    return [
+        {**ss_transactions_template(), **dict(zip(fields, row))}
+        for row in packed["rows"]
+    ]
+
+
 def get_bank_from_email(email: str) -> BankName | None:
     """Determine bank from email address."""
     email = email.lower()
     return next(
-        (
-            bank
-            for bank, pattern in BANK_EMAIL_PATTERNS.items()
-            if re.search(pattern, email)
-        ),
+        (bank for bank, pattern in BANK_EMAIL_RES.items() if pattern.search(email)),
         None,
     )
 
@@ -1,29 +1,38 @@
-import re
 from decimal import Decimal
 
-from app.common.constants import PAYMENT_METHODS
 from app.common.enums import TrascationType
-from dateutil import parser
+from app.pdf_normalizer.date_parser import parse_date_value
+from app.pdf_normalizer.parsers.base_regexs import (
+    CR_DR_RE,
+    IMPS_ENTITY_RE,
+    NEFT_ENTITY_RE,
+    NON_AMOUNT_CHARS_RE,
+    PAYMENT_METHOD_RE,
+    RTGS_ENTITY_RE,
+    UPI_ENTITY_RE,
+)
 
 
 def parse_amount(value: str) -> Decimal | None:
     """Parse amount string like '+20,000.00' or '-500.00' to Decimal"""
     if not value:
         return None
-    cleaned = re.sub(r"[^\d.]", "", value)
+    cleaned = NON_AMOUNT_CHARS_RE.sub("", value)
     return cleaned if cleaned else None
 
 
 def parse_date(date_str: str) -> str:
     """Parse various date formats to 'YYYY-MM-DD'"""
-    dt = parser.parse(date_str.strip(), dayfirst=True)
-    return dt.strftime("%Y-%m-%d")
+    dt = parse_date_value(date_str)
+    if dt is None:
+        raise ValueError(f"Unknown date format: {date_str}")
+    return dt.isoformat()
 
 
 def determine_transaction_type(row: dict) -> str:
     """Return 'credit' or 'debit' based on which field has value"""
     tx_type = ""
-    match = re.search(r"\b(Cr|Dr)\b", row, re.IGNORECASE)
+    match = CR_DR_RE.search(row)
     if match:
         tx_type = (
             TrascationType.CREDIT.value
@@ -40,23 +49,18 @@ def determine_transaction_type(row: dict) -> str:
 def extract_payment_method(details: str) -> str | None:
     """Extract payment method from transaction details."""
     details = details.replace("\n", " ").strip().upper()
-    return next(
-        (
-            method
-            for method, pattern in PAYMENT_METHODS.items()
-            if re.search(pattern, details)
-        ),
-        None,
-    )
+    match = PAYMENT_METHOD_RE.match(details)
+    return match.lastgroup if match else None
 
 
 def extract_entity_name(details: str) -> str | None:
     """Extract entity/person name from transaction details."""
     details = details.replace("\n", " ").strip()
+    prefix = details[:6].upper()
 
     # UPI variants (UPI, UPIAR, UPIAB, etc.)
-    if details.upper().startswith("UPI"):
-        match = re.search(r"/(?:DR|CR)/([^/]+)/", details, re.IGNORECASE)
+    if prefix.startswith("UPI"):
+        match = UPI_ENTITY_RE.search(details)
         if match:
             return match.group(1).strip()
         parts = details.split("/")
@@ -68,37 +72,37 @@ def extract_entity_name(details: str) -> str | None:
             return name
 
     # NEFT format
-    if details.upper().startswith("NEFT"):
-        match = re.search(r"NEFT-[^-]+-([^-]+)", details, re.IGNORECASE)
+    if prefix.startswith("NEFT"):
+        match = NEFT_ENTITY_RE.search(details)
         if match:
             return match.group(1).strip()
 
     # IMPS format
-    if details.upper().startswith("IMPS"):
-        match = re.search(r"IMPS-[^-]+-([^-]+)", details, re.IGNORECASE)
+    if prefix.startswith("IMPS"):
+        match = IMPS_ENTITY_RE.search(details)
         if match:
             return match.group(1).strip()
 
     # RTGS format
-    if details.upper().startswith("RTGS"):
-        match = re.search(r"RTGS-[^-]+-([^-]+)", details, re.IGNORECASE)
+    if prefix.startswith("RTGS"):
+        match = RTGS_ENTITY_RE.search(details)
         if match:
             return match.group(1).strip()
 
     # NACH format (last value)
-    if details.upper().startswith("NACH"):
+    if prefix.startswith("NACH"):
         parts = details.split("/")
         if len(parts) >= 2:
             return parts[-1].strip()
 
     # RTNCHG format (second last value)
-    if details.upper().startswith("RTNCHG"):
+    if prefix.startswith("RTNCHG"):
         parts = details.split("/")
         if len(parts) >= 4:
             return parts[-2].strip()
 
     # ACH format
-    if details.upper().startswith("ACH"):
+    if prefix.startswith("ACH"):
         parts = details.split("/")
         if len(parts) >= 2:
             return parts[-1].strip()
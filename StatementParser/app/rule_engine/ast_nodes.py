@@ -15,7 +15,7 @@ Example DSL:
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 # =============================================================================
 # FILTER OPERATORS
@@ -257,6 +257,7 @@ class CategorizationRule:
     assignment: Assignment
     priority: int = 100  # Lower = higher priority
     is_active: bool = True
+    rule_id: Optional[int] = None  # ss_categorization_rules.id, set by callers that load from DB
 
     def __post_init__(self):
         if not self.conditions.blocks:
@@ -6,8 +6,11 @@ Now supports dynamic field assignment - any field can be assigned by rules.
 """
 
 import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Set, Union
 
 from .ast_nodes import (AndBlock, BetweenOperator, CategorizationRule,
                         ContainsOperator, EndsWithOperator, EqualOperator,
@@ -162,13 +165,26 @@ class RuleEvaluator:
             return 0
 
 
+@dataclass
+class RuleStats:
+    """Profile of one rule over the transactions it was evaluated against."""
+    evaluations: int = 0
+    matches: int = 0
+    seconds: float = 0.0
+    # Fields this rule actually set (a higher priority rule may have set them first)
+    assigned: Counter = field(default_factory=Counter)
+
+
 class TransactionCategorizer:
     """Applies multiple rules to categorize transactions with dynamic field assignment."""
 
-    def __init__(self, rules: List[CategorizationRule]):
+    def __init__(self, rules: List[CategorizationRule], profile: bool = False):
         # Sort by priority (lower = higher priority)
         self.rules = sorted(rules, key=lambda r: r.priority)
         self.evaluator = RuleEvaluator()
+        # Opt-in: per rule stats keyed by rule_id (rule name when not loaded from DB)
+        self.profile = profile
+        self.stats: Dict[Union[int, str], RuleStats] = {}
 
     def categorize(self, transaction: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -176,6 +192,9 @@ class TransactionCategorizer:
         First matching rule for each field wins.
         Now supports any dynamic field from rule assignments.
         """
+        if self.profile:
+            return self._categorize_profiled(transaction)
+
         result = transaction.copy()
 
         # Track which fields have been set
@@ -198,6 +217,33 @@ class TransactionCategorizer:
 
         return result
 
+    def _categorize_profiled(self, transaction: Dict[str, Any]) -> Dict[str, Any]:
+        """categorize, timing every rule evaluation into self.stats."""
+        result = transaction.copy()
+        fields_set: Set[str] = {key for key, value in result.items() if value is not None}
+
+        for rule in self.rules:
+            key = rule.rule_id if rule.rule_id is not None else rule.name
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = RuleStats()
+
+            start = time.perf_counter()
+            matched = self.evaluator.evaluate_rule(rule, transaction)
+            stats.seconds += time.perf_counter() - start
+            stats.evaluations += 1
+            if not matched:
+                continue
+
+            stats.matches += 1
+            for field_name, value in rule.assignment.items():
+                if value is not None and field_name not in fields_set:
+                    result[field_name] = value
+                    fields_set.add(field_name)
+                    stats.assigned[field_name] += 1
+
+        return result
+
     def categorize_batch(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Categorize multiple transactions."""
         return [self.categorize(t) for t in transactions]
@@ -1,2 +1,10 @@
-from .bank_statement_upload import process_bank_pdf
+from .bank_statement_upload import (
+    merge_statement_pages,
+    parse_statement_pages,
+    process_bank_pdf,
+    store_bank_transactions,
+)
 from .cleanup import cleanup_resources
+from .partitions import ensure_partitions_task
+from .rollups import refresh_rollups_task
+from .rule_engine_task import run_rule_engine_task
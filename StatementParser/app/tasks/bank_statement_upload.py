@@ -13,79 +13,344 @@ Docstring for app.tasks.bank_statment_upload
 """
 
 import logging
+import mmap
+from pathlib import Path
 
+from app.common.enums import BankName
+from app.config.settings import settings
+from app.core.celery_signal import BaseTaskSignal
 from app.core.database import get_cursor
+from app.core.metrics import RULES_EVALUATED, track
+from app.core.rule_stats import record_rule_stats
+from app.core.superset_cache import schedule_dashboard_warmup, touched_months
+from app.core.task_payloads import drop_payloads, load_bytes, load_object, stage_object
+from app.core.task_progress import publish_progress
+from app.core.upload_claims import release_upload_claims
 from app.model_actions.bank_account import get_or_create_bank_account
-from app.model_actions.statement_pdf import get_statement_pdf_password
+from app.model_actions.rules import get_active_rules, rules_for_account
+from app.model_actions.statement_pdf import get_statement_pdf_passwords
 from app.model_actions.transactions import bulk_insert_transactions
-from app.pdf_normalizer.parser import parse_statement
-from app.pdf_normalizer.pdf_unlock import is_pdf_password_protected, unlock_pdf
-from app.pdf_normalizer.utils import get_bank_from_email
+from app.model_actions.user import get_active_user_id
+from app.pdf_normalizer.parser import (
+    count_pages,
+    detect_parser,
+    merge_page_ranges,
+    page_ranges,
+    parse_page_range,
+    parse_statement,
+)
+from app.pdf_normalizer.pdf_source import PdfSource, open_statement
+from app.pdf_normalizer.pdf_unlock import open_or_decrypt
+from app.pdf_normalizer.utils import (
+    get_bank_from_email,
+    get_bank_identifier,
+    pack_transactions,
+    unpack_transactions,
+)
 from app.rule_engine.evaluator import TransactionCategorizer
 from app.rule_engine.parser import parse
-from celery import shared_task
+from celery import chord, shared_task
 
 logger = logging.getLogger("app")
 
+# Statements with at least this many pages are split across workers
+FANOUT_MIN_PAGES = 50
+PAGES_PER_CHUNK = 25
+FANOUT_TEMP_DIR = Path("./app/temp/statements")
 
-@shared_task(bind=True, name="app.tasks.bank_statement_upload.process_bank_pdf", queue="statement_parser")
-def process_bank_pdf(self, filename: str, file_path: str, from_email: str, to_email: str):
+# Insert errors kept in a compact task result
+RESULT_ERROR_SAMPLES = 5
 
-    # OPEN ONE CONNECTION FOR THE ENTIRE TASK
-    result = {}
 
-    with get_cursor() as cur:
+@shared_task(
+    bind=True, base=BaseTaskSignal, name="app.tasks.bank_statement_upload.process_bank_pdf", queue="statement_parser"
+)
+def process_bank_pdf(
+    self,
+    filename: str,
+    file_path: str = None,
+    from_email: str = None,
+    to_email: str = None,
+    content_key: str = None,
+    full_result: bool = False,
+):
+    """
+    CPU stage, runs on the prefork ``statement_parser`` queue.
 
-        # 1. Fetch User
-        cur.execute("SELECT id FROM ss_users WHERE email = %s AND is_active=true", (to_email,))
-        user_dict = cur.fetchone()
-        if not user_dict:
-            raise Exception(f"User {to_email} not found")
-
-        # 2. Handle Password
-        if is_pdf_password_protected(file_path=file_path):
-            # Ensure get_statement_pdf_password is updated to accept 'cur'
-            password_dict = get_statement_pdf_password(
-                user_id=user_dict['id'], sender_email=from_email, filename=filename, cur=cur
-            )
-            if not password_dict:
-                raise Exception("Password not found")
-            file_path = unlock_pdf(file_path=file_path, password=password_dict['password'])
+    - file_path: statement saved by the upload API
+    - content_key: small upload staged in Redis (app.core.task_payloads), parsed fully in memory
+    - full_result: return every transaction instead of the compact summary
+
+    Unlocks and parses without holding a DB connection, then replaces itself
+    with ``store_bank_transactions`` on the ``statement_io`` queue. The task id
+    stays the same, so callers still get the final result from it. The rows
+    are staged in Redis (app.core.task_payloads): the replaced task's args
+    land in the extended result, so they only carry the key.
+
+    Statements of ``FANOUT_MIN_PAGES`` or more are replaced by a chord of
+    ``parse_statement_pages`` over ``PAGES_PER_CHUNK`` page ranges instead,
+    merged by ``merge_statement_pages`` before the same store step.
+    """
+
+    progress_id = self.request.id
+
+    # 1. Fetch User (cached, short lived connection on a miss)
+    user_id = get_active_user_id(to_email)
+    if not user_id:
+        raise Exception(f"User {to_email} not found")
+
+    content_bytes = load_bytes(content_key) if content_key else None
 
-        # 3. Parse (CPU Bound)
+    with open_statement(file_path=file_path, content=content_bytes) as source:
+
+        # 2. Handle Password: trailer probe, stored passwords only fetched if encrypted
+        source = open_or_decrypt(
+            source,
+            get_passwords=lambda: get_statement_pdf_passwords(
+                user_id=user_id, sender_email=from_email, filename=filename
+            ),
+        )
+
+        # 3. Parse (CPU Bound), large statements fan out over page ranges
         bank_name = get_bank_from_email(email=from_email)
-        result = parse_statement(pdf_path=file_path, bank_name=bank_name)
-
-        # 4. Get/Create Account (Pass cur)
-        account_details, is_success = get_or_create_bank_account(
-            user_id=user_dict["id"],
-            number=result["account_details"].get("number"),
-            ifsc_code=result["account_details"].get("ifsc_code"),
-            cur=cur
+        page_count = count_pages(source)
+        _report_progress(
+            self, progress_id, "parsing", pages_total=page_count, pages_parsed=0, rows_extracted=0
         )
 
-        # 5. Fetch Rules (ANY syntax for safety)
-        cur.execute("""
-            SELECT id, dsl_text FROM ss_categorization_rules
-            WHERE user_id = %s AND is_active = true
-            AND (bank_account_id IS NULL OR bank_account_id = %s)
-        """, (user_dict["id"], account_details["id"]))
-        dsl_rules = cur.fetchall()
+        if page_count >= FANOUT_MIN_PAGES and not self.request.called_directly:
+            shared_path, is_copy = _shared_statement_path(source, file_path, self.request.id)
+            text = get_bank_identifier(source)
+            parser = detect_parser(text, bank_name)
+            parser_bank = BankName(parser.bank_name.lower())
+
+            meta = {
+                "user_id": user_id,
+                "filename": filename,
+                "account_details": parser.parse_account_details(text=text),
+                "bank_name": parser_bank,
+                "cleanup_path": shared_path if is_copy else None,
+                "progress_id": progress_id,
+                "full_result": full_result,
+            }
+            header = [
+                parse_statement_pages.s(shared_path, parser_bank, pages.start, pages.stop, progress_id)
+                for pages in page_ranges(page_count, PAGES_PER_CHUNK)
+            ]
+            logger.info(f"Fanning out {filename}: {page_count} pages in {len(header)} chunks")
+            drop_payloads(content_key)
+            return self.replace(
+                chord(header, merge_statement_pages.s(meta) | store_bank_transactions.s())
+            )
+
+        result = parse_statement(pdf_path=source, bank_name=bank_name)
+
+    drop_payloads(content_key)
 
-        # 6. Categorize (In-memory)
-        categorizer = TransactionCategorizer([parse(r["dsl_text"]) for r in dsl_rules])
-        applied_rule_tx = categorizer.categorize_batch(result["transactions"])
+    _report_progress(
+        self, progress_id, "parsed", pages_parsed=page_count, rows_extracted=len(result["transactions"])
+    )
+
+    payload = _store_payload(
+        user_id, filename, result["account_details"], result["transactions"], progress_id, full_result
+    )
+
+    if self.request.called_directly:
+        return store_bank_transactions(payload)
+
+    return self.replace(store_bank_transactions.s(payload))
+
+
+def _store_payload(
+    user_id: int,
+    filename: str,
+    account_details: dict,
+    transactions: list[dict],
+    progress_id: str | None,
+    full_result: bool,
+) -> dict:
+    """Args of store_bank_transactions, the packed rows staged behind ``transactions_key``."""
+    return {
+        "user_id": user_id,
+        "filename": filename,
+        "account_details": account_details,
+        "transactions_key": stage_object(pack_transactions(transactions)),
+        "progress_id": progress_id,
+        "full_result": full_result,
+    }
 
-        for tx in applied_rule_tx:
-            tx.update({"user_id": user_dict["id"], "bank_account_id": account_details["id"]})
 
-        # 7. Bulk Insert (Using the same open cursor)
+def _report_progress(task, progress_id: str | None, stage: str, increments: dict | None = None, **values):
+    """Publish progress, mirrored into the Celery state when ``task`` runs under the tracked id."""
+    snapshot = publish_progress(progress_id, stage, increments, **values)
+    if snapshot and task.request.id == progress_id:
+        task.update_state(state="PROGRESS", meta=snapshot)
+
+
+def _shared_statement_path(source: PdfSource, file_path: str | None, task_id: str) -> tuple[str, bool]:
+    """
+    Path every worker can open: the upload itself, or a copy of in-memory
+    (inline or decrypted) bytes in the shared temp dir. Returns (path, is_copy).
+    """
+    if isinstance(source, str):
+        return source, False
+    if isinstance(source, mmap.mmap):
+        return file_path, False
+
+    FANOUT_TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    path = FANOUT_TEMP_DIR / f"{task_id}.pdf"
+    path.write_bytes(source.getvalue())
+    return str(path), True
+
+
+@shared_task(
+    bind=True, base=BaseTaskSignal, name="app.tasks.bank_statement_upload.parse_statement_pages", queue="statement_parser"
+)
+def parse_statement_pages(
+    self, file_path: str, bank_name: str, start: int, stop: int, progress_id: str = None
+):
+    """
+    Chord header: extract and normalize pages [start, stop) of a large statement.
+    Returns the key of the staged rows, chord results are kept in the result backend.
+    """
+    with open_statement(file_path=file_path) as source:
+        transactions = parse_page_range(source, BankName(bank_name), range(start, stop))
+
+    _report_progress(
+        self, progress_id, "parsing",
+        increments={"pages_parsed": stop - start, "rows_extracted": len(transactions)},
+    )
+
+    logger.debug("Pages %d-%d of %s: %d transactions", start, stop, file_path, len(transactions))
+    return stage_object(pack_transactions(transactions))
+
+
+@shared_task(bind=True, name="app.tasks.bank_statement_upload.merge_statement_pages", queue="statement_parser")
+def merge_statement_pages(self, chunk_keys: list[str], meta: dict):
+    """
+    Chord body: stitch the page range results in order and dedup across them.
+    Returns the same payload as process_bank_pdf hands to store_bank_transactions.
+    """
+    transactions = merge_page_ranges(
+        BankName(meta["bank_name"]), [unpack_transactions(load_object(key)) for key in chunk_keys]
+    )
+
+    if meta.get("cleanup_path"):
+        Path(meta["cleanup_path"]).unlink(missing_ok=True)
+
+    _report_progress(self, meta.get("progress_id"), "parsed", rows_extracted=len(transactions))
+
+    payload = _store_payload(
+        meta["user_id"],
+        meta["filename"],
+        meta["account_details"],
+        transactions,
+        meta.get("progress_id"),
+        meta.get("full_result", False),
+    )
+    drop_payloads(*chunk_keys)
+    return payload
+
+
+@shared_task(
+    bind=True, base=BaseTaskSignal, name="app.tasks.bank_statement_upload.store_bank_transactions", queue="statement_io"
+)
+def store_bank_transactions(self, payload: dict):
+    """
+    I/O stage, runs on the ``statement_io`` queue.
+
+    payload: output of _store_payload, rows packed by pack_transactions and
+    staged under ``transactions_key``, which is dropped once they are stored.
+    A connection is only checked out around the DB calls, not while categorizing.
+    """
+    user_id = payload["user_id"]
+    account = payload["account_details"]
+    progress_id = payload.get("progress_id")
+    transactions = unpack_transactions(load_object(payload["transactions_key"]))
+
+    # 4. Get/Create Account + Fetch Rules (both cached, a connection only on a miss)
+    account_details, is_success = get_or_create_bank_account(
+        user_id=user_id,
+        number=account.get("number"),
+        ifsc_code=account.get("ifsc_code"),
+    )
+    dsl_rules = rules_for_account(get_active_rules(user_id), account_details["id"])
+
+    # 5. Categorize (In-memory)
+    with track("rule_parse", rows=len(dsl_rules)):
+        rules = [parse(r["dsl_text"]) for r in dsl_rules]
+        for rule, row in zip(rules, dsl_rules):
+            rule.rule_id = row["id"]
+    categorizer = TransactionCategorizer(rules, profile=settings.RULE_PROFILING)
+    with track("categorize", rows=len(transactions)):
+        applied_rule_tx = categorizer.categorize_batch(transactions)
+    RULES_EVALUATED.inc(len(dsl_rules) * len(transactions))
+    if categorizer.profile:
+        record_rule_stats(user_id, categorizer.stats)
+    _report_progress(
+        self, progress_id, "categorized",
+        rules_loaded=len(dsl_rules),
+        rules_applied=sum(1 for before, after in zip(transactions, applied_rule_tx) if before != after),
+    )
+
+    for tx in applied_rule_tx:
+        tx.update({"user_id": user_id, "bank_account_id": account_details["id"]})
+
+    # 6. Bulk Insert
+    with get_cursor() as cur:
         stats = bulk_insert_transactions(transactions=applied_rule_tx, cur=cur)
+    drop_payloads(payload["transactions_key"])
+
+    logger.info(f"Task completed for {payload.get('filename')}. Stats: {stats}")
+
+    # 7. Superset: new cache keys for this user's months, then warm the dashboards
+    if stats["inserted"]:
+        schedule_dashboard_warmup(user_id, touched_months(applied_rule_tx), app=self.app)
+
+    _report_progress(
+        self, progress_id, "completed", rows_inserted=stats["inserted"], rows_failed=stats["failed"]
+    )
+
+    return _task_result(payload, account_details, applied_rule_tx, stats)
+
+
+@shared_task(name="app.tasks.bank_statement_upload.release_upload_claim", queue="statement_io")
+def release_upload_claim(claim_key: str):
+    """Errback of batch uploads: a statement whose processing failed can be uploaded again."""
+    release_upload_claims(claim_key)
+    logger.info(f"Released upload claim {claim_key}")
+
+
+def _task_result(payload: dict, account_details: dict, transactions: list[dict], stats: dict) -> dict:
+    """
+    Compact result kept in the result backend: counts, account, a capped
+    errors summary and the filter that finds the persisted rows.
+    ``full_result`` in the payload adds the parsed account details and every transaction.
+    """
+    dates = [t["transaction_date"] for t in transactions if t.get("transaction_date")]
+    result = {
+        "filename": payload.get("filename"),
+        "count": len(transactions),
+        "inserted": stats["inserted"],
+        "failed": stats["failed"],
+        "bank_account_id": account_details["id"],
+        "errors": {
+            "count": len(stats["errors"]),
+            "samples": stats["errors"][:RESULT_ERROR_SAMPLES],
+        },
+        "rows": {
+            "table": "ss_transactions",
+            "user_id": payload["user_id"],
+            "bank_account_id": account_details["id"],
+            "date_from": min(dates, default=None),
+            "date_to": max(dates, default=None),
+        },
+    }
 
-        logger.info(f"Task completed. Stats: {stats}")
+    if payload.get("full_result"):
+        result["account_details"] = payload["account_details"]
+        result["transactions"] = transactions
 
-    result['count'] = len(applied_rule_tx)
-    result["transactions"] = applied_rule_tx
     return result
 
 
@@ -97,6 +362,7 @@ if __name__ == "__main__":
     parser.add_argument("--file_path", required=True, help="Input PDF file path")
     parser.add_argument("--from_email", required=True, help="email sender")
     parser.add_argument("--to_email", required=True, help="email reciever")
+    parser.add_argument("--full", action="store_true", help="Return every transaction")
     args = parser.parse_args()
 
     result = process_bank_pdf(
@@ -104,4 +370,6 @@ if __name__ == "__main__":
         file_path=args.file_path,
         from_email=args.from_email,
         to_email=args.to_email,
+        full_result=args.full,
     )
+    print(result)
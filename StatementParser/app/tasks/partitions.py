@@ -0,0 +1,28 @@
+"""
+Keeps ss_transactions partitioned ahead of time.
+
+Runs daily so next month's partition exists well before the first
+statement of that month, and rows parked in the default partition (old
+statements, far future dates) get their own partition.
+
+> source .env
+> celery -A app.core.celery_app call app.tasks.partitions.ensure_partitions_task
+"""
+
+import logging
+
+from app.model_actions.partitions import PARTITION_MONTHS_AHEAD, ensure_transaction_partitions
+from celery import shared_task
+
+logger = logging.getLogger("app")
+
+
+@shared_task(
+    bind=True,
+    name="app.tasks.partitions.ensure_partitions_task",
+    queue="statement_io",
+)
+def ensure_partitions_task(self, months_ahead: int = PARTITION_MONTHS_AHEAD):
+    created = ensure_transaction_partitions(months_ahead)
+    logger.info(f"ss_transactions partitions created: {created}")
+    return {"created": created}
@@ -0,0 +1,28 @@
+"""
+Nightly rebuild of the monthly transaction rollup.
+
+Uploads and rule engine runs refresh the months they write; this catches
+edits made directly in Postgres or Superset and rows whose date moved to
+another month.
+
+> source .env
+> celery -A app.core.celery_app call app.tasks.rollups.refresh_rollups_task
+"""
+
+import logging
+
+from app.model_actions.rollups import refresh_all_rollups
+from celery import shared_task
+
+logger = logging.getLogger("app")
+
+
+@shared_task(
+    bind=True,
+    name="app.tasks.rollups.refresh_rollups_task",
+    queue="statement_io",
+)
+def refresh_rollups_task(self):
+    rows = refresh_all_rollups()
+    logger.info(f"Monthly rollup rebuilt: {rows} rows")
+    return {"rows": rows}
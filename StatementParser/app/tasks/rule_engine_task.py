@@ -1,13 +1,25 @@
 """
-Docstring for app.tasks.bank_statment_upload
+Rule engine re-run over stored transactions.
 
+The API enqueues run_rule_engine_task on the ``rule_engine`` queue; small
+date ranges can still run inline through run_rule_engine_async.
 
+> source .env
+> celery -A app.core.celery_app worker -Q rule_engine --pool prefork --concurrency 2
+> python app/tasks/rule_engine_task.py --user_email a@b.com --from_date 2025-01-01
 """
 
+import asyncio
 import logging
 from datetime import date
 
-from app.model_actions.transactions import bulk_insert_transactions
+from app.config.settings import settings
+from app.core.celery_signal import BaseTaskSignal
+from app.core.metrics import RULES_EVALUATED, track
+from app.core.rule_stats import record_rule_stats
+from app.core.task_progress import publish_progress
+from app.model_actions.transactions import bulk_insert_transactions, bulk_insert_transactions_async
+from app.model_actions.user import USER_ID_SQL, get_active_user_id
 from app.rule_engine.evaluator import TransactionCategorizer
 from app.rule_engine.parser import parse
 from celery import shared_task
@@ -15,94 +27,118 @@ from celery import shared_task
 logger = logging.getLogger("app")
 
 
-# @shared_task(
-#     bind=True,
-#     name="app.tasks.bank_statement_upload.process_bank_pdf",
-#     queue="statement_parser",
-# )
+def _transactions_query(user_id: int, bank_account_id, from_date, to_date) -> tuple[str, tuple]:
+    query_base = "SELECT * FROM ss_transactions WHERE user_id = %s"
+    query_params = [user_id]
+
+    if bank_account_id:
+        query_base += " AND bank_account_id = %s"
+        query_params.append(bank_account_id)
+
+    if from_date:
+        query_base += " AND transaction_date >= %s"
+        query_params.append(from_date)
+
+    if to_date:
+        query_base += " AND transaction_date <= %s"
+        query_params.append(to_date)
+
+    return query_base, tuple(query_params)
+
+
+def _rules_query(user_id: int, rules_id, bank_account_id) -> tuple[str, tuple]:
+    query_rules = """
+        SELECT id, dsl_text FROM ss_categorization_rules
+        WHERE user_id = %s AND is_active = true
+    """
+    params_rules = [user_id]
+
+    if rules_id:
+        query_rules += " AND id = ANY(%s)"
+        # Ensure rules_id is a list/tuple for the ANY operator
+        params_rules.append(list(rules_id) if isinstance(rules_id, (list, set)) else [rules_id])
+
+    if bank_account_id:
+        query_rules += " AND (bank_account_id = %s OR bank_account_id IS NULL)"
+        params_rules.append(bank_account_id)
+
+    return query_rules, tuple(params_rules)
+
+
+def _categorize(dsl_rules: list[dict], transactions: list[dict], user_id: int = None, profile: bool = False) -> list[dict]:
+    """Parse and apply the rules; ``profile`` adds per rule stats to the user's rule_stats."""
+    rules = []
+    with track("rule_parse", rows=len(dsl_rules)):
+        for data in dsl_rules:
+            try:
+                rule = parse(data["dsl_text"])
+                rule.rule_id = data.get("id")
+                rules.append(rule)
+            except Exception:
+                logger.exception(f"Failed to parse rule ID {data.get('id')}")
+
+    profile = profile or settings.RULE_PROFILING
+    categorizer = TransactionCategorizer(rules, profile=profile)
+    with track("categorize", rows=len(transactions)):
+        applied = categorizer.categorize_batch(transactions)
+    RULES_EVALUATED.inc(len(rules) * len(transactions))
+
+    if profile and user_id:
+        record_rule_stats(user_id, categorizer.stats)
+    return applied
+
+
+def _result(applied_rule_tx: list[dict], stats: dict) -> dict:
+    logger.info(f"Rule engine bulk update stats = {stats}")
+    return {
+        'count': len(applied_rule_tx),
+        'stats': stats,
+        'status': 'success'
+    }
+
+
+NO_TRANSACTIONS = {"status": "success", "processed": 0, "message": "No transactions found"}
+
+
 def run_rule_engine(
     user_email: str,
     bank_account_id: int = None,
     from_date: date = None,
     to_date: date = None,
     rules_id: list[int] = None, # Usually a list for ANY
-    cur = None
+    cur = None,
+    profile: bool = False,
 ):
     """
     Run rule engine for given params using a single database connection.
+    ``profile`` records per rule evaluation stats (app.core.rule_stats).
     """
 
     def _logic(cursor):
         # 1. Get User ID
-        cursor.execute("SELECT id FROM ss_users WHERE email = %s AND is_active=true", (user_email,))
-        user_dict = cursor.fetchone()
-        if not user_dict:
+        user_id = get_active_user_id(user_email, cur=cursor)
+        if not user_id:
             raise ValueError(f"Invalid user email: {user_email}")
 
-        # 2. Build dynamic transaction query
-        query_base = "SELECT * FROM ss_transactions WHERE user_id = %s"
-        query_params = [user_dict['id']]
-
-        if bank_account_id:
-            query_base += " AND bank_account_id = %s"
-            query_params.append(bank_account_id)
-
-        if from_date:
-            query_base += " AND transaction_date >= %s"
-            query_params.append(from_date)
-
-        if to_date:
-            query_base += " AND transaction_date <= %s"
-            query_params.append(to_date)
-
-        cursor.execute(query_base, tuple(query_params))
+        # 2. Transactions in range
+        cursor.execute(*_transactions_query(user_id, bank_account_id, from_date, to_date))
         transactions = cursor.fetchall()
 
         if not transactions:
-            return {"status": "success", "processed": 0, "message": "No transactions found"}
-
-        # 3. Build dynamic rules query
-        query_rules = """
-            SELECT id, dsl_text FROM ss_categorization_rules
-            WHERE user_id = %s AND is_active = true
-        """
-        params_rules = [user_dict["id"]]
-
-        if rules_id:
-            query_rules += " AND id = ANY(%s)"
-            # Ensure rules_id is a list/tuple for the ANY operator
-            params_rules.append(list(rules_id) if isinstance(rules_id, (list, set)) else [rules_id])
+            return dict(NO_TRANSACTIONS)
 
-        if bank_account_id:
-            query_rules += " AND (bank_account_id = %s OR bank_account_id IS NULL)"
-            params_rules.append(bank_account_id)
-
-        cursor.execute(query_rules, tuple(params_rules))
+        # 3. Active rules
+        cursor.execute(*_rules_query(user_id, rules_id, bank_account_id), prepare=True)
         dsl_rules = cursor.fetchall()
         logger.debug(f"Total {len(dsl_rules)} rules fetched for {user_email}")
 
         # 4. Parse Rules & Categorize
-        rules = []
-        for data in dsl_rules:
-            try:
-                rules.append(parse(data["dsl_text"]))
-            except Exception:
-                logger.exception(f"Failed to parse rule ID {data.get('id')}")
-
-        categorizer = TransactionCategorizer(rules)
-        applied_rule_tx = categorizer.categorize_batch(transactions)
+        applied_rule_tx = _categorize(dsl_rules, transactions, user_id, profile)
 
-        # 5. Bulk Insert/Update (Using same cursor)
-        # Note: bulk_insert_transactions uses ON CONFLICT ON CONSTRAINT
-        stats = bulk_insert_transactions(transactions=applied_rule_tx, cur=cursor, update=True)
-
-        logger.info(f"Rule engine bulk update stats = {stats}")
-
-        return {
-            'count': len(applied_rule_tx),
-            'stats': stats,
-            'status': 'success'
-        }
+        # 5. Upsert (Using same cursor): ON CONFLICT ON CONSTRAINT
+        # uq_transaction_reference updates the rows in place
+        stats = bulk_insert_transactions(transactions=applied_rule_tx, cur=cursor)
+        return _result(applied_rule_tx, stats)
 
     # Execute using provided cursor or checkout a new one
     if cur:
@@ -113,11 +149,110 @@ def run_rule_engine(
             return _logic(new_cur)
 
 
+async def run_rule_engine_async(
+    user_email: str,
+    bank_account_id: int = None,
+    from_date: date = None,
+    to_date: date = None,
+    rules_id: list[int] = None,
+    cur = None,
+    profile: bool = False,
+):
+    """
+    run_rule_engine on an async cursor, for the API. Queries yield the event
+    loop and categorization runs in a worker thread.
+    """
+
+    async def _logic(cursor):
+        await cursor.execute(USER_ID_SQL, (user_email,), prepare=True)
+        user_dict = await cursor.fetchone()
+        if not user_dict:
+            raise ValueError(f"Invalid user email: {user_email}")
+
+        await cursor.execute(*_transactions_query(user_dict['id'], bank_account_id, from_date, to_date))
+        transactions = await cursor.fetchall()
+
+        if not transactions:
+            return dict(NO_TRANSACTIONS)
+
+        await cursor.execute(*_rules_query(user_dict["id"], rules_id, bank_account_id), prepare=True)
+        dsl_rules = await cursor.fetchall()
+        logger.debug(f"Total {len(dsl_rules)} rules fetched for {user_email}")
+
+        applied_rule_tx = await asyncio.to_thread(_categorize, dsl_rules, transactions, user_dict["id"], profile)
+
+        stats = await bulk_insert_transactions_async(transactions=applied_rule_tx, cur=cursor)
+        return _result(applied_rule_tx, stats)
+
+    if cur:
+        return await _logic(cur)
+    else:
+        from app.core.database import get_async_cursor
+        async with get_async_cursor() as new_cur:
+            return await _logic(new_cur)
+
+
+def _as_date(value: date | str | None) -> date | None:
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+@shared_task(
+    bind=True,
+    base=BaseTaskSignal,
+    name="app.tasks.rule_engine_task.run_rule_engine_task",
+    queue="rule_engine",
+)
+def run_rule_engine_task(
+    self,
+    user_email: str,
+    bank_account_id: int = None,
+    from_date: str = None,
+    to_date: str = None,
+    rules_id: list[int] = None,
+    profile: bool = False,
+):
+    """
+    run_rule_engine as a Celery task. Dates arrive as ISO strings (JSON
+    serializer); progress is published under the task id.
+    """
+    task_id = self.request.id
+    publish_progress(task_id, "running")
+
+    result = run_rule_engine(
+        user_email=user_email,
+        bank_account_id=bank_account_id,
+        from_date=_as_date(from_date),
+        to_date=_as_date(to_date),
+        rules_id=rules_id,
+        profile=profile,
+    )
+
+    stats = result.get("stats", {})
+    publish_progress(
+        task_id,
+        "completed",
+        rules_applied=result.get("count", 0),
+        rows_inserted=stats.get("inserted", 0),
+        rows_failed=stats.get("failed", 0),
+    )
+    return result
+
+
 if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="Run rule engine")
 
     parser.add_argument("--user_email", required=True, help="email reciever")
+    parser.add_argument("--bank_account_id", type=int, default=None)
+    parser.add_argument("--from_date", default=None, help="YYYY-MM-DD")
+    parser.add_argument("--to_date", default=None, help="YYYY-MM-DD")
     args = parser.parse_args()
 
+    print(run_rule_engine_task(
+        user_email=args.user_email,
+        bank_account_id=args.bank_account_id,
+        from_date=args.from_date,
+        to_date=args.to_date,
+    ))
+
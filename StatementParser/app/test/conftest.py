@@ -0,0 +1,27 @@
+import pytest
+from app.core import task_payloads
+
+
+class FakeBinaryRedis:
+    """set/get/unlink of redis_cache.binary, in memory."""
+
+    def __init__(self):
+        self.data, self.ttls = {}, {}
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttls[key] = ex
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def unlink(self, *keys):
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+
+@pytest.fixture
+def staged_payloads(monkeypatch) -> FakeBinaryRedis:
+    """app.core.task_payloads on an in-memory store, returns the store."""
+    fake = FakeBinaryRedis()
+    monkeypatch.setattr(task_payloads, "redis_cache", type("FakeRedis", (), {"binary": fake})())
+    return fake
@@ -0,0 +1,185 @@
+import io
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+from app.api.v1 import file_parser_api
+from app.core import upload_claims
+from app.tasks.bank_statement_upload import release_upload_claim
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(file_parser_api.file_upload_router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    calls = []
+
+    def apply_async(kwargs=None, **options):
+        calls.append(kwargs)
+        return SimpleNamespace(id=f"task-{len(calls)}")
+
+    monkeypatch.setattr(file_parser_api, "process_bank_pdf", SimpleNamespace(apply_async=apply_async))
+    return calls
+
+
+def test_small_upload_passes_a_staged_key(client, staged_payloads, queued):
+    response = client.post(
+        f"{file_parser_api.PREFIX}/upload",
+        files={"file": ("sbi.pdf", b"%PDF-1.7 small", "application/pdf")},
+        data={"from_email": "noreply@sbi.co.in", "to_email": "user@example.com"},
+    )
+
+    assert response.status_code == 200
+    kwargs = queued[0]
+    assert "content" not in kwargs and kwargs["file_path"] is None
+    assert staged_payloads.data[kwargs["content_key"]] == b"%PDF-1.7 small"
+
+
+@pytest.fixture
+def spill(monkeypatch, tmp_path):
+    monkeypatch.setattr(file_parser_api, "CUSTOM_TEMP_DIR", tmp_path)
+    monkeypatch.setattr(file_parser_api, "INLINE_MAX_SIZE_MB", 0.0001)  # ~100 B
+    monkeypatch.setattr(file_parser_api, "MAX_SIZE_MB", 0.001)  # ~1 KB
+    monkeypatch.setattr(file_parser_api, "CHUNK", 64)
+    return tmp_path
+
+
+def post_upload(client, body):
+    return client.post(
+        f"{file_parser_api.PREFIX}/upload",
+        files={"file": ("sbi.pdf", body, "application/pdf")},
+        data={"from_email": "noreply@sbi.co.in", "to_email": "user@example.com"},
+    )
+
+
+def test_large_upload_spills_to_disk(client, spill, queued):
+    body = b"%PDF" + b"x" * 500
+
+    assert post_upload(client, body).status_code == 200
+    assert open(queued[0]["file_path"], "rb").read() == body
+
+
+def test_too_large_upload_leaves_no_partial_file(client, spill, queued):
+    response = post_upload(client, b"%PDF" + b"x" * 5000)
+
+    assert response.status_code == 413
+    assert list(spill.iterdir()) == []
+    assert queued == []
+
+
+class FakeClaims:
+    def __init__(self):
+        self.keys = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+    def delete(self, *keys):
+        return sum(self.keys.pop(k, None) is not None for k in keys)
+
+
+class FakeGroup:
+    """Captures the batch signatures, ``fail`` makes apply_async raise like a dead broker."""
+
+    fail = False
+    sent: list = []
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+
+    def apply_async(self):
+        if FakeGroup.fail:
+            raise ConnectionError("broker down")
+        FakeGroup.sent.append(self.tasks)
+        return SimpleNamespace(
+            id="group-1",
+            results=[SimpleNamespace(id=f"task-{i}") for i, _ in enumerate(self.tasks)],
+            save=lambda: None,
+        )
+
+
+@pytest.fixture
+def batch(monkeypatch, tmp_path):
+    claims = FakeClaims()
+    monkeypatch.setattr(upload_claims, "redis_cache", claims)
+    monkeypatch.setattr(file_parser_api, "CUSTOM_TEMP_DIR", tmp_path)
+    monkeypatch.setattr(file_parser_api, "group", FakeGroup)
+    monkeypatch.setattr(FakeGroup, "fail", False)
+    monkeypatch.setattr(FakeGroup, "sent", [])
+    return claims
+
+
+def post_batch(client, files, **data):
+    return client.post(
+        f"{file_parser_api.PREFIX}/upload/batch",
+        files=[("files", (name, body, "application/pdf")) for name, body in files],
+        data={"to_email": "user@example.com", **data},
+    )
+
+
+def test_batch_queues_identical_content_once(client, batch, tmp_path):
+    response = post_batch(client, [("a.pdf", b"%PDF a"), ("b.pdf", b"%PDF a"), ("c.pdf", b"%PDF c")])
+
+    body = response.json()
+    assert response.status_code == 200
+    assert [t["filename"] for t in body["tasks"]] == ["a.pdf", "c.pdf"]
+    assert [(d["filename"], d["duplicate_of"]) for d in body["duplicates"]] == [("b.pdf", "a.pdf")]
+    assert len(batch.keys) == 2
+    assert len(list(tmp_path.iterdir())) == 2
+
+    errbacks = [sig.options["link_error"][0] for sig in FakeGroup.sent[0]]
+    assert {e["args"][0] for e in errbacks} == set(batch.keys)
+
+
+def test_resent_statement_is_queued_again_once_its_task_failed(client, batch):
+    assert len(post_batch(client, [("a.pdf", b"%PDF a")]).json()["tasks"]) == 1
+
+    again = post_batch(client, [("a.pdf", b"%PDF a")]).json()
+    assert again["group_id"] is None and again["duplicates"][0]["duplicate_of"] is None
+
+    # What the errback does when process_bank_pdf or store_bank_transactions fails
+    errback = FakeGroup.sent[0][0].options["link_error"][0]
+    release_upload_claim(*errback["args"])
+
+    assert len(post_batch(client, [("a.pdf", b"%PDF a")]).json()["tasks"]) == 1
+
+
+def test_enqueue_failure_releases_claims(client, batch, tmp_path):
+    FakeGroup.fail = True
+
+    response = post_batch(client, [("a.pdf", b"%PDF a"), ("c.pdf", b"%PDF c")])
+
+    assert response.status_code == 500
+    assert batch.keys == {}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_force_skips_claims(client, batch):
+    post_batch(client, [("a.pdf", b"%PDF a")])
+
+    body = post_batch(client, [("a.pdf", b"%PDF a")], force="true").json()
+    assert len(body["tasks"]) == 1
+    assert "link_error" not in FakeGroup.sent[-1][0].options
+
+
+def test_zip_entries_limited_on_bytes_read(client, batch, monkeypatch):
+    monkeypatch.setattr(file_parser_api, "MAX_SIZE_MB", 0.001)  # ~1 KB
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("small.pdf", b"%PDF small")
+        zf.writestr("big.pdf", b"\0" * 50_000)  # compresses far below the limit
+        zf.writestr("notes.txt", b"skip me")
+
+    body = post_batch(client, [("statements.zip", archive.getvalue())]).json()
+
+    assert [t["filename"] for t in body["tasks"]] == ["small.pdf"]
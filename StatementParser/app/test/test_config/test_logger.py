@@ -0,0 +1,63 @@
+import logging
+
+import pytest
+from app.config import logger as log_config
+from app.config.logger import LocalQueueHandler, auto_setup, setup_logging, stop_queue_logging
+
+
+@pytest.fixture
+def queued_logging(tmp_path):
+    setup_logging(log_level="DEBUG", log_dir=str(tmp_path), log_format="simple", enable_colors=False)
+    yield tmp_path
+    auto_setup()
+
+
+def test_named_loggers_log_through_the_queue(queued_logging):
+    handlers = logging.getLogger("app").handlers
+    assert sum(isinstance(h, LocalQueueHandler) for h in handlers) == 1
+    assert not any(isinstance(h, logging.FileHandler) for h in handlers)
+
+
+def test_records_reach_the_file_handler(queued_logging):
+    logging.getLogger("app").debug("Failed to insert row %d: %s", 7, "duplicate")
+    stop_queue_logging()
+
+    assert "Failed to insert row 7: duplicate" in (queued_logging / "app.log").read_text()
+    assert not any(isinstance(h, LocalQueueHandler) for h in logging.getLogger("app").handlers)
+
+
+def test_exception_rendered_by_the_listener(queued_logging):
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("app").exception("Row failed")
+    stop_queue_logging()
+
+    text = (queued_logging / "app.log").read_text()
+    assert "Row failed" in text
+    assert "ValueError: boom" in text
+
+
+def test_listeners_restarted_after_fork(queued_logging):
+    handler, listener = log_config._queues[0]
+    listener.stop()  # the child has no listener thread
+    log_config._restart_listeners()
+
+    child_handler, child_listener = log_config._queues[0]
+    assert child_handler is handler and child_listener is not listener
+    assert handler.queue is child_listener.queue
+    assert child_listener.handlers == listener.handlers
+    logging.getLogger("app").info("after fork")
+    stop_queue_logging()
+    assert "after fork" in (queued_logging / "app.log").read_text()
+
+
+def test_sync_handlers_when_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOG_QUEUE", "false")
+    try:
+        setup_logging(log_dir=str(tmp_path), enable_colors=False)
+        assert not any(isinstance(h, LocalQueueHandler) for h in logging.getLogger("app").handlers)
+        assert not log_config._queues
+    finally:
+        monkeypatch.delenv("LOG_QUEUE")
+        auto_setup()
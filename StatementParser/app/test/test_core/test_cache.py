@@ -0,0 +1,216 @@
+import fnmatch
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from app.core.cache import MISSING, TieredCache, cached
+
+
+class FakeRedis:
+    """The handful of commands TieredCache uses, in memory."""
+
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    unlink = delete
+
+    def mget(self, keys):
+        self.gets += 1
+        return [self.data.get(key) for key in keys]
+
+    def scan_iter(self, match="*", count=None):
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def set(self, *args, **kwargs):
+        self.commands.append((args, kwargs))
+
+    def execute(self):
+        return [self.client.set(*args, **kwargs) for args, kwargs in self.commands]
+
+
+@pytest.fixture
+def cache():
+    return TieredCache(client=FakeRedis(), local_max_entries=3, local_ttl=30)
+
+
+def test_get_or_load_loads_once(cache):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"id": 7}
+
+    assert cache.get_or_load("user:a", loader, ttl=60) == {"id": 7}
+    assert cache.get_or_load("user:a", loader, ttl=60) == {"id": 7}
+    assert len(calls) == 1
+
+    stats = cache.stats()
+    assert stats["loads"] == 1
+    assert stats["local_hits"] == 1
+
+
+def test_redis_tier_fills_local(cache):
+    cache.set("k", [1, 2], ttl=60)
+    cache.local.clear()
+
+    assert cache.get("k") == [1, 2]
+    assert cache.stats()["redis_hits"] == 1
+    assert cache.get("k") == [1, 2]
+    assert cache.stats()["local_hits"] == 1
+
+
+def test_negative_caching(cache):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_load("user:missing", loader, ttl=60, negative_ttl=5) is None
+    assert cache.get_or_load("user:missing", loader, ttl=60, negative_ttl=5) is None
+    assert len(calls) == 1
+    assert cache.stats()["negative_hits"] == 1
+
+    # Without negative_ttl a None result is not stored
+    cache.get_or_load("user:other", loader, ttl=60)
+    cache.get_or_load("user:other", loader, ttl=60)
+    assert len(calls) == 3
+
+
+def test_lru_eviction_and_expiry(cache):
+    for i in range(4):
+        cache.local.set(f"k{i}", str(i), ttl=30)
+    assert cache.local.get("k0") is None
+    assert cache.stats()["local_evictions"] == 1
+
+    cache.local.set("short", "1", ttl=0.01)
+    time.sleep(0.02)
+    assert cache.local.get("short") is None
+    assert cache.stats()["local_expirations"] == 1
+
+
+def test_single_flight(cache):
+    calls = []
+    started = threading.Event()
+
+    def loader():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("hot", loader, ttl=60)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+
+
+def test_hit_keeps_types(cache):
+    row = {"id": 1, "amount": Decimal("10.50"), "created_at": datetime(2025, 1, 1, 10, 0)}
+    cache.get_or_load("account", lambda: row, ttl=60)
+    cache.local.clear()
+
+    assert cache.get_or_load("account", lambda: None, ttl=60) == row
+
+
+def test_cached_decorator_key_and_invalidate(cache):
+    calls = []
+
+    @cached(ttl=60, key="user:email:{email}", cache=cache)
+    def lookup(email, cur=None):
+        calls.append(email)
+        return len(email)
+
+    assert lookup("a@b.com") == 7
+    assert lookup("a@b.com", cur=object()) == 7
+    assert calls == ["a@b.com"]
+    assert lookup.cache_key("a@b.com") == "user:email:a@b.com"
+
+    lookup.invalidate("a@b.com")
+    assert cache.local.get("user:email:a@b.com") is None
+    assert cache._lookup("user:email:a@b.com") is MISSING
+    lookup("a@b.com")
+    assert len(calls) == 2
+
+
+def test_get_many_one_round_trip(cache):
+    cache.set_many({"a": 1, "b": {"x": 2}}, ttl=60)
+    cache.local.clear()
+    cache.client.gets = 0
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "b": {"x": 2}}
+    assert cache.client.gets == 1
+    # Now local
+    assert cache.get_many(["a", "b"]) == {"a": 1, "b": {"x": 2}}
+    assert cache.client.gets == 1
+
+
+def test_delete_pattern(cache):
+    cache.set_many({"bank_account:1:111": 1, "bank_account:1:222": 2, "bank_account:2:333": 3}, ttl=60)
+
+    assert cache.delete_pattern("bank_account:1:*") == 2
+    assert cache.get_many(["bank_account:1:111", "bank_account:1:222", "bank_account:2:333"]) == {
+        "bank_account:2:333": 3
+    }
+
+
+def test_flight_lock_kept_while_threads_wait(cache):
+    release = threading.Event()
+    calls, running = [], []
+
+    def loader():
+        running.append(1)
+        calls.append(len(running))
+        release.wait(5)
+        running.pop()
+        return None  # not cached: every waiter has to go through the lock
+
+    threads = [threading.Thread(target=cache.get_or_load, args=("cold", loader, 60)) for _ in range(3)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while cache._flights.get("cold", [None, 0])[1] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    lock, holders = cache._flights["cold"]
+    assert holders == 3
+    release.set()
+    for t in threads:
+        t.join()
+
+    # Loads ran one at a time on the same lock, and the entry left with the last thread
+    assert calls == [1, 1, 1]
+    assert cache._flights == {}
@@ -0,0 +1,39 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+from app.core.celery_signal import BaseTaskSignal, GenericTaskSignal
+
+
+class Payload:
+    """Counts how often a log call renders it."""
+
+    def __init__(self):
+        self.rendered = 0
+
+    def __str__(self):
+        self.rendered += 1
+        return "payload"
+
+    __repr__ = __str__
+
+
+@pytest.fixture
+def info_level():
+    logger = logging.getLogger("app")
+    level = logger.level
+    # setLevel, not the attribute: it also clears isEnabledFor's cache
+    logger.setLevel(logging.INFO)
+    yield
+    logger.setLevel(level)
+
+
+@pytest.mark.parametrize("signal", [BaseTaskSignal, GenericTaskSignal])
+def test_debug_args_not_rendered_above_debug(signal, info_level):
+    task = SimpleNamespace(name="app.tasks.x")
+    payload = Payload()
+
+    signal.on_success(task, payload, "abc", (payload,), {"rows": payload})
+    signal.on_failure(task, ValueError("boom"), "abc", (payload,), {"rows": payload}, payload)
+
+    assert payload.rendered == 0
@@ -0,0 +1,87 @@
+import json
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+
+import pytest
+from app.core.codecs import (
+    CODEC_NAMES,
+    COMPRESSION_NAMES,
+    MAGIC,
+    NONE,
+    NAMESPACE_SERIALIZERS,
+    Serializer,
+    pickle_allowed,
+    serializer_for,
+)
+
+SAMPLE = [
+    {
+        "amount": Decimal("1250.75"),
+        "transaction_date": date(2025, 3, 1),
+        "created_at": datetime(2025, 3, 1, 9, 30, tzinfo=timezone.utc),
+        "value_time": time(9, 30),
+        "description": "UPI/DR/512345678901/SWIGGY/HDFC/Payment",
+        "category_id": None,
+    }
+] * 50
+
+
+@pytest.fixture
+def pickle_namespace(monkeypatch):
+    monkeypatch.setitem(NAMESPACE_SERIALIZERS, "test:pickle:", Serializer.named("pickle"))
+    return "test:pickle:rows"
+
+
+@pytest.mark.parametrize("compression", list(COMPRESSION_NAMES))
+@pytest.mark.parametrize("codec", ["msgpack", "pickle"])
+def test_round_trip_keeps_types(codec, compression, pickle_namespace):
+    serializer = Serializer.named(codec, compression, min_size=0)
+    assert Serializer.decode(serializer.encode(SAMPLE), pickle_namespace) == SAMPLE
+
+
+@pytest.mark.parametrize("key", [None, "cache:rules:user:1", "other", "test:pickle"])
+def test_pickle_refused_outside_pickle_namespace(key, pickle_namespace):
+    payload = Serializer.named("pickle").encode(SAMPLE)
+
+    assert not pickle_allowed(key)
+    with pytest.raises(ValueError, match="Refusing pickle"):
+        Serializer.decode(payload, key)
+
+
+def test_pickle_allowed_follows_longest_prefix(monkeypatch, pickle_namespace):
+    monkeypatch.setitem(NAMESPACE_SERIALIZERS, "test:pickle:safe:", Serializer.named("msgpack"))
+
+    assert pickle_allowed(pickle_namespace)
+    assert not pickle_allowed("test:pickle:safe:rows")
+
+
+def test_json_codec_stringifies():
+    payload = Serializer.named("json").encode({"amount": Decimal("1.50")})
+    assert Serializer.decode(payload) == {"amount": "1.50"}
+
+
+def test_small_payloads_stay_uncompressed():
+    serializer = Serializer.named("msgpack", "zstd", min_size=1024)
+    small = serializer.encode({"id": 1})
+    large = serializer.encode(SAMPLE)
+
+    assert small[0] == MAGIC and small[2] == NONE
+    assert large[2] == serializer.compression
+    assert len(large) < len(Serializer.named("msgpack").encode(SAMPLE))
+
+
+def test_reads_legacy_json():
+    assert Serializer.decode(json.dumps({"a": 1})) == {"a": 1}
+    assert Serializer.decode(json.dumps([1, 2]).encode()) == [1, 2]
+
+
+def test_namespace_lookup_longest_prefix():
+    assert serializer_for("cache:lookup:categories") == Serializer.named("msgpack", "none")
+    assert serializer_for("cache:rules:user:1") == Serializer.named("msgpack", "zstd")
+    assert serializer_for("other") == Serializer.named("msgpack", "zstd")
+
+
+def test_frames_decode_with_any_serializer():
+    payload = Serializer.named("msgpack", "zlib", min_size=0).encode(SAMPLE)
+    assert Serializer.named("json").decode(payload) == SAMPLE
+    assert set(CODEC_NAMES) == {"json", "msgpack", "pickle"}
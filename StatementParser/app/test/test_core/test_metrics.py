@@ -0,0 +1,53 @@
+import asyncio
+
+from app.api.v1.metrics_api import metrics_router
+from app.core.metrics import REGISTRY, instrument, track
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+def sample(name: str, stage: str) -> float:
+    return REGISTRY.get_sample_value(name, {"stage": stage}) or 0.0
+
+
+def test_track_times_and_counts_rows():
+    before = sample("statement_stage_seconds_count", "test_track")
+    with track("test_track") as span:
+        span.rows = 5
+    assert sample("statement_stage_seconds_count", "test_track") == before + 1
+    assert sample("statement_stage_rows_total", "test_track") >= 5
+
+
+def test_instrument_sync_and_async():
+    @instrument("test_sync", rows=len)
+    def rows():
+        return [1, 2, 3]
+
+    @instrument("test_async", rows=lambda result: result["inserted"])
+    async def insert():
+        return {"inserted": 4}
+
+    assert rows() == [1, 2, 3]
+    assert asyncio.run(insert()) == {"inserted": 4}
+    assert sample("statement_stage_rows_total", "test_sync") == 3
+    assert sample("statement_stage_rows_total", "test_async") == 4
+
+
+def test_metrics_endpoint():
+    app = FastAPI()
+    app.include_router(metrics_router)
+    with track("test_endpoint"):
+        pass
+
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert 'statement_stage_seconds_count{stage="test_endpoint"}' in response.text
+
+
+def test_ops_stats_under_api_prefix():
+    app = FastAPI()
+    app.include_router(metrics_router)
+    client = TestClient(app)
+
+    assert set(client.get("/api/v1/db/pool").json()) == {"sync", "async"}
+    assert "local_hits" in client.get("/api/v1/cache/stats").json()
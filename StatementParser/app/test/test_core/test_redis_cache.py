@@ -0,0 +1,26 @@
+import pytest
+from app.core.redis_cache import CACHE_PATTERN, redis_cache
+
+
+@pytest.fixture
+def deleted(monkeypatch):
+    patterns = []
+    monkeypatch.setattr(redis_cache, "delete_pattern", lambda pattern: patterns.append(pattern) or 0)
+    return patterns
+
+
+def test_clear_all_cache_defaults_to_cache_namespace(deleted):
+    redis_cache.clear_all_cache()
+    redis_cache.clear_all_cache("cache:rules:*")
+
+    assert deleted == [CACHE_PATTERN, "cache:rules:*"]
+
+
+@pytest.mark.parametrize("pattern", ["*", "task_payload:*", "statement_upload:*"])
+def test_clear_all_cache_refuses_wider_patterns(deleted, pattern):
+    with pytest.raises(ValueError, match="outside the cache namespace"):
+        redis_cache.clear_all_cache(pattern)
+    assert deleted == []
+
+    redis_cache.clear_all_cache(pattern, outside_cache=True)
+    assert deleted == [pattern]
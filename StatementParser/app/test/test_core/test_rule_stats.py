@@ -0,0 +1,69 @@
+from collections import Counter
+
+import pytest
+from app.core import rule_stats
+from app.core.rule_stats import get_rule_stats, record_rule_stats, reset_rule_stats
+from app.rule_engine.evaluator import RuleStats
+
+
+class FakeHashes:
+    """hincrby/hgetall/hkeys/hdel over in-memory hashes (decoded strings)."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def hincrby(self, key, field, amount):
+        h = self.hashes.setdefault(key, {})
+        h[field] = str(int(h.get(field, 0)) + amount)
+
+    def expire(self, key, ttl):
+        pass
+
+    def execute(self):
+        return []
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hkeys(self, key):
+        return list(self.hashes.get(key, {}))
+
+    def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeHashes()
+    monkeypatch.setattr(rule_stats, "redis_cache", fake)
+    return fake
+
+
+def test_record_accumulates_across_runs(redis):
+    run = {7: RuleStats(evaluations=10, matches=2, seconds=0.0005, assigned=Counter(category_id=2))}
+    record_rule_stats(1, run)
+    record_rule_stats(1, run)
+
+    stats = get_rule_stats(1)["7"]
+    assert stats["evaluations"] == 20
+    assert stats["matches"] == 4
+    assert stats["match_ratio"] == 0.2
+    assert stats["total_ms"] == 1.0
+    assert stats["avg_us"] == 50.0
+    assert stats["assigned"] == {"category_id": 4}
+
+
+def test_reset_one_rule(redis):
+    record_rule_stats(1, {7: RuleStats(evaluations=1), 70: RuleStats(evaluations=1)})
+    reset_rule_stats(1, 7)
+    assert set(get_rule_stats(1)) == {"70"}
+
+    reset_rule_stats(1)
+    assert get_rule_stats(1) == {}
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+from app.core import superset_cache
+from app.core.superset_cache import WARMUP_TASK, schedule_dashboard_warmup, touched_months
+
+
+class FakeVersions:
+    def __init__(self):
+        self.store = {}
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def incr(self, key):
+        self.store[key] = self.store.get(key, 0) + 1
+
+    def execute(self):
+        return list(self.store.values())
+
+
+class FakeApp:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.sent = []
+
+    def send_task(self, name, kwargs=None, queue=None):
+        if self.fail:
+            raise ConnectionError("broker down")
+        self.sent.append((name, kwargs, queue))
+        return SimpleNamespace(id="warmup-1")
+
+
+@pytest.fixture
+def versions(monkeypatch):
+    fake = FakeVersions()
+    monkeypatch.setattr(superset_cache, "_version_client", lambda: fake)
+    return fake
+
+
+def test_touched_months():
+    transactions = [
+        {"transaction_date": "2025-02-03"},
+        {"transaction_date": "2025-01-31"},
+        {"transaction_date": "2025-02-20"},
+        {"transaction_date": ""},
+    ]
+    assert touched_months(transactions) == ["2025-01", "2025-02"]
+
+
+def test_bumps_only_user_and_months(versions):
+    app = FakeApp()
+    assert schedule_dashboard_warmup(7, ["2025-01"], app=app) == "warmup-1"
+    schedule_dashboard_warmup(7, ["2025-02"], app=app)
+
+    assert versions.store == {
+        "ss_data_version:7": 2,
+        "ss_data_version:7:2025-01": 1,
+        "ss_data_version:7:2025-02": 1,
+    }
+    name, kwargs, queue = app.sent[0]
+    assert name == WARMUP_TASK
+    assert queue == "superset"
+    assert kwargs["strategy_name"] == "dashboard_tags"
+    assert "ss_user_7" in kwargs["tags"]
+
+
+def test_failure_is_not_raised(versions):
+    assert schedule_dashboard_warmup(7, ["2025-01"], app=FakeApp(fail=True)) is None
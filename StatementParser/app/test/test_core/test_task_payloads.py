@@ -0,0 +1,25 @@
+import pytest
+from app.core import task_payloads
+from app.core.task_payloads import PAYLOAD_TTL, drop_payloads, load_bytes, stage_bytes
+
+
+def test_stage_load_drop(staged_payloads):
+    key = stage_bytes(b"%PDF-1.7")
+
+    assert key.startswith("task_payload:")
+    assert staged_payloads.ttls[key] == PAYLOAD_TTL
+    assert load_bytes(key) == b"%PDF-1.7"
+
+    drop_payloads(key, None)
+    with pytest.raises(LookupError):
+        load_bytes(key)
+
+
+def test_drop_never_raises(monkeypatch):
+    class Down:
+        @property
+        def binary(self):
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr(task_payloads, "redis_cache", Down())
+    drop_payloads("task_payload:x")
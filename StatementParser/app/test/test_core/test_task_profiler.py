@@ -0,0 +1,97 @@
+import time
+
+import pytest
+from app.core import task_profiler
+from app.core.task_profiler import profile_task, profiling_mode
+
+
+class FakeRedis:
+    def __init__(self, config=None, fail=False):
+        self.config = config or {}
+        self.fail = fail
+
+    def hgetall(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return dict(self.config)
+
+
+@pytest.fixture
+def use_config(monkeypatch):
+    def _use(config=None, fail=False):
+        monkeypatch.setattr(task_profiler, "redis_cache", FakeRedis(config, fail))
+        monkeypatch.setattr(task_profiler, "_config", {"loaded_at": float("-inf")})
+
+    monkeypatch.setattr(task_profiler.settings, "TASK_PROFILE_TASKS", "")
+    monkeypatch.setattr(task_profiler.settings, "TASK_PROFILE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(task_profiler.settings, "TASK_PROFILE_MODE", "sample")
+    return _use
+
+
+def test_profiling_off_by_default(use_config):
+    use_config()
+    assert profiling_mode("app.tasks.x") is None
+
+
+def test_listed_task_uses_redis_override(use_config):
+    use_config({"tasks": "app.tasks.x, app.tasks.y", "mode": "cprofile"})
+    assert profiling_mode("app.tasks.y") == "cprofile"
+    assert profiling_mode("app.tasks.z") is None
+
+
+def test_sample_rate(use_config):
+    use_config({"sample_rate": "1"})
+    assert profiling_mode("app.tasks.z") == "sample"
+
+
+def test_redis_down_falls_back_to_settings(use_config, monkeypatch):
+    monkeypatch.setattr(task_profiler.settings, "TASK_PROFILE_TASKS", "app.tasks.x")
+    use_config(fail=True)
+    assert profiling_mode("app.tasks.x") == "sample"
+
+
+def test_first_load_on_fresh_monotonic_clock(use_config, monkeypatch):
+    use_config({"tasks": "app.tasks.x"})
+    monkeypatch.setattr(task_profiler.time, "monotonic", lambda: 1.0)
+    assert profiling_mode("app.tasks.x") == "sample"
+    assert task_profiler._config["loaded_at"] == 1.0
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sample_writes_collapsed_stacks(tmp_path):
+    with profile_task("app.tasks.x", "abc", "sample", output_dir=tmp_path):
+        _busy(0.1)
+
+    lines = (tmp_path / "app.tasks.x.abc.collapsed").read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert "test_task_profiler:_busy" in stack
+    assert int(count) > 0
+
+
+def test_cprofile_written_even_when_task_raises(tmp_path):
+    with pytest.raises(ValueError):
+        with profile_task("app.tasks.x", "abc", "cprofile", output_dir=tmp_path):
+            raise ValueError("boom")
+
+    assert (tmp_path / "app.tasks.x.abc.prof").exists()
+    assert "function calls" in (tmp_path / "app.tasks.x.abc.txt").read_text()
+
+
+def test_cprofile_busy_runs_unprofiled(tmp_path, monkeypatch):
+    class ActiveProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(task_profiler.cProfile, "Profile", ActiveProfile)
+    ran = []
+    with profile_task("app.tasks.x", "abc", "cprofile", output_dir=tmp_path):
+        ran.append(True)
+
+    assert ran == [True]
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+
+from app.model_actions.rollups import REFRESH_ROLLUP_SQL, refresh_rollups, rollup_spans
+
+
+class FakeCursor:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.executed = []
+
+    def execute(self, query, params=None, prepare=None):
+        if self.fail:
+            raise RuntimeError("connection lost")
+        self.executed.append((query, params))
+
+    def fetchone(self):
+        return {"rows": 3}
+
+
+def test_spans_per_user():
+    transactions = [
+        {"user_id": 1, "transaction_date": "2025-03-14"},
+        {"user_id": 1, "transaction_date": "2025-01-02"},
+        {"user_id": 2, "transaction_date": "2025-02-10"},
+        {"user_id": 2, "transaction_date": ""},
+    ]
+    assert rollup_spans(transactions) == {
+        1: ("2025-01-02", "2025-03-14"),
+        2: ("2025-02-10", "2025-02-10"),
+    }
+
+
+def test_spans_mixed_date_types():
+    first = datetime(2025, 1, 5, tzinfo=timezone.utc)
+    spans = rollup_spans([
+        {"user_id": 1, "transaction_date": "2025-02-01"},
+        {"user_id": 1, "transaction_date": first},
+    ])
+    assert spans == {1: (first, "2025-02-01")}
+
+
+def test_refresh_one_call_per_user():
+    cursor = FakeCursor()
+    written = refresh_rollups(
+        [
+            {"user_id": 1, "transaction_date": "2025-01-02"},
+            {"user_id": 2, "transaction_date": "2025-02-10"},
+        ],
+        cur=cursor,
+    )
+    assert written == 6
+    assert cursor.executed == [
+        (REFRESH_ROLLUP_SQL, (1, "2025-01-02", "2025-01-02")),
+        (REFRESH_ROLLUP_SQL, (2, "2025-02-10", "2025-02-10")),
+    ]
+
+
+def test_refresh_failure_is_not_raised():
+    transactions = [{"user_id": 1, "transaction_date": "2025-01-02"}]
+    assert refresh_rollups(transactions, cur=FakeCursor(fail=True)) == 0
+    assert refresh_rollups([], cur=FakeCursor(fail=True)) == 0
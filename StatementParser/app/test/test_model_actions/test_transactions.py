@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from app.model_actions import transactions
+from app.model_actions.transactions import bulk_insert_transactions, bulk_insert_transactions_async
+
+ROWS = [{"reference_id": f"UPI-{k}", "amount": k} for k in range(5)]
+
+
+class FakeCursor:
+    """Any statement carrying a row with amount 3 fails."""
+
+    def __init__(self):
+        self.rows = []
+
+    def executemany(self, query, values):
+        if any(v[1] == 3 for v in values):
+            raise RuntimeError("bad chunk")
+        self.rows.extend(values)
+
+    def execute(self, query, values):
+        if values[1] == 3:
+            raise RuntimeError("bad row")
+        self.rows.append(values)
+
+
+class FakeAsyncCursor(FakeCursor):
+    async def executemany(self, query, values):
+        super().executemany(query, values)
+
+    async def execute(self, query, values):
+        super().execute(query, values)
+
+
+@pytest.fixture(autouse=True)
+def no_pipeline(monkeypatch):
+    monkeypatch.setattr(transactions.psycopg.Pipeline, "is_supported", staticmethod(lambda: False))
+
+
+def test_sync_and_async_fallbacks_agree():
+    sync_cur, async_cur = FakeCursor(), FakeAsyncCursor()
+    result = bulk_insert_transactions(ROWS, chunk_size=2, cur=sync_cur, rollup=False)
+    async_result = asyncio.run(bulk_insert_transactions_async(ROWS, async_cur, chunk_size=2, rollup=False))
+
+    assert result == async_result
+    assert result["inserted"] == 4 and result["failed"] == 1
+    assert result["errors"] == [{"index": 3, "reference_id": "UPI-3", "error": "bad row"}]
+    assert sync_cur.rows == async_cur.rows
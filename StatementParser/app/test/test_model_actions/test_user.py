@@ -0,0 +1,45 @@
+import pytest
+from app.core.cache import TieredCache
+from app.model_actions import user
+
+from app.test.test_core.test_cache import FakeRedis
+
+
+class FakeCursor:
+    def __init__(self, user_id=None):
+        self.user_id = user_id
+        self.executed = []
+
+    def execute(self, query, params=None, prepare=None):
+        self.executed.append((query, params))
+
+    def fetchone(self):
+        return {"id": self.user_id} if self.user_id else None
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = TieredCache(client=FakeRedis(), local_ttl=30)
+    monkeypatch.setattr(user, "tiered_cache", cache)
+    return cache
+
+
+def test_deactivated_user_stops_resolving(cache):
+    email_key = user.get_active_user_id.cache_key("a@b.com")
+    cache.set(email_key, 7, ttl=60)
+    cache.set("bank_account:7:123", {"id": 3}, ttl=60)
+    cache.set("rules:user:7", [], ttl=60)
+
+    cur = FakeCursor(user_id=7)
+    assert user.set_user_active("a@b.com", is_active=False, cur=cur) == 7
+
+    assert cur.executed[0][1] == (False, "a@b.com")
+    assert cache.get(email_key, "gone") == "gone"
+    assert cache.get("bank_account:7:123", "gone") == "gone"
+    assert cache.get("rules:user:7", "gone") == "gone"
+
+
+def test_unknown_user_leaves_cache(cache):
+    cache.set("rules:user:7", [], ttl=60)
+    assert user.set_user_active("x@b.com", is_active=False, cur=FakeCursor()) is None
+    assert cache.get("rules:user:7") == []
@@ -0,0 +1,21 @@
+from io import BytesIO
+
+import pikepdf
+import pytest
+
+
+@pytest.fixture
+def pdf_bytes():
+    buffer = BytesIO()
+    with pikepdf.new() as pdf:
+        pdf.add_blank_page()
+        pdf.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def locked_pdf(tmp_path, pdf_bytes):
+    path = tmp_path / "locked.pdf"
+    with pikepdf.open(BytesIO(pdf_bytes)) as pdf:
+        pdf.save(path, encryption=pikepdf.Encryption(owner="owner", user="secret"))
+    return path
@@ -0,0 +1,49 @@
+from datetime import date
+
+import pytest
+from app.pdf_normalizer.date_parser import parse_date_value
+from app.pdf_normalizer.parsers.base_parsing_rules import DateAmountRule
+from app.pdf_normalizer.values_extract import parse_date
+from dateutil import parser as dateutil_parser
+
+
+@pytest.mark.parametrize("text", [
+    "01/11/25",
+    "16/05/2025",
+    "01-11-2025",
+    "1-2-24",
+    "01.11.2025",
+    "14 Dec 2025",
+    "14-Dec-25",
+    "20 Nov, 2025",
+    "5 September 2025",
+    "2025-12-14",
+    " 05/13/2025 ",
+    "Dec 14, 2025",
+])
+def test_matches_dateutil_dayfirst(text):
+    expected = dateutil_parser.parse(text.strip(), dayfirst=True).date()
+    assert parse_date_value(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "31/02/2025", "UPI/DR/1234", "14 Foo 2025", "Balance"])
+def test_unparseable(text):
+    assert parse_date_value(text) is None
+
+
+def test_results_are_memoized():
+    parse_date_value.cache_clear()
+    parse_date_value("14 Dec 2025")
+    parse_date_value("14 Dec 2025")
+    assert parse_date_value.cache_info().hits == 1
+
+
+def test_parse_date_and_rule():
+    assert parse_date("20 Nov, 2025") == "2025-11-20"
+    with pytest.raises(ValueError):
+        parse_date("not a date")
+
+    assert DateAmountRule().match(["01/11/25", "UPI/DR/1"]) == (True, 0)
+    assert DateAmountRule().match(["UPI-5324", "14 Dec 2025"]) == (True, 1)
+    assert DateAmountRule.is_date("31/02/2025") is False
+    assert parse_date_value("1/2/24") == date(2024, 2, 1)
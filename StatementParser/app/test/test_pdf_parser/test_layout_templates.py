@@ -0,0 +1,147 @@
+import pytest
+from app.pdf_normalizer.layout_templates import (LayoutTemplate,
+                                                 LayoutTemplateStore,
+                                                 column_roles,
+                                                 extract_page_tables,
+                                                 is_transaction_table)
+
+ROWS = [
+    ["Date", "Remarks", "Amount", "Balance"],
+    ["01/11/2025", "UPI/DR/123/SHOP", "10.00", "100.00"],
+    ["02/11/2025", "NEFT-ABC-XYZ", "20.00", "80.00"],
+]
+COLUMNS = [40.0, 100.0, 190.0, 380.0, 460.0]
+NOISE = ["UNION BANK OF INDIA", "", "", ""]
+
+
+def union_template(**kwargs):
+    return LayoutTemplate(bank_name="UNION", columns=COLUMNS, date_column=0, amount_columns=[2, 3], **kwargs)
+
+
+class FakeTable:
+    def __init__(self, cells, data):
+        self.cells = cells
+        self.data = data
+
+    def extract(self):
+        return self.data
+
+
+class FakePage:
+    """Minimal stand-in for a pdfplumber page."""
+
+    bbox = (0, 0, 595, 842)
+
+    def __init__(self, tables, explicit_rows=None):
+        self.tables = tables
+        self.explicit_rows = explicit_rows
+        self.find_calls = 0
+
+    def find_tables(self):
+        self.find_calls += 1
+        return self.tables
+
+    def crop(self, bbox):
+        return self
+
+    def extract_tables(self, settings):
+        assert settings["vertical_strategy"] == "explicit"
+        return [self.explicit_rows] if self.explicit_rows else []
+
+
+def _cells(columns, n_rows):
+    return [
+        (x0, 10.0 * r, x1, 10.0 * (r + 1))
+        for r in range(n_rows)
+        for x0, x1 in zip(columns, columns[1:])
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LayoutTemplateStore(directory=tmp_path)
+
+
+def test_from_table_learns_column_boundaries():
+    table = FakeTable(_cells([40.0, 100.04, 190.0, 380.0, 460.0], 3), ROWS)
+    template = LayoutTemplate.from_table("UNION", table)
+
+    assert template.columns == [40.0, 100.0, 190.0, 380.0, 460.0]
+    assert template.num_columns == 4
+    assert (template.date_column, template.amount_columns) == (0, [2, 3])
+
+
+def test_column_roles():
+    sbi = [
+        ["Date", "Description", "Credit", "Debit", "Balance"],
+        ["01-11-25", "UPI/DR/1/SHOP", "-", "10.00", "90.00"],
+        ["02-11-25", "NEFT CR", "20.00", "-", "110.00"],
+        ["03-11-25", "UPI/DR/2/SHOP", "-", "5.00", "105.00"],
+    ]
+    assert column_roles(sbi) == (0, [3, 4])
+
+
+def test_is_transaction_table():
+    assert is_transaction_table(ROWS)
+    assert not is_transaction_table([["Account No", "1234", "IFSC"]] * 3)
+    assert is_transaction_table([["x", "14 Dec 2025", "INT.PD", "1.00"]])
+
+
+def test_store_persists_templates(store):
+    store.save(LayoutTemplate(bank_name="SBI", columns=[1.0, 2.0, 3.0, 4.0]))
+
+    reloaded = LayoutTemplateStore(directory=store.directory)
+    assert reloaded.get("SBI") == LayoutTemplate(bank_name="SBI", columns=[1.0, 2.0, 3.0, 4.0])
+    assert reloaded.get("KOTAK") is None
+
+
+def test_generic_finder_learns_template(store):
+    page = FakePage([FakeTable(_cells(COLUMNS, 3), ROWS)])
+
+    assert extract_page_tables(page, bank_name="UNION", store=store) == [ROWS]
+    assert store.get("UNION") == union_template()
+
+
+def test_known_layout_skips_table_finder(store):
+    store.save(union_template())
+    page = FakePage([], explicit_rows=[NOISE, *ROWS[1:], NOISE])
+
+    assert extract_page_tables(page, bank_name="UNION", store=store) == [ROWS[1:]]
+    assert page.find_calls == 0
+
+
+def test_known_layout_keeps_wrapped_last_row(store):
+    store.save(union_template())
+    wrapped = ["", "Ref Txn", "", ""]
+    footer = ["", "Page 1 of 3", "", "Closing 80.00"]
+    page = FakePage([], explicit_rows=[NOISE, *ROWS[1:], wrapped, footer, NOISE])
+
+    assert extract_page_tables(page, bank_name="UNION", store=store) == [[*ROWS[1:], wrapped]]
+    assert page.find_calls == 0
+
+
+def test_failed_validation_falls_back_to_finder(store):
+    store.save(LayoutTemplate(bank_name="UNION", columns=[40.0, 100.0, 190.0]))
+    page = FakePage([FakeTable(_cells(COLUMNS, 3), ROWS)], explicit_rows=[["x", "y"]])
+
+    assert extract_page_tables(page, bank_name="UNION", store=store) == [ROWS]
+    assert page.find_calls == 1
+    assert store.get("UNION").columns == COLUMNS
+
+
+def test_shifted_layout_discards_template(store):
+    store.save(union_template())
+    # Same column count, but the amounts moved out of columns 2 and 3
+    shifted = [
+        ["Date", "Amount", "Remarks", "Balance"],
+        ["01/11/2025", "10.00", "UPI/DR/123/SHOP", "100.00 Cr"],
+        ["02/11/2025", "20.00", "NEFT-ABC-XYZ", "-"],
+    ]
+    page = FakePage([FakeTable(_cells(COLUMNS, 3), shifted)], explicit_rows=shifted[1:])
+    discarded = []
+    store.discard = lambda bank_name: (discarded.append(bank_name), LayoutTemplateStore.discard(store, bank_name))
+
+    assert extract_page_tables(page, bank_name="UNION", store=store) == [shifted]
+    assert discarded == ["UNION"]
+    assert page.find_calls == 1
+    assert store.get("UNION").amount_columns == [1, 3]
@@ -0,0 +1,33 @@
+import mmap
+from io import BytesIO
+
+import pdfplumber
+from app.pdf_normalizer.pdf_source import open_statement
+from app.pdf_normalizer.pdf_unlock import (is_pdf_password_protected,
+                                           open_or_decrypt)
+
+
+def test_inline_content_roundtrip(pdf_bytes):
+    with open_statement(content=pdf_bytes) as source:
+        assert isinstance(source, BytesIO)
+        with pdfplumber.open(source) as pdf:
+            assert len(pdf.pages) == 1
+
+
+def test_small_file_is_mmapped(tmp_path, pdf_bytes):
+    path = tmp_path / "plain.pdf"
+    path.write_bytes(pdf_bytes)
+
+    with open_statement(file_path=str(path)) as source:
+        assert isinstance(source, mmap.mmap)
+        assert not is_pdf_password_protected(source)
+
+
+def test_unlock_to_buffer_leaves_no_copy(locked_pdf):
+    with open_statement(file_path=str(locked_pdf)) as source:
+        assert is_pdf_password_protected(source)
+        buffer = open_or_decrypt(source, get_passwords=lambda: ["secret"])
+
+    with pdfplumber.open(buffer) as pdf:
+        assert len(pdf.pages) == 1
+    assert [p.name for p in locked_pdf.parent.iterdir()] == ["locked.pdf"]
@@ -0,0 +1,80 @@
+import mmap
+from io import BytesIO
+
+import pdfplumber
+import pikepdf
+import pytest
+from app.pdf_normalizer.pdf_source import open_statement
+from app.pdf_normalizer.pdf_unlock import (is_pdf_encrypted, is_pdf_password_protected,
+                                           open_or_decrypt)
+
+
+@pytest.fixture
+def owner_only_pdf(tmp_path, pdf_bytes):
+    path = tmp_path / "owner.pdf"
+    with pikepdf.open(BytesIO(pdf_bytes)) as pdf:
+        pdf.save(path, encryption=pikepdf.Encryption(owner="owner", user=""))
+    return path
+
+
+@pytest.fixture
+def xref_stream_pdf(tmp_path, pdf_bytes):
+    path = tmp_path / "xref_stream.pdf"
+    with pikepdf.open(BytesIO(pdf_bytes)) as pdf:
+        pdf.save(
+            path,
+            encryption=pikepdf.Encryption(owner="owner", user="secret"),
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+        )
+    return path
+
+
+def _no_passwords():
+    raise AssertionError("passwords fetched for a readable PDF")
+
+
+def test_probe(pdf_bytes, locked_pdf, xref_stream_pdf):
+    assert not is_pdf_encrypted(BytesIO(pdf_bytes))
+    assert is_pdf_encrypted(str(locked_pdf))
+    assert is_pdf_encrypted(str(xref_stream_pdf))
+
+
+def test_probe_rewinds_buffers(pdf_bytes):
+    buffer = BytesIO(pdf_bytes)
+    is_pdf_encrypted(buffer)
+    assert buffer.tell() == 0
+
+
+def test_plain_and_owner_only_skip_password_lookup(pdf_bytes, owner_only_pdf):
+    buffer = BytesIO(pdf_bytes)
+    assert open_or_decrypt(buffer, get_passwords=_no_passwords) is buffer
+
+    path = str(owner_only_pdf)
+    assert open_or_decrypt(path, get_passwords=_no_passwords) == path
+
+
+def test_tries_candidates_in_order(locked_pdf):
+    with open_statement(file_path=str(locked_pdf)) as source:
+        assert isinstance(source, mmap.mmap)
+        decrypted = open_or_decrypt(source, get_passwords=lambda: ["wrong", "secret"])
+
+    assert isinstance(decrypted, BytesIO)
+    with pdfplumber.open(decrypted) as pdf:
+        assert len(pdf.pages) == 1
+
+
+def test_large_file_decrypted_in_memory(locked_pdf):
+    output = open_or_decrypt(str(locked_pdf), get_passwords=lambda: ["secret"])
+    assert isinstance(output, BytesIO)
+    assert not is_pdf_encrypted(output)
+    assert [p.name for p in locked_pdf.parent.iterdir()] == ["locked.pdf"]
+
+
+def test_password_check_only_for_password_errors(locked_pdf):
+    assert is_pdf_password_protected(str(locked_pdf))
+    assert not is_pdf_password_protected(BytesIO(b"not a pdf"))
+
+
+def test_no_candidate_matches(locked_pdf):
+    with pytest.raises(ValueError, match="Password not found"):
+        open_or_decrypt(str(locked_pdf), get_passwords=lambda: ["wrong"])
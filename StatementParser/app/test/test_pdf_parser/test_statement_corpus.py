@@ -0,0 +1,43 @@
+import pytest
+from app.benchmarks.bench_parse_statement import find_regressions
+from app.benchmarks.statement_corpus import LAYOUTS, build_corpus
+from app.pdf_normalizer.layout_templates import layout_store
+from app.pdf_normalizer.parser import (merge_page_ranges, page_ranges,
+                                       parse_page_range, parse_statement)
+
+
+@pytest.fixture(autouse=True)
+def isolated_templates(tmp_path, monkeypatch):
+    monkeypatch.setattr(layout_store, "directory", tmp_path / "templates")
+    monkeypatch.setattr(layout_store, "_templates", {})
+
+
+@pytest.mark.parametrize("bank_name", list(LAYOUTS))
+def test_corpus_parses_with_bank_parser(tmp_path, bank_name):
+    [(_, _, path)] = build_corpus(pages=(1,), banks=[bank_name], directory=tmp_path)
+
+    result = parse_statement(pdf_path=str(path))
+
+    assert len(result["transactions"]) == 27
+    assert result["account_details"]["number"]
+    assert all(t["amount"] and t["transaction_date"] for t in result["transactions"])
+
+
+@pytest.mark.parametrize("bank_name", list(LAYOUTS))
+def test_page_range_fan_out_matches_single_pass(tmp_path, bank_name):
+    [(_, _, path)] = build_corpus(pages=(3,), banks=[bank_name], directory=tmp_path)
+
+    chunks = [parse_page_range(str(path), bank_name, pages) for pages in page_ranges(3, 2)]
+
+    assert merge_page_ranges(bank_name, chunks) == parse_statement(str(path))["transactions"]
+
+
+def test_page_ranges():
+    assert page_ranges(5, 2) == [range(0, 2), range(2, 4), range(4, 5)]
+    assert page_ranges(0, 2) == []
+
+
+def test_find_regressions():
+    baseline = [{"bank": "sbi", "pages": 10, "pages_per_sec": 10.0}]
+    assert find_regressions([{"bank": "sbi", "pages": 10, "pages_per_sec": 8.5}], baseline, 0.2) == []
+    assert find_regressions([{"bank": "sbi", "pages": 10, "pages_per_sec": 7.0}], baseline, 0.2)
@@ -0,0 +1,71 @@
+import re
+
+import pytest
+from app.common.constants import PAYMENT_METHODS
+from app.pdf_normalizer.utils import (get_bank_from_email, is_date_like,
+                                      pack_transactions,
+                                      ss_transactions_template,
+                                      unpack_transactions)
+from app.pdf_normalizer.values_extract import (extract_entity_name,
+                                               extract_payment_method,
+                                               parse_amount)
+
+
+def _payment_method_by_loop(details: str):
+    """Reference behaviour: first PAYMENT_METHODS entry whose pattern matches."""
+    details = details.upper()
+    return next((m for m, p in PAYMENT_METHODS.items() if re.search(p, details)), None)
+
+
+@pytest.mark.parametrize("details", [
+    "UPI/DR/532462637529/NISHANT KANTI G/UBIN/Payment",
+    "NEFT-HDFCN520251115-ACME PAYROLL-SALARY",
+    "CHQ DEP 000123",
+    "ATW-512345XXXXXX1234-MUMBAI",
+    "POS 512345XXXXXX1234 AMAZON",
+    "POS ATW SAME ROW",
+    "XX VISA ATL",
+    "foo MB bar INB",
+    "CASH DEPOSIT SELF",
+    "INT.PD:31-12-2025",
+])
+def test_payment_method_matches_dict_order(details):
+    assert extract_payment_method(details) == _payment_method_by_loop(details)
+
+
+@pytest.mark.parametrize("details, expected", [
+    ("UPI/DR/532462637529/NISHANT KANTI G/UBIN/Payment", "532462637529"),
+    ("UPI/NISHANT KANTI G/276509066224/Payment", "NISHANT KANTI"),
+    ("upi/cr/1234/Swiggy/HDFC", "1234"),
+    ("NEFT-HDFCN520251115-ACME PAYROLL-SALARY", "ACME PAYROLL"),
+    ("IMPS-532412345678-RAMESH KUMAR-SBIN", "RAMESH KUMAR"),
+    ("NACH/TPSL/ICICI PRU LIFE", "ICICI PRU LIFE"),
+    ("CASH DEPOSIT", None),
+])
+def test_extract_entity_name(details, expected):
+    assert extract_entity_name(details) == expected
+
+
+def test_parse_amount():
+    assert parse_amount("+20,000.00") == "20000.00"
+    assert parse_amount("1,23,456.78 (Dr)") == "123456.78"
+    assert parse_amount("") is None
+
+
+def test_is_date_like_and_bank_from_email():
+    assert is_date_like(" 01-11-25 ")
+    assert not is_date_like("14 Dec 2025")
+    assert get_bank_from_email("noreply@UnionBankOfIndia.bank.in") == "union"
+    assert get_bank_from_email("someone@example.com") is None
+
+
+def test_pack_transactions_roundtrip():
+    transactions = [
+        {**ss_transactions_template(), "amount": "10.00", "type": "debit", "reference_id": "S1"},
+        {**ss_transactions_template(), "amount": "20.00", "type": "credit", "description": "UPI/CR/1"},
+    ]
+
+    packed = pack_transactions(transactions)
+
+    assert packed["fields"] == ["type", "amount", "reference_id", "description"]
+    assert unpack_transactions(packed) == transactions
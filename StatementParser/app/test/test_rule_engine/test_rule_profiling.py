@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+from app.rule_engine.evaluator import TransactionCategorizer
+from app.rule_engine.parser import parse_rules
+
+DSL = '''
+rule "Swiggy" where entity_name:con:"SWIGGY":i assign category_id:3 priority 10;
+rule "Food" where entity_name:con:"SWIGGY":i assign category_id:4 tag_id:7 priority 20;
+rule "Never" where amount:gt:"1000000" assign category_id:9 priority 30;
+'''
+
+TRANSACTIONS = [
+    {"entity_name": "SWIGGY BLR", "amount": Decimal("450.00")},
+    {"entity_name": "AMAZON", "amount": Decimal("1200.00")},
+    {"entity_name": "swiggy instamart", "amount": Decimal("300.00")},
+]
+
+
+def rules_with_ids():
+    rules = parse_rules(DSL)
+    for rule_id, rule in enumerate(rules, start=101):
+        rule.rule_id = rule_id
+    return rules
+
+
+def test_profile_counts_evaluations_matches_and_assignments():
+    categorizer = TransactionCategorizer(rules_with_ids(), profile=True)
+    categorizer.categorize_batch(TRANSACTIONS)
+
+    swiggy, food, never = (categorizer.stats[i] for i in (101, 102, 103))
+    assert [s.evaluations for s in (swiggy, food, never)] == [3, 3, 3]
+    assert [s.matches for s in (swiggy, food, never)] == [2, 2, 0]
+    # category_id was already taken by the higher priority rule
+    assert swiggy.assigned == {"category_id": 2}
+    assert food.assigned == {"tag_id": 2}
+    assert not never.assigned
+    assert all(s.seconds > 0 for s in (swiggy, food, never))
+
+
+def test_profile_does_not_change_results():
+    plain = TransactionCategorizer(rules_with_ids()).categorize_batch(TRANSACTIONS)
+    profiled = TransactionCategorizer(rules_with_ids(), profile=True).categorize_batch(TRANSACTIONS)
+    assert profiled == plain
+
+
+def test_stats_keyed_by_name_without_ids():
+    categorizer = TransactionCategorizer(parse_rules(DSL), profile=True)
+    categorizer.categorize(TRANSACTIONS[0])
+    assert set(categorizer.stats) == {"Swiggy", "Food", "Never"}
+
+
+def test_no_stats_unless_enabled():
+    categorizer = TransactionCategorizer(rules_with_ids())
+    categorizer.categorize_batch(TRANSACTIONS)
+    assert categorizer.stats == {}
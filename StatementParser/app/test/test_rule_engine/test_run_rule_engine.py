@@ -0,0 +1,82 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from app.tasks import rule_engine_task
+from app.tasks.rule_engine_task import NO_TRANSACTIONS, run_rule_engine, run_rule_engine_async
+
+TRANSACTIONS = [
+    {"id": 1, "entity_name": "SWIGGY BLR", "amount": Decimal("450.00"), "category_id": None},
+    {"id": 2, "entity_name": "AMAZON", "amount": Decimal("1200.00"), "category_id": None},
+]
+RULES = [{"id": 7, "dsl_text": 'rule "Food" where entity_name:con:"SWIGGY":i assign category_id:3 priority 10;'}]
+
+
+class FakeCursor:
+    """Answers the user, transactions and rules queries in order."""
+
+    def __init__(self, transactions=TRANSACTIONS, user_found=True):
+        self.transactions = transactions
+        self.user_found = user_found
+        self.executed = []
+
+    def execute(self, sql, params=None, prepare=None):
+        self.executed.append(sql)
+
+    def fetchone(self):
+        return {"id": 1} if self.user_found else None
+
+    def fetchall(self):
+        if "ss_categorization_rules" in self.executed[-1]:
+            return RULES
+        return [dict(t) for t in self.transactions]
+
+
+class FakeAsyncCursor(FakeCursor):
+    async def execute(self, sql, params=None, prepare=None):
+        super().execute(sql, params, prepare)
+
+    async def fetchone(self):
+        return super().fetchone()
+
+    async def fetchall(self):
+        return super().fetchall()
+
+
+@pytest.fixture
+def upserted(monkeypatch):
+    rows = []
+
+    def bulk_insert(transactions, cur):
+        rows.extend(transactions)
+        return {"inserted": len(transactions), "failed": 0, "errors": []}
+
+    async def bulk_insert_async(transactions, cur):
+        return bulk_insert(transactions, cur)
+
+    monkeypatch.setattr(rule_engine_task, "get_active_user_id", lambda email, cur=None: 1 if cur.user_found else None)
+    monkeypatch.setattr(rule_engine_task, "bulk_insert_transactions", bulk_insert)
+    monkeypatch.setattr(rule_engine_task, "bulk_insert_transactions_async", bulk_insert_async)
+    return rows
+
+
+def test_sync_and_async_runs_agree(upserted):
+    sync_result = run_rule_engine("a@b.com", cur=FakeCursor())
+    async_result = asyncio.run(run_rule_engine_async("a@b.com", cur=FakeAsyncCursor()))
+
+    assert sync_result == async_result
+    assert sync_result["count"] == 2 and sync_result["stats"]["inserted"] == 2
+    assert [r["category_id"] for r in upserted] == [3, None, 3, None]
+
+
+def test_no_transactions(upserted):
+    assert run_rule_engine("a@b.com", cur=FakeCursor(transactions=[])) == NO_TRANSACTIONS
+    assert asyncio.run(run_rule_engine_async("a@b.com", cur=FakeAsyncCursor(transactions=[]))) == NO_TRANSACTIONS
+    assert upserted == []
+
+
+def test_unknown_user(upserted):
+    with pytest.raises(ValueError):
+        run_rule_engine("nobody@b.com", cur=FakeCursor(user_found=False))
+    with pytest.raises(ValueError):
+        asyncio.run(run_rule_engine_async("nobody@b.com", cur=FakeAsyncCursor(user_found=False)))
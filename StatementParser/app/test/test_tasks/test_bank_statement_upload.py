@@ -0,0 +1,70 @@
+import json
+from contextlib import nullcontext
+
+import pytest
+from app.benchmarks.statement_corpus import build_corpus
+from app.common.enums import BankName
+from app.core import celery_signal
+from app.core.task_payloads import load_object
+from app.pdf_normalizer.layout_templates import layout_store
+from app.pdf_normalizer.utils import unpack_transactions
+from app.tasks import bank_statement_upload as upload
+
+# What result_extended may keep per task: args and result, never the rows
+STORED_LIMIT_BYTES = 1024
+
+
+@pytest.fixture
+def stubbed(monkeypatch, tmp_path, staged_payloads):
+    monkeypatch.setattr(layout_store, "directory", tmp_path / "templates")
+    monkeypatch.setattr(layout_store, "_templates", {})
+    monkeypatch.setattr(celery_signal, "profiling_mode", lambda name: None)
+    monkeypatch.setattr(upload, "publish_progress", lambda *args, **kwargs: {})
+    monkeypatch.setattr(upload, "get_active_user_id", lambda email: 1)
+    monkeypatch.setattr(upload, "get_or_create_bank_account", lambda **kwargs: ({"id": 3}, True))
+    monkeypatch.setattr(upload, "get_active_rules", lambda user_id: [])
+    monkeypatch.setattr(upload, "get_cursor", nullcontext)
+    monkeypatch.setattr(
+        upload,
+        "bulk_insert_transactions",
+        lambda transactions, cur: {"inserted": len(transactions), "failed": 0, "errors": []},
+    )
+    monkeypatch.setattr(upload, "schedule_dashboard_warmup", lambda *args, **kwargs: None)
+    return staged_payloads
+
+
+@pytest.fixture
+def statement(tmp_path):
+    [(_, _, path)] = build_corpus(pages=(2,), banks=[BankName.SBI], directory=tmp_path)
+    return str(path)
+
+
+def test_store_args_carry_a_key_not_the_rows(stubbed, statement, monkeypatch):
+    captured = []
+    monkeypatch.setattr(upload, "store_bank_transactions", captured.append)
+
+    upload.process_bank_pdf(
+        filename="sbi.pdf", file_path=statement, from_email="noreply@sbi.co.in", to_email="user@example.com"
+    )
+
+    [payload] = captured
+    assert "transactions" not in payload
+    assert len(json.dumps(payload, default=str)) < STORED_LIMIT_BYTES
+    assert len(unpack_transactions(load_object(payload["transactions_key"]))) > 27
+
+
+def test_compact_result_and_staged_rows_dropped(stubbed, statement, monkeypatch):
+    store = upload.store_bank_transactions
+    captured = []
+    monkeypatch.setattr(upload, "store_bank_transactions", captured.append)
+    upload.process_bank_pdf(
+        filename="sbi.pdf", file_path=statement, from_email="noreply@sbi.co.in", to_email="user@example.com"
+    )
+    [payload] = captured
+
+    result = store.run(payload)
+
+    assert set(result) == {"filename", "count", "inserted", "failed", "bank_account_id", "errors", "rows"}
+    assert result["inserted"] == result["count"] > 27
+    assert len(json.dumps(result, default=str)) < STORED_LIMIT_BYTES
+    assert payload["transactions_key"] not in stubbed.data
@@ -28,6 +28,26 @@ try:
 except ImportError:
     USE_FULL_PARSER = False
 
+# Shared cache needs the app settings (.env); without them run uncached
+try:
+    from app.core.cache import cached
+    from app.core.rule_stats import get_rule_stats, reset_rule_stats
+    from app.model_actions.rules import invalidate_rules
+except Exception:
+    def cached(ttl, key, **kwargs):
+        return lambda func: func
+
+    def invalidate_rules(user_id: int) -> None:
+        pass
+
+    def get_rule_stats(user_id: int) -> dict:
+        return {}
+
+    def reset_rule_stats(user_id: int, rule_id: Optional[int] = None) -> None:
+        pass
+
+LOOKUP_TTL = 10 * 60
+
 
 # =============================================================================
 # DSL VALIDATOR
@@ -108,51 +128,86 @@ def save_rule(rule: Rule) -> int:
     with get_connection() as conn:
         with conn.cursor() as cur:
             if rule.id:
-                cur.execute("UPDATE ss_categorization_rules SET name = %s, dsl_text = %s, priority = %s, is_active = %s WHERE id = %s RETURNING id",
+                cur.execute("UPDATE ss_categorization_rules SET name = %s, dsl_text = %s, priority = %s, is_active = %s WHERE id = %s RETURNING id, user_id",
                            (rule.name, rule.dsl_text, rule.priority, rule.is_active, rule.id))
             else:
-                cur.execute("INSERT INTO ss_categorization_rules (name, dsl_text, priority, user_id, is_active) VALUES (%s, %s, %s, %s, %s) RETURNING id",
+                cur.execute("INSERT INTO ss_categorization_rules (name, dsl_text, priority, user_id, is_active) VALUES (%s, %s, %s, %s, %s) RETURNING id, user_id",
                            (rule.name, rule.dsl_text, rule.priority, rule.user_id, rule.is_active))
             conn.commit()
-            return cur.fetchone()['id']
+            row = cur.fetchone()
+    invalidate_rules(row['user_id'])
+    if rule.id:
+        # Stats describe the old DSL
+        reset_rule_stats(row['user_id'], rule.id)
+    return row['id']
 
 
 def delete_rule(rule_id: int) -> bool:
     with get_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute("DELETE FROM ss_categorization_rules WHERE id = %s", (rule_id,))
+            cur.execute("DELETE FROM ss_categorization_rules WHERE id = %s RETURNING user_id", (rule_id,))
             conn.commit()
-            return cur.rowcount > 0
+            row = cur.fetchone()
+    if row:
+        invalidate_rules(row['user_id'])
+    return row is not None
 
 
 def toggle_rule_active(rule_id: int, is_active: bool) -> bool:
     with get_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute("UPDATE ss_categorization_rules SET is_active = %s WHERE id = %s", (is_active, rule_id))
+            cur.execute("UPDATE ss_categorization_rules SET is_active = %s WHERE id = %s RETURNING user_id", (is_active, rule_id))
             conn.commit()
-            return cur.rowcount > 0
+            row = cur.fetchone()
+    if row:
+        invalidate_rules(row['user_id'])
+    return row is not None
+
+
+LOOKUP_QUERIES = {
+    "categories": "SELECT id, name, type, color FROM ss_categories WHERE is_active = TRUE ORDER BY name",
+    "tags": "SELECT id, name, color FROM ss_tags WHERE is_active = TRUE ORDER BY name",
+    "payment_methods": "SELECT id, type, name, color FROM ss_payment_methods WHERE is_active = TRUE ORDER BY type, name",
+    "transaction_types": "SELECT id, name, color FROM ss_transaction_types WHERE is_active = TRUE ORDER BY name",
+    "goals": "SELECT id, name, target_amount, status, color FROM ss_goals WHERE status = 'ACTIVE' ORDER BY name",
+    "users": "SELECT id, name, email FROM ss_users WHERE is_active = TRUE ORDER BY name",
+}
+
+
+@cached(ttl=LOOKUP_TTL, key="lookup:{name}")
+def _load_lookup(name: str) -> list[dict]:
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(LOOKUP_QUERIES[name])
+            return cur.fetchall()
 
 
-def fetch_lookup(query: str) -> list[dict]:
+def fetch_lookup(name: str) -> list[dict]:
+    # Failures aren't cached, the next render retries
     try:
-        with get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query)
-                return cur.fetchall()
+        return _load_lookup(name)
     except:
         return []
 
 
-def fetch_categories(): return fetch_lookup("SELECT id, name, type, color FROM ss_categories WHERE is_active = TRUE ORDER BY name")
-def fetch_tags(): return fetch_lookup("SELECT id, name, color FROM ss_tags WHERE is_active = TRUE ORDER BY name")
-def fetch_payment_methods(): return fetch_lookup("SELECT id, type, name, color FROM ss_payment_methods WHERE is_active = TRUE ORDER BY type, name")
-def fetch_transaction_types(): return fetch_lookup("SELECT id, name, color FROM ss_transaction_types WHERE is_active = TRUE ORDER BY name")
-def fetch_goals(): return fetch_lookup("SELECT id, name, target_amount, status, color FROM ss_goals WHERE status = 'ACTIVE' ORDER BY name")
+def fetch_categories(): return fetch_lookup("categories")
+def fetch_tags(): return fetch_lookup("tags")
+def fetch_payment_methods(): return fetch_lookup("payment_methods")
+def fetch_transaction_types(): return fetch_lookup("transaction_types")
+def fetch_goals(): return fetch_lookup("goals")
 def fetch_users():
-    users = fetch_lookup("SELECT id, name, email FROM ss_users WHERE is_active = TRUE ORDER BY name")
+    users = fetch_lookup("users")
     return users if users else [{'id': 1, 'name': 'Default', 'email': ''}]
 
 
+def fetch_rule_stats(user_id: int) -> dict:
+    # Profiling is optional, a missing Redis just hides the stats
+    try:
+        return get_rule_stats(user_id)
+    except:
+        return {}
+
+
 # =============================================================================
 # DSL HELP
 # =============================================================================
@@ -234,6 +289,7 @@ class RulesApp:
     def __init__(self):
         self.current_user_id = 1
         self.rules = []
+        self.rule_stats = {}
         self.categories = []
         self.tags = []
         self.payment_methods = []
@@ -255,6 +311,7 @@ class RulesApp:
     def load_data(self):
         try:
             self.rules = fetch_rules(self.current_user_id)
+            self.rule_stats = fetch_rule_stats(self.current_user_id)
             self.categories = fetch_categories()
             self.tags = fetch_tags()
             self.payment_methods = fetch_payment_methods()
@@ -400,6 +457,8 @@ class RulesApp:
                             if assigns.get('goal_id'):
                                 ui.chip(f"🎯 {self.get_name(self.goals, assigns.get('goal_id'))}", color='teal').props('dense outline')
 
+                        self.render_rule_stats(rule)
+
                     with ui.row().classes('gap-1'):
                         ui.button(icon='edit', on_click=lambda r=rule: self.edit_rule(r['id'])).props('flat dense color=primary').tooltip('Edit')
                         ui.button(icon='content_copy', on_click=lambda r=rule: self.duplicate_rule(r)).props('flat dense color=secondary').tooltip('Duplicate')
@@ -407,6 +466,29 @@ class RulesApp:
                         ui.button(icon='delete', on_click=lambda r=rule: self.delete_rule_handler(r['id'], r['name'])).props('flat dense color=negative').tooltip('Delete')
                         ui.switch('', value=rule['is_active'], on_change=lambda e, r=rule: self.toggle_active(r['id'], e.value)).tooltip('Active')
 
+    def render_rule_stats(self, rule: dict):
+        """Profiling counters of the rule, when any run recorded them."""
+        stats = self.rule_stats.get(str(rule['id']))
+        if not stats or not stats['evaluations']:
+            return
+
+        with ui.row().classes('gap-2 items-center mt-1 text-xs text-gray-600'):
+            if stats['matches'] == 0:
+                ui.badge('Never matched', color='red').tooltip('Candidate for removal')
+            ui.label(f"{stats['matches']:,}/{stats['evaluations']:,} matched ({stats['match_ratio']:.1%})")
+            ui.label(f"⏱ {stats['total_ms']:,.1f} ms total, {stats['avg_us']:,.1f} µs avg")
+            if stats['assigned']:
+                assigned = ", ".join(f"{field} ×{count:,}" for field, count in sorted(stats['assigned'].items()))
+                ui.label(f"assigned {assigned}")
+            elif stats['matches']:
+                ui.label("assigned nothing (fields already set)").classes('text-orange-600')
+            ui.button(icon='restart_alt', on_click=lambda r=rule: self.reset_stats(r['id'])).props('flat dense size=sm color=grey').tooltip('Reset stats')
+
+    def reset_stats(self, rule_id: int):
+        reset_rule_stats(self.current_user_id, rule_id)
+        self.rule_stats.pop(str(rule_id), None)
+        self.refresh_rules_list()
+
     def toggle_active(self, rule_id: int, is_active: bool):
         toggle_rule_active(rule_id, is_active)
         ui.notify(f"Rule {'activated' if is_active else 'deactivated'}")
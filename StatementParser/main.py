@@ -1,10 +1,22 @@
 
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.api.v1.routes import v1_router
+from app.core.database import close_async_pool, close_pool, get_async_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in each worker process after fork; the sync pool opens lazily on first use
+    await get_async_pool()
+    yield
+    await close_async_pool()
+    close_pool()
 
 
-app = FastAPI(title="Statement Parse")
+app = FastAPI(title="Statement Parse", lifespan=lifespan)
 
 app.include_router(router=v1_router)
 
@@ -110,8 +110,11 @@ CREATE TABLE ss_goals (
 );
 
 -- 6. Transactions (Main Table)
+-- Range partitioned by month on transaction_date (7_partition_schema.sql). Unique keys must contain the partition key, so transaction_date is
+-- part of the primary key and of uq_transaction_reference: a reference and amount already stored under another date (e.g. a statement
+-- re-parsed with a corrected date) is a new row, not an update.
 CREATE TABLE ss_transactions (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     entity_name VARCHAR(200),
     transaction_date TIMESTAMPTZ NOT NULL,
     user_id INTEGER NOT NULL REFERENCES ss_users(id) ON DELETE CASCADE,
@@ -131,9 +134,11 @@ CREATE TABLE ss_transactions (
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW(),
 
+    PRIMARY KEY (id, transaction_date),
+
     -- Prevents double-entry for same API/Bank reference
-    CONSTRAINT uq_transaction_reference UNIQUE NULLS NOT DISTINCT (user_id, amount, bank_account_id, reference_id)
-);
+    CONSTRAINT uq_transaction_reference UNIQUE NULLS NOT DISTINCT (user_id, amount, bank_account_id, reference_id, transaction_date)
+) PARTITION BY RANGE (transaction_date);
 
 ---### Optimized Indexing Strategy
 
@@ -159,3 +164,10 @@ WHERE reference_id IS NULL;
 
 -- Search performance for entity names
 CREATE INDEX idx_ss_txn_entity_name ON ss_transactions USING gin (entity_name gin_trgm_ops);
+
+
+---### Monthly Partitions
+
+-- Rows without a monthly partition land here until
+-- ss_ensure_transaction_partitions (7_partition_schema.sql) moves them out
+CREATE TABLE ss_transactions_default PARTITION OF ss_transactions DEFAULT;
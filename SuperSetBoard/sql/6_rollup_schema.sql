@@ -0,0 +1,98 @@
+BEGIN;
+
+-- ============================================
+-- Monthly transaction rollup
+-- ============================================
+-- One row per (user, month, bank account, type, category, tag) over active
+-- transactions. The summary views read this instead of ss_transactions.
+-- Kept current by the StatementParser after every bulk upsert and rebuilt
+-- nightly by the refresh_rollups beat task.
+CREATE TABLE IF NOT EXISTS ss_txn_monthly_rollup (
+    user_id INTEGER NOT NULL REFERENCES ss_users(id) ON DELETE CASCADE,
+    month DATE NOT NULL,
+    bank_account_id INTEGER NOT NULL REFERENCES ss_bank_accounts(id) ON DELETE CASCADE,
+    type_id INTEGER NOT NULL REFERENCES ss_transaction_types(id) ON DELETE CASCADE,
+    category_id INTEGER REFERENCES ss_categories(id) ON DELETE SET NULL,
+    tag_id INTEGER REFERENCES ss_tags(id) ON DELETE SET NULL,
+
+    transaction_count INTEGER NOT NULL,
+    total_amount DECIMAL(18, 2) NOT NULL,
+    last_transaction_date TIMESTAMPTZ NOT NULL,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT uq_txn_monthly_rollup
+        UNIQUE NULLS NOT DISTINCT (user_id, month, bank_account_id, type_id, category_id, tag_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rollup_category ON ss_txn_monthly_rollup (category_id);
+CREATE INDEX IF NOT EXISTS idx_rollup_tag ON ss_txn_monthly_rollup (tag_id);
+CREATE INDEX IF NOT EXISTS idx_rollup_bank_acc ON ss_txn_monthly_rollup (bank_account_id);
+
+
+-- Rebuild every month of one user touched by [p_from, p_to].
+-- Months are truncated in the session time zone, same as the views.
+-- Delete + re-aggregate instead of applying deltas, so upserts that move a
+-- row to another category or deactivate it are counted correctly.
+CREATE OR REPLACE FUNCTION ss_refresh_monthly_rollup(
+    p_user_id INTEGER,
+    p_from TIMESTAMPTZ DEFAULT NULL,
+    p_to TIMESTAMPTZ DEFAULT NULL
+) RETURNS INTEGER AS $$
+DECLARE
+    v_from TIMESTAMPTZ := DATE_TRUNC('month', p_from);
+    v_to TIMESTAMPTZ := DATE_TRUNC('month', p_to) + INTERVAL '1 month';
+    v_rows INTEGER;
+BEGIN
+    -- Serialize refreshes of the same user (upload and rule engine workers)
+    PERFORM pg_advisory_xact_lock(hashtext('ss_txn_monthly_rollup'), p_user_id);
+
+    DELETE FROM ss_txn_monthly_rollup
+    WHERE user_id = p_user_id
+      AND (v_from IS NULL OR month >= v_from::DATE)
+      AND (v_to IS NULL OR month < v_to::DATE);
+
+    INSERT INTO ss_txn_monthly_rollup (
+        user_id, month, bank_account_id, type_id, category_id, tag_id,
+        transaction_count, total_amount, last_transaction_date
+    )
+    SELECT
+        t.user_id,
+        DATE_TRUNC('month', t.transaction_date)::DATE,
+        t.bank_account_id,
+        t.type_id,
+        t.category_id,
+        t.tag_id,
+        COUNT(*),
+        SUM(t.amount),
+        MAX(t.transaction_date)
+    FROM ss_transactions t
+    -- COALESCE rather than "v_from IS NULL OR": the generic plan plpgsql
+    -- settles on still prunes ss_transactions partitions with it
+    WHERE t.user_id = p_user_id
+      AND t.is_active = TRUE
+      AND t.transaction_date >= COALESCE(v_from, '-infinity')
+      AND t.transaction_date < COALESCE(v_to, 'infinity')
+    GROUP BY 1, 2, 3, 4, 5, 6;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Full rebuild for every user (nightly reconcile)
+CREATE OR REPLACE FUNCTION ss_refresh_monthly_rollup_all() RETURNS INTEGER AS $$
+DECLARE
+    v_user_id INTEGER;
+    v_rows INTEGER := 0;
+BEGIN
+    FOR v_user_id IN SELECT id FROM ss_users LOOP
+        v_rows := v_rows + ss_refresh_monthly_rollup(v_user_id);
+    END LOOP;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ss_refresh_monthly_rollup_all();
+
+COMMIT;
@@ -0,0 +1,70 @@
+BEGIN;
+
+-- ============================================
+-- Monthly partitions of ss_transactions
+-- ============================================
+-- Kept ahead of time by the ensure_partitions beat task of the StatementParser.
+
+-- Create the partition of the month containing p_month (ss_transactions_yYYYYmMM).
+-- Rows of that month already in the default partition are moved into it.
+CREATE OR REPLACE FUNCTION ss_create_transaction_partition(p_month DATE)
+RETURNS BOOLEAN AS $$
+DECLARE
+    v_from TIMESTAMPTZ := DATE_TRUNC('month', p_month);
+    v_to TIMESTAMPTZ := DATE_TRUNC('month', p_month) + INTERVAL '1 month';
+    v_name TEXT := 'ss_transactions_' || TO_CHAR(p_month, '"y"YYYY"m"MM');
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    CREATE TEMP TABLE ss_partition_moved (LIKE ss_transactions) ON COMMIT DROP;
+    WITH moved AS (
+        DELETE FROM ss_transactions_default
+        WHERE transaction_date >= v_from AND transaction_date < v_to
+        RETURNING *
+    )
+    INSERT INTO ss_partition_moved SELECT * FROM moved;
+
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF ss_transactions FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_from, v_to
+    );
+
+    INSERT INTO ss_transactions SELECT * FROM ss_partition_moved;
+    DROP TABLE ss_partition_moved;
+
+    RAISE NOTICE 'Created partition: %', v_name;
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Partitions for the next p_months_ahead months and for every month that
+-- has rows in the default partition. Returns partitions created.
+CREATE OR REPLACE FUNCTION ss_ensure_transaction_partitions(p_months_ahead INTEGER DEFAULT 3)
+RETURNS INTEGER AS $$
+DECLARE
+    v_month DATE;
+    v_created INTEGER := 0;
+BEGIN
+    FOR v_month IN
+        SELECT GENERATE_SERIES(
+            DATE_TRUNC('month', CURRENT_DATE),
+            DATE_TRUNC('month', CURRENT_DATE) + MAKE_INTERVAL(months => p_months_ahead),
+            INTERVAL '1 month'
+        )::DATE
+        UNION
+        SELECT DISTINCT DATE_TRUNC('month', transaction_date)::DATE FROM ss_transactions_default
+        ORDER BY 1
+    LOOP
+        IF ss_create_transaction_partition(v_month) THEN
+            v_created := v_created + 1;
+        END IF;
+    END LOOP;
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ss_ensure_transaction_partitions();
+
+COMMIT;
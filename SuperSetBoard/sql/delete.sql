@@ -16,6 +16,15 @@ DROP VIEW IF EXISTS ss_v_groups CASCADE;
 DROP VIEW IF EXISTS ss_v_goals CASCADE;
 DROP VIEW IF EXISTS ss_v_transactions CASCADE;
 
+-- Rollup (6_rollup_schema.sql)
+DROP FUNCTION IF EXISTS ss_refresh_monthly_rollup_all();
+DROP FUNCTION IF EXISTS ss_refresh_monthly_rollup(INTEGER, TIMESTAMPTZ, TIMESTAMPTZ);
+DROP TABLE IF EXISTS ss_txn_monthly_rollup CASCADE;
+
+-- Partition helpers (7_partition_schema.sql), partitions go with ss_transactions
+DROP FUNCTION IF EXISTS ss_ensure_transaction_partitions(INTEGER);
+DROP FUNCTION IF EXISTS ss_create_transaction_partition(DATE);
+
 -- Drop junction tables first (they have foreign keys)
 
 DROP TABLE IF EXISTS ss_group_members CASCADE;
@@ -36,7 +45,7 @@ DROP TABLE IF EXISTS ss_bank_accounts CASCADE;
 COMMIT;
 
 -- Only for tx
-TRUNCATE TABLE ss_transactions, ss_transaction_tags;
+TRUNCATE TABLE ss_transactions, ss_transaction_tags, ss_txn_monthly_rollup;
 
 --- Goals
 DROP VIEW IF EXISTS ss_v_goals CASCADE;
@@ -0,0 +1,70 @@
+-- ============================================
+-- Convert an existing ss_transactions heap into the partitioned table
+-- ============================================
+-- Fresh installs get the partitioned table from 1_schema.sql; this is for
+-- databases created before it. Run once, then:
+--   7_partition_schema.sql  (moves the copied rows into monthly partitions)
+--   views.sql               (the views are dropped with the old table)
+--   6_rollup_schema.sql     (refresh function that prunes partitions)
+--
+-- ids are kept and the id sequence is carried over. uq_transaction_reference
+-- gains transaction_date, see 1_schema.sql.
+
+BEGIN;
+
+ALTER TABLE ss_transactions RENAME TO ss_transactions_unpartitioned;
+
+-- Free the constraint and index names for the new table
+ALTER TABLE ss_transactions_unpartitioned DROP CONSTRAINT uq_transaction_reference;
+ALTER TABLE ss_transactions_unpartitioned DROP CONSTRAINT ss_transactions_pkey;
+DROP INDEX IF EXISTS idx_ss_txn_user_date_desc;
+DROP INDEX IF EXISTS idx_ss_txn_reporting;
+DROP INDEX IF EXISTS idx_ss_txn_bank_acc;
+DROP INDEX IF EXISTS idx_ss_txn_goal_id;
+DROP INDEX IF EXISTS uq_manual_txn_prevent_dupes;
+DROP INDEX IF EXISTS idx_ss_txn_entity_name;
+
+-- Same columns, defaults (id sequence included) and checks
+CREATE TABLE ss_transactions (
+    LIKE ss_transactions_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+
+    PRIMARY KEY (id, transaction_date),
+    CONSTRAINT uq_transaction_reference UNIQUE NULLS NOT DISTINCT (user_id, amount, bank_account_id, reference_id, transaction_date)
+) PARTITION BY RANGE (transaction_date);
+
+ALTER SEQUENCE ss_transactions_id_seq OWNED BY ss_transactions.id;
+
+-- LIKE does not copy foreign keys
+ALTER TABLE ss_transactions
+    ADD FOREIGN KEY (user_id) REFERENCES ss_users(id) ON DELETE CASCADE,
+    ADD FOREIGN KEY (bank_account_id) REFERENCES ss_bank_accounts(id) ON DELETE RESTRICT,
+    ADD FOREIGN KEY (type_id) REFERENCES ss_transaction_types(id) ON DELETE RESTRICT,
+    ADD FOREIGN KEY (category_id) REFERENCES ss_categories(id) ON DELETE SET NULL,
+    ADD FOREIGN KEY (tag_id) REFERENCES ss_tags(id) ON DELETE SET NULL,
+    ADD FOREIGN KEY (goal_id) REFERENCES ss_goals(id) ON DELETE SET NULL,
+    ADD FOREIGN KEY (payment_method_id) REFERENCES ss_payment_methods(id) ON DELETE SET NULL;
+
+-- Indexes as in 1_schema.sql
+CREATE INDEX idx_ss_txn_user_date_desc
+ON ss_transactions (user_id, transaction_date DESC)
+WHERE is_active = TRUE;
+
+CREATE INDEX idx_ss_txn_reporting
+ON ss_transactions (user_id, category_id, transaction_date);
+
+CREATE INDEX idx_ss_txn_bank_acc ON ss_transactions(bank_account_id);
+CREATE INDEX idx_ss_txn_goal_id ON ss_transactions(goal_id) WHERE goal_id IS NOT NULL;
+
+CREATE UNIQUE INDEX uq_manual_txn_prevent_dupes
+ON ss_transactions (user_id, transaction_date, amount, entity_name, description)
+WHERE reference_id IS NULL;
+
+CREATE INDEX idx_ss_txn_entity_name ON ss_transactions USING gin (entity_name gin_trgm_ops);
+
+CREATE TABLE ss_transactions_default PARTITION OF ss_transactions DEFAULT;
+
+INSERT INTO ss_transactions SELECT * FROM ss_transactions_unpartitioned;
+
+DROP TABLE ss_transactions_unpartitioned CASCADE;
+
+COMMIT;
@@ -151,23 +151,23 @@ GROUP BY u.id;
 -- ============================================
 -- VIEW 5: Monthly Summary (The Breakdown)
 -- ============================================
+-- Views 5-8 read the pre-aggregated ss_txn_monthly_rollup (6_rollup_schema.sql)
 CREATE OR REPLACE VIEW ss_v_monthly_summary AS
 SELECT
-    DATE_TRUNC('month', t.transaction_date)::DATE AS month,
-    t.user_id,
+    r.month,
+    r.user_id,
     u.name AS user_name,
     c.name AS category_name,
     tt.name AS type_name,
-    SUM(t.amount) AS total_amount,
-    COUNT(*) AS transaction_count
-FROM ss_transactions t
-JOIN ss_users u ON t.user_id = u.id
-LEFT JOIN ss_categories c ON t.category_id = c.id
-LEFT JOIN ss_transaction_types tt ON t.type_id = tt.id
-WHERE t.is_active = TRUE
+    SUM(r.total_amount) AS total_amount,
+    SUM(r.transaction_count) AS transaction_count
+FROM ss_txn_monthly_rollup r
+JOIN ss_users u ON r.user_id = u.id
+LEFT JOIN ss_categories c ON r.category_id = c.id
+LEFT JOIN ss_transaction_types tt ON r.type_id = tt.id
 GROUP BY
-    DATE_TRUNC('month', t.transaction_date),
-    t.user_id,
+    r.month,
+    r.user_id,
     u.name,
     c.name,
     tt.name;
@@ -181,11 +181,11 @@ SELECT
     c.id,
     c.name,
     c.type AS category_type,
-    COUNT(t.id) AS usage_count,
-    COALESCE(SUM(t.amount), 0) AS total_amount,
-    MAX(t.transaction_date) AS last_used
+    COALESCE(SUM(r.transaction_count), 0) AS usage_count,
+    COALESCE(SUM(r.total_amount), 0) AS total_amount,
+    MAX(r.last_transaction_date) AS last_used
 FROM ss_categories c
-LEFT JOIN ss_transactions t ON c.id = t.category_id AND t.is_active = TRUE
+LEFT JOIN ss_txn_monthly_rollup r ON c.id = r.category_id
 WHERE c.is_active = TRUE
 GROUP BY c.id;
 
@@ -199,12 +199,12 @@ SELECT
     ba.number,
     ba.type,
     u.name AS owner_name,
-    COUNT(t.id) AS txn_count,
-    COALESCE(SUM(CASE WHEN tt.name ILIKE 'Credit%' THEN t.amount ELSE -t.amount END), 0) AS current_ledger_balance
+    COALESCE(SUM(r.transaction_count), 0) AS txn_count,
+    COALESCE(SUM(CASE WHEN tt.name ILIKE 'Credit%' THEN r.total_amount ELSE -r.total_amount END), 0) AS current_ledger_balance
 FROM ss_bank_accounts ba
 JOIN ss_users u ON ba.user_id = u.id
-LEFT JOIN ss_transactions t ON ba.id = t.bank_account_id AND t.is_active = TRUE
-LEFT JOIN ss_transaction_types tt ON t.type_id = tt.id
+LEFT JOIN ss_txn_monthly_rollup r ON ba.id = r.bank_account_id
+LEFT JOIN ss_transaction_types tt ON r.type_id = tt.id
 GROUP BY ba.id, u.name;
 
 
@@ -215,10 +215,10 @@ CREATE OR REPLACE VIEW ss_v_tag_summary AS
 SELECT
     tg.id,
     tg.name,
-    COUNT(t.id) AS usage_count,
-    SUM(t.amount) AS total_volume
+    COALESCE(SUM(r.transaction_count), 0) AS usage_count,
+    SUM(r.total_amount) AS total_volume
 FROM ss_tags tg
-LEFT JOIN ss_transactions t ON tg.id = t.tag_id AND t.is_active = TRUE
+LEFT JOIN ss_txn_monthly_rollup r ON tg.id = r.tag_id
 GROUP BY tg.id;
 
 
@@ -1,6 +1,8 @@
 import os
 from urllib.parse import quote_plus
 
+import redis
+
 # ============================================
 # SECRET KEY
 # ============================================
@@ -45,7 +47,44 @@ CACHE_CONFIG = {
     "CACHE_KEY_PREFIX": "superset_",
     "CACHE_REDIS_URL": f"{REDIS_BASE_URL}/1",
 }
-DATA_CACHE_CONFIG = CACHE_CONFIG
+# Chart data: datasets keyed on data_version (below) are invalidated by
+# ingestion, so DATA_CACHE_TIMEOUT can safely be raised for them
+DATA_CACHE_CONFIG = {
+    **CACHE_CONFIG,
+    "CACHE_DEFAULT_TIMEOUT": int(os.environ.get("DATA_CACHE_TIMEOUT", CACHE_CONFIG["CACHE_DEFAULT_TIMEOUT"])),
+}
+
+# ============================================
+# DATA VERSIONS (scoped invalidation)
+# ============================================
+# StatementParser bumps ss_data_version:{user_id} and
+# ss_data_version:{user_id}:{YYYY-MM} after every ingestion
+# (app/core/superset_cache.py). A dataset adds them to its cache key with:
+#
+#   -- {{ cache_key_wrapper(data_version(filter_values('user_id')[0])) }}
+#   -- {{ cache_key_wrapper(data_version(filter_values('user_id')[0], filter_values('month'))) }}
+#
+# so only charts of the ingested user (and month) get new keys. No default:
+# StatementParser requires the same DATA_VERSION_REDIS_URL, so the two sides
+# can't silently use different Redis databases.
+DATA_VERSION_PREFIX = "ss_data_version"
+_data_version_client = redis.Redis.from_url(os.environ["DATA_VERSION_REDIS_URL"], decode_responses=True)
+
+
+def data_version(user_id=None, months=None):
+    """Current version of a user's data, of the given months only when passed."""
+    if user_id is None:
+        return "0"
+    if months:
+        keys = [f"{DATA_VERSION_PREFIX}:{user_id}:{str(month)[:7]}" for month in months]
+    else:
+        keys = [f"{DATA_VERSION_PREFIX}:{user_id}"]
+    return ".".join(value or "0" for value in _data_version_client.mget(keys))
+
+
+JINJA_CONTEXT_ADDONS = {
+    "data_version": data_version,
+}
 
 # ============================================
 # CELERY CONFIGURATION (async queries)
@@ -53,9 +92,24 @@ DATA_CACHE_CONFIG = CACHE_CONFIG
 class CeleryConfig:
     broker_url = f"{REDIS_BASE_URL}/0"
     result_backend = f"{REDIS_BASE_URL}/0"
+    imports = ("superset.sql_lab", "superset.tasks.cache", "superset.tasks.scheduler")
+    # The broker is shared with StatementParser, whose worker also reads the
+    # default "celery" queue: keep Superset tasks on the superset queue
+    task_routes = {
+        "cache-warmup": {"queue": "superset"},
+        "fetch_url": {"queue": "superset"},
+    }
 
 CELERY_CONFIG = CeleryConfig
 
+# ============================================
+# CACHE WARM-UP
+# ============================================
+# cache-warmup (queued by StatementParser after ingestion) loads the charts of
+# dashboards tagged ss_warmup / ss_user_{id} through the web server as this user
+WEBDRIVER_BASEURL = os.environ.get("WEBDRIVER_BASEURL", "http://superset:8088/")
+THUMBNAIL_SELENIUM_USER = os.environ.get("SUPERSET_WARMUP_USER", "admin")
+
 # ============================================
 # RESULTS BACKEND
 # ============================================
@@ -79,6 +133,8 @@ ROW_LEVEL_SECURITY = True
 
 FEATURE_FLAGS = {
     "ENABLE_TEMPLATE_PROCESSING": True,
+    # Dashboard tags select what cache-warmup loads
+    "TAGGING_SYSTEM": True,
 }
 
 ## Characters That Need Encoding